@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class RankingWeights(BaseModel):
+    """Weights of the Stage 5 ranking factors (normalized to sum to 1)"""
+    relevance: float = Field(default=0.40, ge=0)
+    citations: float = Field(default=0.30, ge=0)
+    recency: float = Field(default=0.20, ge=0)
+    abstract: float = Field(default=0.10, ge=0)
+    venue: float = Field(default=0.0, ge=0)
+    centrality: float = Field(default=0.0, ge=0)  # Needs RANKING_USE_CITATION_GRAPH
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from backend.api.models.paper_model import PipelineRequest, PipelineResponse
+from backend.api.models.ranking_model import RankingWeights
 from backend.domain.pipeline_orchestrator import run_pipeline
 from backend.core.config import settings
+from backend.core.cancellation import cancellation, PipelineCancelled
 import uuid
 import asyncio
 
@@ -30,6 +32,8 @@ async def start_pipeline(request: PipelineRequest, background_tasks: BackgroundT
             running_pipelines[session_id] = {"status": "running", "result": None}
             result = await run_pipeline(session_id, request)
             running_pipelines[session_id] = {"status": "completed", "result": result}
+        except PipelineCancelled as e:
+            running_pipelines[session_id] = {"status": "cancelled", "error": str(e)}
         except Exception as e:
             running_pipelines[session_id] = {"status": "failed", "error": str(e)}
             from backend.core.websocket_manager import manager
@@ -53,9 +57,29 @@ async def get_pipeline_status(session_id: str):
     if session_id not in running_pipelines:
         raise HTTPException(status_code=404, detail="Pipeline session not found")
     
+    # A polling client (e.g. after a WebSocket drop) is still watching
+    cancellation.touch(session_id)
     return running_pipelines[session_id]
 
 
+@router.post("/cancel/{session_id}")
+async def cancel_pipeline(session_id: str):
+    """
+    Cancel a running pipeline
+    
+    Stops at the next stage boundary; AI summarization in progress stops
+    within one decoding step and keeps what it has generated.
+    """
+    
+    if session_id not in running_pipelines:
+        raise HTTPException(status_code=404, detail="Pipeline session not found")
+    
+    if not cancellation.cancel(session_id):
+        raise HTTPException(status_code=409, detail="Pipeline is not running")
+    
+    return {"session_id": session_id, "status": "cancelling"}
+
+
 @router.get("/result/{session_id}")
 async def get_pipeline_result(session_id: str):
     """Get the final result of a completed pipeline"""
@@ -64,6 +88,7 @@ async def get_pipeline_result(session_id: str):
         raise HTTPException(status_code=404, detail="Pipeline session not found")
     
     pipeline = running_pipelines[session_id]
+    cancellation.touch(session_id)
     
     if pipeline["status"] == "running":
         raise HTTPException(status_code=425, detail="Pipeline is still running")
@@ -71,9 +96,90 @@ async def get_pipeline_result(session_id: str):
     if pipeline["status"] == "failed":
         raise HTTPException(status_code=500, detail=pipeline.get("error", "Pipeline failed"))
     
+    if pipeline["status"] == "cancelled":
+        raise HTTPException(status_code=410, detail=pipeline.get("error", "Pipeline was cancelled"))
+    
     return pipeline["result"]
 
 
+@router.post("/rerank/{session_id}")
+async def rerank_pipeline(session_id: str, weights: RankingWeights):
+    """
+    Re-rank a session's papers with new ranking weights
+    
+    Reuses the Stage 5 feature matrix cached for the session, so no models
+    or external APIs are called.
+    """
+    from backend.domain.pipeline.stage_5_ranking import rerank_session
+    
+    ranked_papers = rerank_session(session_id, weights)
+    if ranked_papers is None:
+        raise HTTPException(status_code=404, detail="No cached ranking features for this session")
+    
+    return {
+        "session_id": session_id,
+        "weights": weights.model_dump(),
+        "ranked_papers": ranked_papers
+    }
+
+
+@router.get("/themes/{session_id}")
+async def get_pipeline_themes(session_id: str, n_themes: int):
+    """
+    Re-group a session's papers into a different number of themes
+    
+    Only available when Stage 3 ran with the agglomerative backend; the
+    cached linkage tree is cut again, without re-embedding or re-clustering.
+    """
+    from backend.domain.pipeline.stage_3_themes import recut_themes
+    
+    if n_themes < 1:
+        raise HTTPException(status_code=422, detail="n_themes must be at least 1")
+    
+    themes = recut_themes(session_id, n_themes)
+    if themes is None:
+        raise HTTPException(status_code=404, detail="No cached theme hierarchy for this session")
+    
+    return {
+        "session_id": session_id,
+        "themes_found": len(themes),
+        "themes": {
+            theme: [p.model_dump() for p in papers_list]
+            for theme, papers_list in themes.items()
+        }
+    }
+
+
+@router.get("/report/{session_id}/sections/{section_id}")
+async def get_report_section(session_id: str, section_id: str, format: str = "markdown"):
+    """
+    Fetch one section of a session's report
+    
+    Section IDs are listed in the report's metadata["sections"]. Lazy
+    sections are built on first request and cached with the report, which
+    Stage 6 keeps for the most recent `session_cache_size` sessions.
+    """
+    from backend.domain.pipeline.stage_6_synthesis import get_document
+    from backend.domain.report_builder import render_section_html, render_section_markdown
+    
+    if format not in ("markdown", "html"):
+        raise HTTPException(status_code=422, detail="format must be 'markdown' or 'html'")
+    
+    document = get_document(session_id)
+    section = document.load(section_id) if document is not None else None
+    if section is None:
+        raise HTTPException(status_code=404, detail="Report section not found")
+    
+    render = render_section_html if format == "html" else render_section_markdown
+    return {
+        "session_id": session_id,
+        "section_id": section.id,
+        "title": section.title,
+        "format": format,
+        "content": render(section)
+    }
+
+
 @router.get("/events/{session_id}")
 async def get_pipeline_events(session_id: str, limit: int = 100):
     """Get recent pipeline events for debugging"""
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class PipelineCancelled(Exception):
+    """Raised when a pipeline session was cancelled or abandoned"""
+
+
+class CancellationRegistry:
+    """Cancellation tokens of running pipeline sessions
+    
+    Tokens are threading.Events so model code on executor threads can poll
+    them between decoding steps. Only sessions that registered a token
+    (i.e. running pipelines) can be cancelled. An abandon countdown
+    (`cancel_later`) is stopped by a reconnect and restarted by any other
+    client activity, so only sessions nobody is watching get cancelled.
+    """
+    
+    def __init__(self):
+        self._tokens: Dict[str, threading.Event] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._grace: Dict[str, float] = {}
+    
+    def register(self, session_id: str) -> threading.Event:
+        """Create (or return) the token of a running session"""
+        return self._tokens.setdefault(session_id, threading.Event())
+    
+    def token(self, session_id: str) -> threading.Event:
+        """Token of a session; unregistered sessions get one that never fires"""
+        return self._tokens.get(session_id) or threading.Event()
+    
+    def cancel(self, session_id: str) -> bool:
+        """Cancel a running session; False if it is not running"""
+        self._clear_timer(session_id)
+        token = self._tokens.get(session_id)
+        if token is None:
+            return False
+        token.set()
+        return True
+    
+    def cancel_later(self, session_id: str, delay: float):
+        """Cancel a running session after `delay` seconds unless kept alive"""
+        if session_id not in self._tokens or session_id in self._timers:
+            return
+        self._schedule(session_id, delay)
+    
+    def keep_alive(self, session_id: str):
+        """Drop a scheduled cancellation (e.g. the client reconnected)"""
+        self._clear_timer(session_id)
+    
+    def touch(self, session_id: str):
+        """Restart a scheduled cancellation's countdown (e.g. status polling)"""
+        delay = self._grace.get(session_id)
+        if delay is not None:
+            self._clear_timer(session_id)
+            self._schedule(session_id, delay)
+    
+    def check(self, session_id: str):
+        """Raise PipelineCancelled if the session was cancelled"""
+        token = self._tokens.get(session_id)
+        if token is not None and token.is_set():
+            raise PipelineCancelled(f"Pipeline {session_id} was cancelled")
+    
+    def release(self, session_id: str):
+        """Forget a finished session"""
+        self._clear_timer(session_id)
+        self._tokens.pop(session_id, None)
+    
+    def _schedule(self, session_id: str, delay: float):
+        loop = asyncio.get_running_loop()
+        self._timers[session_id] = loop.call_later(delay, self.cancel, session_id)
+        self._grace[session_id] = delay
+    
+    def _clear_timer(self, session_id: str):
+        self._grace.pop(session_id, None)
+        timer = self._timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+
+
+def stop_requested(deadline: Optional[float], cancel_event: Optional[threading.Event]) -> bool:
+    """True once `deadline` (time.monotonic) has passed or `cancel_event` is set"""
+    if cancel_event is not None and cancel_event.is_set():
+        return True
+    return deadline is not None and time.monotonic() >= deadline
+
+
+# Global registry instance
+cancellation = CancellationRegistry()
@@ -23,9 +23,80 @@ class Settings(BaseSettings):
     enable_fp16: bool = True  # Mixed precision for better performance
     embedding_model: str = "sentence-transformers/all-mpnet-base-v2"
     summarization_model: str = "facebook/bart-large-cnn"
+    summarization_tier: str = "full"  # full (summarization_model) | distilled
+    distilled_summarization_model: str = "sshleifer/distilbart-cnn-12-6"
+    summarization_quantize: bool = False  # Dynamic int8 quantization of the summarizer on CPU
+    model_workers: int = 1  # Threads in the shared model executor; local model calls run one at a time at 1
+    embedding_cache_size: int = 10000  # Texts whose embeddings are kept in memory (float32, ~30 MB at 768 dims)
+    summarization_batch_size: int = 8  # Texts per local summarization forward pass
+    summarization_api_concurrency: int = 4  # Simultaneous HF API summarization requests
+    summary_cache_enabled: bool = True  # Reuse summaries of identical inputs across runs
+    summary_cache_dir: str = "cache/summaries"
+    summary_cache_max_entries: int = 5000
+    
+    # Cross-encoder re-ranking (Stage 2)
+    rerank_enabled: bool = False
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_top_n: int = 30  # Only the head of the bi-encoder ranking is re-scored
+    rerank_batch_size: int = 16
+    rerank_time_budget: float = 5.0  # Seconds; unscored papers keep their bi-encoder score
+    rerank_weight: float = 0.7  # Share of the cross-encoder score in relevance_score
+    
+    # WebSocket progress throttling (0 disables it)
+    ws_max_updates_per_second: float = 4.0
     
     # Pipeline Settings
     max_papers_per_query: int = 50
+    fetch_batch_size: int = 25  # Papers per search page streamed into Stage 2
+    partial_ranking_size: int = 10  # Running top-K sent to the client while scoring
+    dedupe_enabled: bool = True  # Merge preprint/published versions after scoring
+    dedupe_title_threshold: float = 0.8  # Title shingle Jaccard to count as duplicate
+    dedupe_embedding_threshold: float = 0.9  # Embedding cosine to confirm a duplicate
+    dedupe_strict_title_threshold: float = 0.95  # Title Jaccard when neither embeddings nor authors can confirm
+    
+    # Theme clustering (Stage 3)
+    theme_min_clusters: int = 3
+    theme_max_clusters: int = 8
+    theme_silhouette_sample: int = 1000  # Papers sampled to score each candidate K
+    theme_minibatch_threshold: int = 2000  # Switch to MiniBatchKMeans above this size
+    theme_clustering_backend: str = "kmeans"  # kmeans | hdbscan | agglomerative
+    theme_min_cluster_size: int = 5  # HDBSCAN: smaller groups become outliers
+    theme_reduced_dimensions: int = 10  # PCA dimensions fed to HDBSCAN
+    theme_reuse_enabled: bool = True  # Seed K-means from a related earlier query
+    theme_reuse_similarity: float = 0.85  # Query cosine similarity for the same family
+    theme_refine_iterations: int = 10  # K-means iterations after seeding
+    theme_cache_dir: str = "cache/themes"
+    
+    # Methodology classification (Stage 4)
+    methodology_classifier: str = "embedding"  # embedding | keyword
+    methodology_temperature: float = 0.05  # Softmax temperature over cosine scores
+    methodology_min_similarity: float = 0.15  # Below this a paper is "Other"
+    methodology_label_threshold: float = 0.3  # Extra labels need at least this score
+    methodology_nli_enabled: bool = False  # Zero-shot NLI for low-confidence papers
+    nli_model: str = "typeform/distilbert-base-uncased-mnli"
+    methodology_nli_confidence: float = 0.5  # Papers below this top score go to NLI
+    methodology_nli_max_papers: int = 50  # Least confident papers re-classified per run
+    methodology_nli_batch_size: int = 8
+    methodology_nli_cache_size: int = 10000
+    
+    # Ranking (Stage 5)
+    ranking_use_citation_graph: bool = False  # Fetch citations for PageRank centrality
+    
+    # Synthesis (Stage 6)
+    synthesis_papers_per_theme: int = 5  # Top papers per theme fed to the summarizer
+    synthesis_chunk_chars: int = 3000  # Input cut per model call (~BART context)
+    theme_summary_max_length: int = 120
+    synthesis_mode: str = "abstractive"  # abstractive | extractive (fast report, no generation)
+    synthesis_stream: bool = True  # Stream the overview summary to clients as it is generated
+    synthesis_time_budget: float = 120.0  # Seconds of AI summarization before keeping partial output
+    report_lazy_min_papers: int = 200  # From this many papers, per-theme report sections load on demand
+    report_theme_section_papers: int = 20  # Papers listed in an on-demand theme section
+    session_abandon_grace_seconds: float = 30.0  # Cancel a running pipeline this long after its last client leaves
+    extractive_sentences: int = 3  # Sentences per extractive summary
+    extractive_diversity: float = 0.3  # MMR trade-off between centrality and redundancy
+    
+    # Per-session result caches (linkage trees, features, report sections)
+    session_cache_size: int = 32
     relevance_threshold: float = 0.5
     
     model_config = SettingsConfigDict(
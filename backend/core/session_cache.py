@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class SessionCache:
+    """Bounded per-session store; the least recently used session is evicted first"""
+    
+    def __init__(self, max_sessions: int = 32):
+        self.max_sessions = max_sessions
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+    
+    def get(self, session_id: str, default: Optional[Any] = None) -> Any:
+        """Get the cached value for a session and mark it as recently used"""
+        if session_id not in self._entries:
+            return default
+        self._entries.move_to_end(session_id)
+        return self._entries[session_id]
+    
+    def set(self, session_id: str, value: Any):
+        """Cache a value for a session, evicting the oldest session if full"""
+        self._entries[session_id] = value
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+    
+    def pop(self, session_id: str, default: Optional[Any] = None) -> Any:
+        """Remove and return the cached value for a session"""
+        return self._entries.pop(session_id, default)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,9 +1,12 @@
 from fastapi import WebSocket
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Optional
 import json
 import asyncio
+import time
 from datetime import datetime
 from pathlib import Path
+from backend.core.config import settings
+from backend.core.cancellation import cancellation
 
 
 class ConnectionManager:
@@ -14,6 +17,13 @@ class ConnectionManager:
         self.event_log: List[dict] = []
         self.event_log_file = Path("logs/pipeline_events.log")
         self.event_log_file.parent.mkdir(exist_ok=True)
+        
+        # Stage update throttling: per session, the time of the last update
+        # sent and the newest unsent update of each stage
+        self.max_updates_per_second = settings.ws_max_updates_per_second
+        self._last_update_at: Dict[str, float] = {}
+        self._pending_updates: Dict[str, Dict[int, dict]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, session_id: str):
         """Connect a new WebSocket client"""
@@ -21,6 +31,7 @@ class ConnectionManager:
         if session_id not in self.active_connections:
             self.active_connections[session_id] = set()
         self.active_connections[session_id].add(websocket)
+        cancellation.keep_alive(session_id)
         
         # Send connection confirmation
         await self.send_message(session_id, {
@@ -30,11 +41,25 @@ class ConnectionManager:
         })
     
     def disconnect(self, websocket: WebSocket, session_id: str):
-        """Disconnect a WebSocket client"""
+        """Disconnect a WebSocket client
+        
+        When the last client of a running pipeline leaves, the pipeline is
+        cancelled unless a client reconnects within the grace period.
+        """
         if session_id in self.active_connections:
             self.active_connections[session_id].discard(websocket)
             if not self.active_connections[session_id]:
                 del self.active_connections[session_id]
+                self.release(session_id)
+                cancellation.cancel_later(session_id, settings.session_abandon_grace_seconds)
+    
+    def release(self, session_id: str):
+        """Forget a session's throttling state (held updates are dropped)"""
+        task = self._flush_tasks.pop(session_id, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        self._pending_updates.pop(session_id, None)
+        self._last_update_at.pop(session_id, None)
     
     async def send_message(self, session_id: str, message: dict):
         """Send message to all clients in a session"""
@@ -88,19 +113,87 @@ class ConnectionManager:
         except Exception as e:
             print(f"Failed to write event log: {e}")
     
-    async def send_stage_update(self, session_id: str, stage: int, progress: int, message: str, data: dict = None):
-        """Send pipeline stage update"""
-        await self.send_message(session_id, {
+    async def send_stage_update(
+        self,
+        session_id: str,
+        stage: int,
+        progress: int,
+        message: str,
+        data: dict = None,
+        partial_text: Optional[str] = None
+    ):
+        """Send pipeline stage update
+        
+        Updates are throttled to `max_updates_per_second` per session. One
+        that arrives too early is held back and replaced by any newer update
+        of the same stage (latest wins); held updates go out together at the
+        end of the interval. Callers can therefore report progress as often
+        as they like. `partial_text` carries text generated so far and should
+        be cumulative, since intermediate updates may be dropped.
+        """
+        update = {
             "type": "stage_update",
             "stage": stage,
             "progress": progress,
             "message": message,
             "data": data or {},
             "timestamp": datetime.utcnow().isoformat()
-        })
+        }
+        if partial_text is not None:
+            update["partial_text"] = partial_text
+        
+        if self.max_updates_per_second <= 0:
+            await self.send_message(session_id, update)
+            return
+        
+        interval = 1.0 / self.max_updates_per_second
+        wait = self._last_update_at.get(session_id, float("-inf")) + interval - time.monotonic()
+        
+        if wait <= 0 and not self._pending_updates.get(session_id):
+            self._last_update_at[session_id] = time.monotonic()
+            await self.send_message(session_id, update)
+            return
+        
+        self._pending_updates.setdefault(session_id, {})[stage] = update
+        if session_id not in self._flush_tasks:
+            self._flush_tasks[session_id] = asyncio.create_task(
+                self._flush_pending_updates(session_id, max(wait, 0.0))
+            )
+    
+    async def _flush_pending_updates(self, session_id: str, delay: float):
+        """Send the held stage updates of a session after `delay` seconds
+        
+        Updates held while this task is sending go out one interval later,
+        so nothing stays pending once the task ends.
+        """
+        try:
+            await asyncio.sleep(delay)
+            while True:
+                pending = self._pending_updates.pop(session_id, {})
+                if not pending:
+                    break
+                self._last_update_at[session_id] = time.monotonic()
+                for update in pending.values():
+                    await self.send_message(session_id, update)
+                if self._pending_updates.get(session_id):
+                    await asyncio.sleep(1.0 / self.max_updates_per_second)
+        finally:
+            if self._flush_tasks.get(session_id) is asyncio.current_task():
+                del self._flush_tasks[session_id]
+    
+    def _discard_pending_updates(self, session_id: str, stage: int = None):
+        """Drop held stage updates superseded by a completion or error"""
+        pending = self._pending_updates.get(session_id)
+        if not pending:
+            return
+        if stage is None:
+            pending.clear()
+        else:
+            pending.pop(stage, None)
     
     async def send_stage_complete(self, session_id: str, stage: int, result: dict, data: dict = None):
         """Send pipeline stage completion"""
+        self._discard_pending_updates(session_id, stage)
         message = {
             "type": "stage_complete",
             "stage": stage,
@@ -113,6 +206,7 @@ class ConnectionManager:
     
     async def send_error(self, session_id: str, error: str, stage: int = None):
         """Send error message"""
+        self._discard_pending_updates(session_id)
         await self.send_message(session_id, {
             "type": "error",
             "stage": stage,
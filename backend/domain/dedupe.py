@@ -0,0 +1,184 @@
+"""Near-duplicate paper detection (e.g. preprint and published versions)
+
+Candidate pairs come from MinHash/LSH over character shingles of the
+normalized titles, so detection stays sub-quadratic; candidates are then
+confirmed by shingle Jaccard similarity and, when available, embedding
+cosine similarity. Titles differing in a number, version or part ("Part
+I"/"Part II", "YOLOv3"/"YOLOv4") are never merged, and without an
+embedding check a pair also needs a shared author or a near-identical
+title.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import re
+import unicodedata
+import zlib
+import numpy as np
+from backend.api.models.paper_model import Paper
+
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_ROMAN_NUMERALS = {"i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi", "xii"}
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def distinguishing_tokens(title: str) -> Set[str]:
+    """Title tokens that tell numbered versions apart (digits, roman numerals)"""
+    return {
+        token for token in normalize_title(title).split()
+        if any(c.isdigit() for c in token) or token in _ROMAN_NUMERALS
+    }
+
+
+def author_surnames(paper: Paper) -> Set[str]:
+    """Normalized last names of a paper's authors"""
+    return {name.split()[-1] for name in map(normalize_title, paper.authors or []) if name}
+
+
+def title_shingles(title: str, k: int = 3) -> Set[int]:
+    """Hashed character k-grams of a normalized title"""
+    text = normalize_title(title)
+    if len(text) <= k:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    return {zlib.crc32(text[i:i + k].encode("utf-8")) for i in range(len(text) - k + 1)}
+
+
+def minhash_signatures(shingle_sets: List[Set[int]], num_perm: int = 64, seed: int = 1) -> np.ndarray:
+    """MinHash signature matrix (documents x num_perm)"""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+    b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+    
+    signatures = np.full((len(shingle_sets), num_perm), _MERSENNE_PRIME, dtype=np.uint64)
+    for i, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        values = np.fromiter(shingles, dtype=np.uint64) % _MERSENNE_PRIME
+        signatures[i] = ((values[:, None] * a + b) % _MERSENNE_PRIME).min(axis=0)
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = 8) -> Set[Tuple[int, int]]:
+    """Pairs of documents that share at least one LSH band bucket
+    
+    With 64 permutations, 8 bands of 8 rows put the detection threshold
+    near a Jaccard similarity of 0.77.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    candidates: Set[Tuple[int, int]] = set()
+    
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        for i in range(n):
+            key = signatures[i, band * rows:(band + 1) * rows].tobytes()
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+    
+    return candidates
+
+
+def find_duplicate_groups(
+    papers: List[Paper],
+    embeddings: Optional[np.ndarray] = None,
+    title_threshold: float = 0.8,
+    embedding_threshold: float = 0.9,
+    strict_title_threshold: float = 0.95
+) -> List[List[int]]:
+    """Groups of paper indices that are versions of the same paper
+    
+    A candidate pair needs a title Jaccard of at least `title_threshold`
+    and identical distinguishing tokens. It is then confirmed by embedding
+    similarity when both papers have abstracts, otherwise by a shared
+    author surname or, if either lacks authors, a title Jaccard of at least
+    `strict_title_threshold`.
+    """
+    shingle_sets = [title_shingles(p.title) for p in papers]
+    numbers = [distinguishing_tokens(p.title) for p in papers]
+    surnames = [author_surnames(p) for p in papers]
+    candidates = lsh_candidate_pairs(minhash_signatures(shingle_sets))
+    
+    parent = list(range(len(papers)))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for i, j in candidates:
+        union = len(shingle_sets[i] | shingle_sets[j])
+        jaccard = len(shingle_sets[i] & shingle_sets[j]) / union if union else 0.0
+        if jaccard < title_threshold or numbers[i] != numbers[j]:
+            continue
+        # Title-only embeddings are not comparable with title+abstract ones
+        if embeddings is not None and papers[i].abstract and papers[j].abstract:
+            similarity = float(embeddings[i] @ embeddings[j]) / (
+                (np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[j])) or 1.0
+            )
+            if similarity < embedding_threshold:
+                continue
+        elif surnames[i] and surnames[j]:
+            if not surnames[i] & surnames[j]:
+                continue
+        elif jaccard < strict_title_threshold:
+            continue
+        parent[find(j)] = find(i)
+    
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(papers)):
+        groups.setdefault(find(i), []).append(i)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def merge_duplicates(
+    papers: List[Paper],
+    embeddings: Optional[np.ndarray] = None,
+    title_threshold: float = 0.8,
+    embedding_threshold: float = 0.9,
+    strict_title_threshold: float = 0.95
+) -> Tuple[List[Paper], Dict[str, List[str]]]:
+    """Merge near-duplicate papers into one record each
+    
+    The most complete version (abstract, venue, citations) is kept and
+    gaps in its metadata are filled from the others; citation count and
+    relevance take the maximum. Returns the merged list, in the original
+    order, and a map from each kept paper ID to the IDs merged into it.
+    """
+    groups = find_duplicate_groups(
+        papers, embeddings, title_threshold, embedding_threshold, strict_title_threshold
+    )
+    if not groups:
+        return papers, {}
+    
+    dropped: Set[int] = set()
+    aliases: Dict[str, List[str]] = {}
+    
+    for group in groups:
+        versions = [papers[i] for i in group]
+        keep = max(group, key=lambda i: (
+            bool(papers[i].abstract), bool(papers[i].venue), papers[i].citation_count or 0
+        ))
+        canonical = papers[keep]
+        
+        canonical.abstract = canonical.abstract or next((p.abstract for p in versions if p.abstract), None)
+        canonical.venue = canonical.venue or next((p.venue for p in versions if p.venue), None)
+        canonical.year = canonical.year or next((p.year for p in versions if p.year), None)
+        canonical.url = canonical.url or next((p.url for p in versions if p.url), None)
+        canonical.authors = max((p.authors for p in versions), key=len)
+        canonical.citation_count = max(p.citation_count or 0 for p in versions)
+        scores = [p.relevance_score for p in versions if p.relevance_score is not None]
+        if scores:
+            canonical.relevance_score = max(scores)
+        
+        aliases[canonical.paper_id] = [papers[i].paper_id for i in group if i != keep]
+        dropped.update(i for i in group if i != keep)
+    
+    return [p for i, p in enumerate(papers) if i not in dropped], aliases
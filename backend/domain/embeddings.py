@@ -0,0 +1,26 @@
+"""Paper embeddings shared across pipeline stages"""
+from typing import List
+import numpy as np
+from backend.api.models.paper_model import Paper
+from backend.infrastructure.ai.huggingface_client import hf_client
+
+
+def embedding_text(paper: Paper) -> str:
+    """Text used to embed a paper (title + abstract)"""
+    if paper.abstract:
+        return paper.title + " " + paper.abstract
+    return paper.title
+
+
+async def paper_embedding_matrix(papers: List[Paper]) -> np.ndarray:
+    """Unit-normalized embedding matrix (papers x dims)
+    
+    Every stage builds the same texts, so after Stage 2 the vectors come
+    from the client's embedding cache instead of the model.
+    """
+    embeddings = np.asarray(
+        await hf_client.get_embeddings([embedding_text(p) for p in papers]),
+        dtype=np.float64
+    )
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.where(norms > 0, norms, 1.0)
@@ -0,0 +1,80 @@
+"""Extractive summaries: TextRank sentence centrality with MMR selection"""
+from typing import List
+import re
+import numpy as np
+from scipy.sparse import csr_matrix
+from backend.domain.citation_graph import pagerank
+from backend.infrastructure.ai.huggingface_client import hf_client
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+MIN_SENTENCE_WORDS = 5
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping fragments too short to stand alone"""
+    sentences = (s.strip() for s in SENTENCE_BOUNDARY.split(text or ""))
+    return [s for s in sentences if len(s.split()) >= MIN_SENTENCE_WORDS]
+
+
+def textrank(embeddings: np.ndarray) -> np.ndarray:
+    """Centrality of each sentence in its cosine-similarity graph
+    
+    Edges are weighted by the (non-negative) similarity between unit
+    vectors, so sentences that resemble many others rank highest.
+    """
+    similarity = np.clip(embeddings @ embeddings.T, 0.0, None)
+    np.fill_diagonal(similarity, 0.0)
+    return pagerank(csr_matrix(similarity))
+
+
+def mmr_select(embeddings: np.ndarray, scores: np.ndarray, k: int, diversity: float = 0.3) -> List[int]:
+    """Maximal marginal relevance: pick `k` high-scoring, mutually dissimilar rows
+    
+    Each step takes the row maximizing (1 - diversity) * score minus
+    diversity * (max similarity to rows already picked).
+    """
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return []
+    
+    relevance = scores / (scores.max() or 1.0)
+    selected = [int(np.argmax(relevance))]
+    redundancy = embeddings @ embeddings[selected[0]]
+    
+    while len(selected) < min(k, n):
+        mmr = (1 - diversity) * relevance - diversity * redundancy
+        mmr[selected] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        redundancy = np.maximum(redundancy, embeddings @ embeddings[best])
+    
+    return selected
+
+
+async def summarize_extractive(texts: List[str], n_sentences: int = 3, diversity: float = 0.3) -> List[str]:
+    """One extractive summary per text, in input order
+    
+    All sentences are embedded in a single call through the shared
+    embedding cache. Selected sentences keep their original order.
+    """
+    sentences = [split_sentences(text) for text in texts]
+    flat = [s for group in sentences for s in group]
+    if not flat:
+        return [text.strip() for text in texts]
+    
+    vectors = np.asarray(await hf_client.get_embeddings(flat), dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1.0)
+    
+    summaries, start = [], 0
+    for text, group in zip(texts, sentences):
+        if not group:
+            summaries.append(text.strip())
+            continue
+        
+        embeddings = vectors[start:start + len(group)]
+        start += len(group)
+        picked = mmr_select(embeddings, textrank(embeddings), n_sentences, diversity)
+        summaries.append(" ".join(group[i] for i in sorted(picked)))
+    
+    return summaries
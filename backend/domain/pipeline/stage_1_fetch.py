@@ -1,13 +1,33 @@
 """Stage 1: Fetch papers from Semantic Scholar"""
-from typing import List
+from typing import AsyncIterator, List
 from backend.api.models.paper_model import Paper
 from backend.infrastructure.external.semantic_scholar import SemanticScholarClient
 from backend.core.websocket_manager import manager
+from backend.core.config import settings
 
 
 async def execute(session_id: str, keywords: List[str], max_papers: int = 50) -> List[Paper]:
     """Fetch papers from Semantic Scholar API"""
     
+    papers = []
+    async for batch in stream(session_id, keywords, max_papers=max_papers):
+        papers.extend(batch)
+    
+    return papers
+
+
+async def stream(
+    session_id: str,
+    keywords: List[str],
+    max_papers: int = 50,
+    batch_size: int = None
+) -> AsyncIterator[List[Paper]]:
+    """Fetch papers page by page, yielding each batch as soon as it arrives
+    
+    Stage completion (with the full paper list) is reported once the source
+    is exhausted, so downstream stages can start on the first batch.
+    """
+    
     await manager.send_stage_update(
         session_id, 
         stage=1, 
@@ -24,7 +44,22 @@ async def execute(session_id: str, keywords: List[str], max_papers: int = 50) ->
         message="Fetching paper metadata..."
     )
     
-    papers = await client.search_papers(keywords, limit=max_papers)
+    papers = []
+    async for batch in client.iter_search_papers(
+        keywords,
+        limit=max_papers,
+        batch_size=batch_size or settings.fetch_batch_size
+    ):
+        papers.extend(batch)
+        
+        await manager.send_stage_update(
+            session_id,
+            stage=1,
+            progress=50 + int(40 * min(len(papers) / max(max_papers, 1), 1.0)),
+            message=f"Fetched {len(papers)} papers..."
+        )
+        
+        yield batch
     
     await manager.send_stage_update(
         session_id, 
@@ -44,5 +79,3 @@ async def execute(session_id: str, keywords: List[str], max_papers: int = 50) ->
             "papers": [p.model_dump() for p in papers]  # All papers for frontend
         }
     )
-    
-    return papers
@@ -1,13 +1,27 @@
 """Stage 2: Calculate relevance scores using AI embeddings"""
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple, Union
+import heapq
 import numpy as np
 from backend.api.models.paper_model import Paper
 from backend.infrastructure.ai.huggingface_client import hf_client
 from backend.core.websocket_manager import manager
+from backend.core.config import settings
+from backend.domain.embeddings import embedding_text
+from backend.domain.dedupe import merge_duplicates
 
 
-async def execute(session_id: str, papers: List[Paper], keywords: List[str]) -> List[Paper]:
-    """Score papers by relevance to query keywords using semantic similarity"""
+async def execute(
+    session_id: str,
+    papers: Union[List[Paper], AsyncIterator[List[Paper]]],
+    keywords: List[str],
+    expected_total: Optional[int] = None
+) -> List[Paper]:
+    """Score papers by relevance to query keywords using semantic similarity
+    
+    `papers` may be a complete list or an async iterator of batches (e.g.
+    `stage_1_fetch.stream`). Each batch is embedded and scored as it
+    arrives, and the running top-K is pushed to the client.
+    """
     
     await manager.send_stage_update(
         session_id,
@@ -18,7 +32,11 @@ async def execute(session_id: str, papers: List[Paper], keywords: List[str]) ->
     
     # Get query embedding
     query_text = " ".join(keywords)
-    query_embedding = (await hf_client.get_embeddings([query_text]))[0]
+    query_vec = np.asarray((await hf_client.get_embeddings([query_text]))[0], dtype=float)
+    query_vec /= np.linalg.norm(query_vec) or 1.0
+    
+    if isinstance(papers, list):
+        expected_total = len(papers)
     
     await manager.send_stage_update(
         session_id,
@@ -27,52 +45,106 @@ async def execute(session_id: str, papers: List[Paper], keywords: List[str]) ->
         message="Generating embeddings for papers..."
     )
     
-    # Get paper embeddings (title + abstract)
-    paper_texts = []
-    valid_papers = []
-    
-    for paper in papers:
-        text = paper.title
-        if paper.abstract:
-            text += " " + paper.abstract
-        paper_texts.append(text)
-        valid_papers.append(paper)
-    
-    # Batch process embeddings
-    paper_embeddings = await hf_client.get_embeddings(paper_texts)
-    
-    await manager.send_stage_update(
-        session_id,
-        stage=2,
-        progress=70,
-        message="Calculating similarity scores..."
-    )
-    
-    # Calculate cosine similarity
-    query_vec = np.array(query_embedding)
-    scores = []
+    valid_papers: List[Paper] = []
+    embedding_batches: List[np.ndarray] = []
+    top_heap: List[Tuple[float, int, Paper]] = []  # min-heap holding the running top-K
+    top_k = settings.partial_ranking_size
     
-    for i, paper_embedding in enumerate(paper_embeddings):
-        paper_vec = np.array(paper_embedding)
-        similarity = np.dot(query_vec, paper_vec) / (
-            np.linalg.norm(query_vec) * np.linalg.norm(paper_vec)
+    async for batch in _as_batches(papers):
+        if not batch:
+            continue
+        
+        # Batch process embeddings (title + abstract)
+        paper_embeddings = np.asarray(
+            await hf_client.get_embeddings([embedding_text(p) for p in batch]),
+            dtype=float
         )
         
+        embedding_batches.append(paper_embeddings)
+        
+        # Cosine similarity for the whole batch at once
+        norms = np.linalg.norm(paper_embeddings, axis=1)
+        similarity = paper_embeddings @ query_vec / np.where(norms > 0, norms, 1.0)
+        
         # Combine with citation count (normalized)
-        citation_weight = min(valid_papers[i].citation_count / 1000, 1.0)
-        final_score = 0.8 * similarity + 0.2 * citation_weight
+        citation_weight = np.minimum(
+            np.array([p.citation_count or 0 for p in batch], dtype=float) / 1000, 1.0
+        )
+        final_scores = 0.8 * similarity + 0.2 * citation_weight
         
-        valid_papers[i].relevance_score = float(final_score)
-        scores.append(float(final_score))
+        for paper, score in zip(batch, final_scores):
+            paper.relevance_score = float(score)
+            valid_papers.append(paper)
+            entry = (paper.relevance_score, len(valid_papers), paper)
+            if len(top_heap) < top_k:
+                heapq.heappush(top_heap, entry)
+            else:
+                heapq.heappushpop(top_heap, entry)
+        
+        if expected_total:
+            progress = 30 + int(50 * min(len(valid_papers) / expected_total, 1.0))
+        else:
+            progress = 50
+        
+        await manager.send_stage_update(
+            session_id,
+            stage=2,
+            progress=progress,
+            message=f"Scored {len(valid_papers)} papers...",
+            data={
+                "partial_ranking": [
+                    {"paper_id": p.paper_id, "title": p.title, "score": score}
+                    for score, _, p in sorted(top_heap, reverse=True)
+                ]
+            }
+        )
+    
+    if not valid_papers:
+        await manager.send_stage_complete(
+            session_id,
+            stage=2,
+            result={
+                "papers_scored": 0,
+                "duplicates_merged": 0,
+                "aliases": {},
+                "avg_score": 0.0,
+                "top_papers": []
+            }
+        )
+        return valid_papers
+    
+    # Merge preprint/published versions of the same paper
+    aliases = {}
+    if settings.dedupe_enabled:
+        valid_papers, aliases = merge_duplicates(
+            valid_papers,
+            np.vstack(embedding_batches),
+            title_threshold=settings.dedupe_title_threshold,
+            embedding_threshold=settings.dedupe_embedding_threshold,
+            strict_title_threshold=settings.dedupe_strict_title_threshold
+        )
     
     # Sort by relevance
     valid_papers.sort(key=lambda p: p.relevance_score or 0, reverse=True)
     
+    if settings.rerank_enabled:
+        await manager.send_stage_update(
+            session_id,
+            stage=2,
+            progress=85,
+            message=f"Re-ranking top {min(settings.rerank_top_n, len(valid_papers))} papers..."
+        )
+        valid_papers = await _rerank_head(query_text, valid_papers)
+    
+    scores = [p.relevance_score for p in valid_papers]
+    
     await manager.send_stage_complete(
         session_id,
         stage=2,
         result={
             "papers_scored": len(valid_papers),
+            "duplicates_merged": sum(len(ids) for ids in aliases.values()),
+            "aliases": aliases,
             "avg_score": float(np.mean(scores)),
             "top_papers": [
                 {"title": p.title, "score": p.relevance_score}
@@ -82,3 +154,49 @@ async def execute(session_id: str, papers: List[Paper], keywords: List[str]) ->
     )
     
     return valid_papers
+
+
+async def _as_batches(
+    papers: Union[List[Paper], AsyncIterator[List[Paper]]]
+) -> AsyncIterator[List[Paper]]:
+    """Normalize a paper list or batch iterator to an async batch iterator"""
+    if isinstance(papers, list):
+        yield papers
+        return
+    
+    async for batch in papers:
+        yield batch
+
+
+async def _rerank_head(query_text: str, papers: List[Paper]) -> List[Paper]:
+    """Re-score the top-N papers with the cross-encoder and re-order them
+    
+    Only the head is re-scored; papers the time budget did not reach keep
+    their bi-encoder score. The whole list is re-sorted afterwards, so it
+    stays ordered by `relevance_score` even when a blended head score
+    drops below a tail score.
+    """
+    head = papers[:settings.rerank_top_n]
+    texts = [embedding_text(p) for p in head]
+    
+    try:
+        logits = await hf_client.rerank(
+            query_text,
+            texts,
+            batch_size=settings.rerank_batch_size,
+            time_budget=settings.rerank_time_budget
+        )
+    except Exception as e:
+        print(f"Cross-encoder re-ranking failed, keeping bi-encoder order: {e}")
+        return papers
+    
+    # Squash logits to 0-1 so they blend with the cosine-based score
+    cross_scores = 1.0 / (1.0 + np.exp(-np.asarray(logits, dtype=float)))
+    weight = settings.rerank_weight
+    
+    for paper, cross_score in zip(head, cross_scores):
+        paper.relevance_score = float(
+            weight * cross_score + (1 - weight) * (paper.relevance_score or 0)
+        )
+    
+    return sorted(papers, key=lambda p: p.relevance_score or 0, reverse=True)
@@ -1,15 +1,43 @@
 """Stage 3: Group papers by theme using clustering"""
-from typing import List, Dict
+from typing import List, Dict, Optional
+from functools import partial
+import asyncio
 import numpy as np
-from sklearn.cluster import KMeans
-from collections import Counter
 from backend.api.models.paper_model import Paper
 from backend.infrastructure.ai.huggingface_client import hf_client
 from backend.core.websocket_manager import manager
+from backend.core.config import settings
+from backend.core.session_cache import SessionCache
+from backend.domain.embeddings import paper_embedding_matrix
+from backend.domain.theme_clustering import (
+    OUTLIER_LABEL,
+    ctfidf_keyphrases,
+    cut_tree,
+    get_backend,
+    project_2d,
+    refine_from_centroids
+)
+from backend.infrastructure.cache.theme_store import theme_store
 
 
-async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]]:
-    """Cluster papers into themes using embeddings + K-means"""
+UNCLUSTERED_THEME = "Unclustered"
+
+# Linkage trees from the agglomerative backend, kept so the number of
+# themes can be changed later without re-embedding or re-clustering
+_linkage_cache = SessionCache(max_sessions=settings.session_cache_size)
+
+
+async def execute(
+    session_id: str,
+    papers: List[Paper],
+    keywords: Optional[List[str]] = None
+) -> Dict[str, List[Paper]]:
+    """Cluster papers into themes using embeddings and the configured backend
+    
+    With the K-means backend and `keywords` given, a run whose query is close
+    to an earlier one is seeded from that run's saved centroids instead of
+    clustering from scratch.
+    """
     
     await manager.send_stage_update(
         session_id,
@@ -18,12 +46,8 @@ async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]
         message="Analyzing paper content for themes..."
     )
     
-    # Generate embeddings for clustering
-    paper_texts = [
-        f"{p.title} {p.abstract or ''}" for p in papers
-    ]
-    
-    embeddings = await hf_client.get_embeddings(paper_texts)
+    # Embeddings for clustering (cached from Stage 2)
+    embeddings = await paper_embedding_matrix(papers)
     
     await manager.send_stage_update(
         session_id,
@@ -32,31 +56,76 @@ async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]
         message="Clustering papers into themes..."
     )
     
-    # Determine optimal number of clusters (3-7 themes)
-    n_clusters = min(max(3, len(papers) // 10), 7)
+    loop = asyncio.get_running_loop()
     
-    # K-means clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    cluster_labels = kmeans.fit_predict(embeddings)
+    # Look for centroids saved by a related query
+    query_embedding = None
+    seed = None
+    if settings.theme_reuse_enabled and keywords and settings.theme_clustering_backend == "kmeans":
+        query_embedding = np.asarray((await hf_client.get_embeddings([" ".join(keywords)]))[0])
+        seed = await asyncio.to_thread(
+            theme_store.find_nearest, query_embedding, settings.theme_reuse_similarity
+        )
+        if seed is not None and (
+            seed.centers.shape[1] != embeddings.shape[1] or len(seed.centers) >= len(papers)
+        ):
+            seed = None
     
-    # Extract theme names from most common words in each cluster
-    theme_names = _extract_theme_names(papers, cluster_labels, n_clusters)
+    # Clustering is CPU-bound, so keep it off the event loop
+    if seed is not None:
+        known_labels = np.array([seed.paper_labels.get(p.paper_id, -1) for p in papers])
+        clustering = await loop.run_in_executor(
+            None,
+            partial(
+                refine_from_centroids,
+                embeddings,
+                seed.centers,
+                known_labels,
+                max_iter=settings.theme_refine_iterations
+            )
+        )
+    else:
+        backend = get_backend(settings.theme_clustering_backend)
+        clustering = await loop.run_in_executor(
+            None,
+            partial(
+                backend,
+                embeddings,
+                min_clusters=settings.theme_min_clusters,
+                max_clusters=settings.theme_max_clusters,
+                silhouette_sample=settings.theme_silhouette_sample,
+                minibatch_threshold=settings.theme_minibatch_threshold,
+                min_cluster_size=settings.theme_min_cluster_size,
+                reduced_dimensions=settings.theme_reduced_dimensions
+            )
+        )
     
-    # Group papers by theme
-    themes = {}
-    for i, paper in enumerate(papers):
-        theme = theme_names[cluster_labels[i]]
-        paper.theme = theme
-        
-        if theme not in themes:
-            themes[theme] = []
-        themes[theme].append(paper)
+    if query_embedding is not None:
+        await asyncio.to_thread(
+            theme_store.save,
+            keywords,
+            query_embedding,
+            clustering.centers,
+            {p.paper_id: int(label) for p, label in zip(papers, clustering.labels)},
+            min_similarity=settings.theme_reuse_similarity
+        )
+    
+    if clustering.linkage_tree is not None:
+        _linkage_cache.set(session_id, {"papers": papers, "tree": clustering.linkage_tree})
+    
+    themes = _group_by_theme(papers, clustering.labels, len(clustering.centers))
+    theme_map = await loop.run_in_executor(
+        None, partial(_theme_map, papers, embeddings, clustering.labels, clustering.centers)
+    )
     
     await manager.send_stage_complete(
         session_id,
         stage=3,
         result={
             "themes_found": len(themes),
+            "backend": settings.theme_clustering_backend,
+            "seeded_from": seed.keywords if seed is not None else None,
+            "unclustered": len(themes.get(UNCLUSTERED_THEME, [])),
             "themes": {
                 theme: len(papers_list)
                 for theme, papers_list in themes.items()
@@ -66,46 +135,90 @@ async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]
             "themes": {
                 theme: [p.model_dump() for p in papers_list]
                 for theme, papers_list in themes.items()
-            }
+            },
+            "theme_map": theme_map
         }
     )
     
     return themes
 
 
+def recut_themes(session_id: str, n_themes: int) -> Optional[Dict[str, List[Paper]]]:
+    """Re-group a session's papers into n_themes by cutting its cached linkage tree
+    
+    Returns None when the session was not clustered hierarchically (or has
+    been evicted from the cache). Papers are copied, so the session's own
+    theme assignment is left untouched.
+    """
+    cached = _linkage_cache.get(session_id)
+    if cached is None:
+        return None
+    
+    papers = [p.model_copy() for p in cached["papers"]]
+    labels = cut_tree(cached["tree"], n_themes)
+    return _group_by_theme(papers, labels, int(labels.max()) + 1)
+
+
+def _theme_map(
+    papers: List[Paper],
+    embeddings: np.ndarray,
+    labels: np.ndarray,
+    centers: np.ndarray
+) -> dict:
+    """2D projection of papers and theme centers, keyed for the client"""
+    projection = project_2d(embeddings, centers)
+    
+    # Centers are indexed by cluster label; name them after their theme
+    theme_of_label = {int(label): paper.theme for paper, label in zip(papers, labels)}
+    center_points = projection.pop("centers")
+    projection["centers"] = {
+        theme_of_label[label]: center_points[2 * label:2 * label + 2]
+        for label in range(len(centers))
+        if label in theme_of_label
+    }
+    projection["paper_ids"] = [p.paper_id for p in papers]
+    return projection
+
+
+def _group_by_theme(papers: List[Paper], labels: np.ndarray, n_clusters: int) -> Dict[str, List[Paper]]:
+    """Name each cluster and group papers under their theme name"""
+    theme_names = _extract_theme_names(papers, labels, n_clusters)
+    theme_names[OUTLIER_LABEL] = UNCLUSTERED_THEME
+    
+    themes = {}
+    for i, paper in enumerate(papers):
+        theme = theme_names[labels[i]]
+        paper.theme = theme
+        
+        if theme not in themes:
+            themes[theme] = []
+        themes[theme].append(paper)
+    
+    return themes
+
+
 def _extract_theme_names(papers: List[Paper], labels: np.ndarray, n_clusters: int) -> Dict[int, str]:
-    """Extract descriptive theme names from paper titles"""
-    from collections import defaultdict
-    import re
-    
-    cluster_words = defaultdict(list)
-    
-    # Collect words from each cluster
-    for i, label in enumerate(labels):
-        title = papers[i].title.lower()
-        # Extract meaningful words (3+ chars, not common words)
-        words = re.findall(r'\b[a-z]{4,}\b', title)
-        common_words = {'with', 'from', 'using', 'based', 'analysis', 'study', 'research', 'paper'}
-        words = [w for w in words if w not in common_words]
-        cluster_words[label].extend(words)
-    
-    # Get most common word for each cluster
+    """Name each theme after its highest-weighted c-TF-IDF keyphrase"""
+    documents = [f"{p.title} {p.abstract or ''}" for p in papers]
+    keyphrases = ctfidf_keyphrases(documents, labels, n_clusters)
+    
     theme_names = {}
-    used_names = set()
+    used_names = {UNCLUSTERED_THEME}
     
     for label in range(n_clusters):
-        if cluster_words[label]:
-            word_counts = Counter(cluster_words[label])
-            # Get most common unique word
-            for word, count in word_counts.most_common():
-                theme_name = word.capitalize()
-                if theme_name not in used_names:
-                    theme_names[label] = theme_name
-                    used_names.add(theme_name)
-                    break
-            else:
-                theme_names[label] = f"Theme {label + 1}"
-        else:
-            theme_names[label] = f"Theme {label + 1}"
+        theme_names[label] = f"Theme {label + 1}"
+        for candidate in _label_candidates(keyphrases[label]):
+            if candidate not in used_names:
+                theme_names[label] = candidate
+                used_names.add(candidate)
+                break
     
     return theme_names
+
+
+def _label_candidates(terms: List[str]) -> List[str]:
+    """Theme labels to try in order: multi-word phrases first, then pairs of terms"""
+    phrases = [term for term in terms if " " in term]
+    words = [term for term in terms if " " not in term]
+    candidates = phrases + [" & ".join(words[i:i + 2]) for i in range(0, len(words), 2)] + words
+    return [" ".join(w.capitalize() for w in c.split(" ")) for c in candidates if c]
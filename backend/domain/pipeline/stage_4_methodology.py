@@ -1,9 +1,15 @@
 """Stage 4: Group papers by research methodology"""
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Tuple
+from collections import OrderedDict, defaultdict
+import hashlib
+import re
+import numpy as np
+from scipy.sparse import csr_matrix
 from backend.api.models.paper_model import Paper
+from backend.infrastructure.ai.huggingface_client import hf_client
 from backend.core.websocket_manager import manager
-import re
+from backend.core.config import settings
+from backend.domain.embeddings import paper_embedding_matrix
 
 
 # Common methodology keywords
@@ -19,6 +25,60 @@ METHODOLOGY_KEYWORDS = {
 }
 
 
+def _compile_keyword_matcher(keyword_table: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, List[str]]]:
+    """Build one alternation over every keyword so a text is scanned once
+    
+    Terms are tried longest first and must sit on word boundaries; a
+    trailing plural "s"/"es" is allowed.
+    """
+    term_methods: Dict[str, List[str]] = defaultdict(list)
+    for methodology, keywords in keyword_table.items():
+        for keyword in keywords:
+            term_methods[keyword.lower()].append(methodology)
+    
+    alternation = "|".join(
+        re.escape(term) for term in sorted(term_methods, key=len, reverse=True)
+    )
+    pattern = re.compile(rf"\b({alternation})(?:e?s)?\b", re.IGNORECASE)
+    return pattern, dict(term_methods)
+
+
+_KEYWORD_PATTERN, _TERM_METHODS = _compile_keyword_matcher(METHODOLOGY_KEYWORDS)
+
+
+def keyword_hits(text: str) -> Dict[str, int]:
+    """Number of distinct keywords of each methodology found in the text"""
+    hits: Dict[str, int] = defaultdict(int)
+    for term in {match.lower() for match in _KEYWORD_PATTERN.findall(text)}:
+        for methodology in _TERM_METHODS[term]:
+            hits[methodology] += 1
+    return dict(hits)
+
+
+# Prototype descriptions embedded once and compared against paper embeddings
+METHODOLOGY_DESCRIPTIONS = {
+    "Experimental": "An experimental study that tests a hypothesis with controlled experiments, randomized trials or ablations and measures the outcomes.",
+    "Survey": "A survey or qualitative study based on questionnaires, interviews, ethnography or a broad overview of prior work.",
+    "Case Study": "A case study that examines one specific organization, system, event or deployment in depth.",
+    "Simulation": "A simulation study using Monte Carlo methods, agent-based models or simulated environments to study a system.",
+    "Meta-Analysis": "A systematic review or meta-analysis that pools and statistically combines the results of many published studies.",
+    "Observational": "An observational study of longitudinal, cohort or cross-sectional data collected without intervention.",
+    "Theoretical": "A theoretical paper that develops a conceptual framework, formal model, proofs or analytical results.",
+    "Computational": "A computational paper proposing algorithms, machine learning or deep learning methods and neural network architectures."
+}
+
+# Column order of the paper x methodology score matrix
+METHODOLOGY_NAMES = list(METHODOLOGY_KEYWORDS)
+METHODOLOGY_COLUMNS = {name: j for j, name in enumerate(METHODOLOGY_NAMES)}
+
+# Embedded METHODOLOGY_DESCRIPTIONS, per embedding model
+_prototype_cache: Dict[str, np.ndarray] = {}
+
+# Zero-shot NLI scores per (paper_id, label set), so repeat papers are free
+NLI_HYPOTHESIS_TEMPLATE = "This paper uses a {} research methodology."
+_nli_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], np.ndarray]" = OrderedDict()
+
+
 async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]]:
     """Classify papers by research methodology"""
     
@@ -29,42 +89,42 @@ async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]
         message="Analyzing research methodologies..."
     )
     
-    methodologies = defaultdict(list)
+    classifier = settings.methodology_classifier
+    if classifier == "embedding":
+        try:
+            scores = await _score_by_embedding(papers)
+        except Exception as e:
+            print(f"Embedding methodology classifier failed, using keywords: {e}")
+            classifier = "keyword"
     
-    for i, paper in enumerate(papers):
-        if i % 10 == 0:
-            progress = 20 + int((i / len(papers)) * 60)
-            await manager.send_stage_update(
-                session_id,
-                stage=4,
-                progress=progress,
-                message=f"Classified {i}/{len(papers)} papers..."
-            )
-        
-        # Combine title and abstract for analysis
-        text = (paper.title + " " + (paper.abstract or "")).lower()
-        
-        # Find matching methodologies
-        scores = {}
-        for methodology, keywords in METHODOLOGY_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                scores[methodology] = score
-        
-        # Assign to best matching methodology or "Other"
-        if scores:
-            best_methodology = max(scores.items(), key=lambda x: x[1])[0]
-            paper.methodology = best_methodology
-        else:
-            paper.methodology = "Other"
-        
-        methodologies[paper.methodology].append(paper)
+    if classifier != "embedding":
+        classifier = "keyword"
+        scores = await _score_by_keywords(session_id, papers)
+    
+    nli_refined = 0
+    if settings.methodology_nli_enabled:
+        await manager.send_stage_update(
+            session_id,
+            stage=4,
+            progress=80,
+            message="Re-checking uncertain papers with zero-shot NLI..."
+        )
+        try:
+            nli_refined = await _refine_with_nli(papers, scores)
+        except Exception as e:
+            print(f"Zero-shot NLI refinement failed, keeping {classifier} scores: {e}")
+    
+    score_matrix = _threshold_scores(scores, settings.methodology_label_threshold)
+    methodologies = _group_by_methodology(papers, score_matrix)
     
     await manager.send_stage_complete(
         session_id,
         stage=4,
         result={
             "methodologies_found": len(methodologies),
+            "classifier": classifier,
+            "nli_refined": nli_refined,
+            "multi_label_papers": int((np.diff(score_matrix.indptr) > 1).sum()),
             "distribution": {
                 method: len(papers_list)
                 for method, papers_list in methodologies.items()
@@ -72,10 +132,173 @@ async def execute(session_id: str, papers: List[Paper]) -> Dict[str, List[Paper]
         },
         data={
             "methodologies": {
-                method: [p.model_dump() for p in papers_list]
+                method: [_paper_payload(p, i, score_matrix) for i, p in papers_list]
                 for method, papers_list in methodologies.items()
+            },
+            "methodology_scores": {
+                "labels": METHODOLOGY_NAMES,
+                "paper_ids": [p.paper_id for p in papers],
+                "indptr": score_matrix.indptr.tolist(),
+                "indices": score_matrix.indices.tolist(),
+                "data": np.round(score_matrix.data, 3).tolist()
             }
         }
     )
     
-    return dict(methodologies)
+    return {
+        method: [p for _, p in papers_list]
+        for method, papers_list in methodologies.items()
+    }
+
+
+async def _refine_with_nli(papers: List[Paper], scores: np.ndarray) -> int:
+    """Replace the scores of low-confidence papers with zero-shot NLI scores
+    
+    Only the least confident papers (up to methodology_nli_max_papers) are
+    sent to the model, and results are cached per (paper key, label set).
+    Updates `scores` in place and returns the number of papers refined.
+    """
+    label_set = tuple(METHODOLOGY_NAMES)
+    confidence = scores.max(axis=1) if scores.size else np.zeros(0)
+    uncertain = np.flatnonzero(confidence < settings.methodology_nli_confidence)
+    uncertain = uncertain[np.argsort(confidence[uncertain])][:settings.methodology_nli_max_papers]
+    
+    # Apply cache hits before awaiting: a concurrent run may evict them meanwhile
+    to_classify = []
+    for i in uncertain:
+        key = (_nli_key(papers[i]), label_set)
+        if key in _nli_cache:
+            _nli_cache.move_to_end(key)
+            scores[i] = _nli_cache[key]
+        else:
+            to_classify.append(i)
+    
+    if to_classify:
+        rows = await hf_client.zero_shot_classify(
+            [papers[i].title + " " + (papers[i].abstract or "") for i in to_classify],
+            [name.lower() for name in METHODOLOGY_NAMES],
+            hypothesis_template=NLI_HYPOTHESIS_TEMPLATE,
+            batch_size=settings.methodology_nli_batch_size
+        )
+        for i, row in zip(to_classify, rows):
+            scores[i] = _nli_cache[(_nli_key(papers[i]), label_set)] = np.asarray(row)
+    
+    while len(_nli_cache) > settings.methodology_nli_cache_size:
+        _nli_cache.popitem(last=False)
+    
+    return len(uncertain)
+
+
+def _nli_key(paper: Paper) -> str:
+    """Cache key of a paper: its ID, or a hash of its text if it has none"""
+    if paper.paper_id:
+        return paper.paper_id
+    text = f"{paper.title}\n{paper.abstract or ''}"
+    return "sha1:" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _threshold_scores(scores: np.ndarray, threshold: float) -> csr_matrix:
+    """Sparse paper x methodology matrix keeping scores at or above threshold
+    
+    The best methodology of a paper is always kept (if its score is
+    positive), so every classified paper has at least one label.
+    """
+    keep = scores >= threshold
+    rows = np.arange(len(scores))
+    best = scores.argmax(axis=1) if scores.size else np.zeros(0, dtype=int)
+    keep[rows, best] |= scores[rows, best] > 0
+    return csr_matrix(np.where(keep, scores, 0.0))
+
+
+def _group_by_methodology(papers: List[Paper], score_matrix: csr_matrix) -> Dict[str, List[Tuple[int, Paper]]]:
+    """Group papers under every methodology they are labelled with
+    
+    `paper.methodology` is set to the highest-scoring label; papers with no
+    label are "Other".
+    """
+    methodologies = defaultdict(list)
+    
+    for i, paper in enumerate(papers):
+        start, end = score_matrix.indptr[i], score_matrix.indptr[i + 1]
+        columns = score_matrix.indices[start:end]
+        values = score_matrix.data[start:end]
+        
+        if len(columns) == 0:
+            paper.methodology = "Other"
+            methodologies["Other"].append((i, paper))
+            continue
+        
+        order = np.argsort(values)[::-1]
+        paper.methodology = METHODOLOGY_NAMES[columns[order[0]]]
+        for j in columns[order]:
+            methodologies[METHODOLOGY_NAMES[j]].append((i, paper))
+    
+    return methodologies
+
+
+def _paper_payload(paper: Paper, row: int, score_matrix: csr_matrix) -> dict:
+    """Paper as sent to the client, with its compact methodology scores"""
+    start, end = score_matrix.indptr[row], score_matrix.indptr[row + 1]
+    payload = paper.model_dump()
+    payload["methodology_scores"] = {
+        METHODOLOGY_NAMES[j]: round(float(v), 3)
+        for j, v in zip(score_matrix.indices[start:end], score_matrix.data[start:end])
+    }
+    return payload
+
+
+async def _score_by_embedding(papers: List[Paper]) -> np.ndarray:
+    """Score each paper against every methodology prototype
+    
+    One matrix product compares every paper with every prototype; a
+    softmax over the cosine scores (temperature METHODOLOGY_TEMPERATURE)
+    turns them into per-class confidence scores, not fitted probabilities.
+    Papers not similar enough to any prototype get an all-zero row (i.e.
+    "Other").
+    """
+    prototypes = await _methodology_prototypes()
+    
+    similarity = (await paper_embedding_matrix(papers)) @ prototypes.T
+    
+    logits = similarity / settings.methodology_temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    probabilities = np.exp(logits)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    
+    probabilities[similarity.max(axis=1) < settings.methodology_min_similarity] = 0.0
+    return probabilities
+
+
+async def _methodology_prototypes() -> np.ndarray:
+    """Unit-normalized embeddings of METHODOLOGY_DESCRIPTIONS, computed once"""
+    if settings.embedding_model not in _prototype_cache:
+        prototypes = np.asarray(
+            await hf_client.get_embeddings([METHODOLOGY_DESCRIPTIONS[name] for name in METHODOLOGY_NAMES]),
+            dtype=np.float64
+        )
+        prototypes /= np.linalg.norm(prototypes, axis=1, keepdims=True)
+        _prototype_cache[settings.embedding_model] = prototypes
+    return _prototype_cache[settings.embedding_model]
+
+
+async def _score_by_keywords(session_id: str, papers: List[Paper]) -> np.ndarray:
+    """Score each paper by its share of keyword hits per methodology"""
+    scores = np.zeros((len(papers), len(METHODOLOGY_NAMES)))
+    
+    for i, paper in enumerate(papers):
+        if i % 10 == 0:
+            progress = 20 + int((i / len(papers)) * 60)
+            await manager.send_stage_update(
+                session_id,
+                stage=4,
+                progress=progress,
+                message=f"Classified {i}/{len(papers)} papers..."
+            )
+        
+        # Single pass over title and abstract
+        hits = keyword_hits(paper.title + " " + (paper.abstract or ""))
+        total = sum(hits.values())
+        for methodology, count in hits.items():
+            scores[i, METHODOLOGY_COLUMNS[methodology]] = count / total
+    
+    return scores
@@ -1,16 +1,36 @@
 """Stage 5: Final ranking of papers"""
-from typing import List
+from typing import List, Optional, Tuple
+import numpy as np
 from backend.api.models.paper_model import Paper
+from backend.api.models.ranking_model import RankingWeights
 from backend.core.websocket_manager import manager
+from backend.core.config import settings
+from backend.core.session_cache import SessionCache
+from backend.domain.citation_graph import build_adjacency, pagerank
+from backend.infrastructure.external.semantic_scholar import SemanticScholarClient
 
 
-async def execute(session_id: str, papers: List[Paper]) -> List[Paper]:
+# Columns of the ranking feature matrix; names match RankingWeights fields
+FEATURE_NAMES = ["relevance", "citations", "recency", "abstract", "venue", "centrality"]
+
+# Feature matrices per session, so rankings can be recomputed with new
+# weights without re-running the pipeline
+_feature_cache = SessionCache(max_sessions=settings.session_cache_size)
+
+
+async def execute(
+    session_id: str,
+    papers: List[Paper],
+    weights: Optional[RankingWeights] = None
+) -> List[Paper]:
     """
-    Rank papers using multi-factor scoring:
+    Rank papers using multi-factor scoring (default weights):
     - Relevance score (40%)
-    - Citation count (30%)
+    - Citation count, log-scaled (30%)
     - Recency (20%)
     - Abstract quality (10%)
+    - Venue known (0%)
+    - In-set citation PageRank (0%, only with RANKING_USE_CITATION_GRAPH)
     """
     
     await manager.send_stage_update(
@@ -20,48 +40,25 @@ async def execute(session_id: str, papers: List[Paper]) -> List[Paper]:
         message="Calculating final rankings..."
     )
     
-    # Normalize factors
-    max_citations = max((p.citation_count for p in papers), default=1)
-    max_year = max((p.year for p in papers if p.year), default=2024)
-    min_year = min((p.year for p in papers if p.year), default=1990)
-    
-    scored_papers = []
-    
-    for paper in papers:
-        # Factor 1: Relevance score (already 0-1)
-        relevance = paper.relevance_score or 0
-        
-        # Factor 2: Citation count (normalized)
-        citations = paper.citation_count / max_citations if max_citations > 0 else 0
-        
-        # Factor 3: Recency (normalized)
-        if paper.year:
-            year_range = max_year - min_year if max_year > min_year else 1
-            recency = (paper.year - min_year) / year_range
-        else:
-            recency = 0
-        
-        # Factor 4: Abstract quality (has abstract = 1, no abstract = 0)
-        abstract_quality = 1.0 if paper.abstract else 0.5
-        
-        # Weighted final score
-        final_score = (
-            0.40 * relevance +
-            0.30 * citations +
-            0.20 * recency +
-            0.10 * abstract_quality
+    centrality = None
+    if settings.ranking_use_citation_graph and papers:
+        await manager.send_stage_update(
+            session_id,
+            stage=5,
+            progress=40,
+            message="Building citation graph..."
         )
-        
-        scored_papers.append((final_score, paper))
+        centrality = await citation_centrality(papers)
     
-    # Sort by final score
-    scored_papers.sort(key=lambda x: x[0], reverse=True)
+    features = build_feature_matrix(papers, centrality=centrality)
+    _feature_cache.set(session_id, {"papers": list(papers), "features": features})
+    order, scores = rank(features, weights or RankingWeights())
     
     # Assign ranks
     ranked_papers = []
-    for rank, (score, paper) in enumerate(scored_papers, 1):
-        paper.final_rank = rank
-        ranked_papers.append(paper)
+    for rank_position, i in enumerate(order, 1):
+        papers[i].final_rank = rank_position
+        ranked_papers.append(papers[i])
     
     await manager.send_stage_update(
         session_id,
@@ -79,9 +76,9 @@ async def execute(session_id: str, papers: List[Paper]) -> List[Paper]:
                 {
                     "rank": p.final_rank,
                     "title": p.title,
-                    "score": round(scored_papers[i][0], 3)
+                    "score": round(float(scores[i]), 3)
                 }
-                for i, p in enumerate(ranked_papers[:10])
+                for p, i in zip(ranked_papers[:10], order[:10])
             ]
         },
         data={
@@ -90,3 +87,94 @@ async def execute(session_id: str, papers: List[Paper]) -> List[Paper]:
     )
     
     return ranked_papers
+
+
+def rerank_session(session_id: str, weights: RankingWeights) -> Optional[List[dict]]:
+    """Re-rank a finished session's papers with new weights
+    
+    Uses only the cached feature matrix (no model or network calls) and
+    leaves the session's stored ranking untouched. Returns None if the
+    session has no cached features.
+    """
+    cached = _feature_cache.get(session_id)
+    if cached is None:
+        return None
+    
+    papers = cached["papers"]
+    order, scores = rank(cached["features"], weights)
+    
+    return [
+        {**papers[i].model_dump(), "final_rank": position, "ranking_score": round(float(scores[i]), 4)}
+        for position, i in enumerate(order, 1)
+    ]
+
+
+async def citation_centrality(papers: List[Paper]) -> Optional[np.ndarray]:
+    """PageRank of each paper in the citation graph among the given papers
+    
+    Returns None if the citation data cannot be fetched.
+    """
+    paper_ids = [p.paper_id for p in papers]
+    try:
+        links = await SemanticScholarClient().get_citation_links(paper_ids)
+    except Exception as e:
+        print(f"Citation graph unavailable, skipping centrality: {e}")
+        return None
+    
+    return pagerank(build_adjacency(paper_ids, links))
+
+
+def build_feature_matrix(papers: List[Paper], centrality: Optional[np.ndarray] = None) -> np.ndarray:
+    """Normalized ranking features, one row per paper (columns: FEATURE_NAMES)
+    
+    `centrality` (e.g. PageRank) is scaled by its maximum; without it the
+    column is zero.
+    """
+    n = len(papers)
+    features = np.zeros((n, len(FEATURE_NAMES)))
+    if n == 0:
+        return features
+    
+    relevance = np.array([p.relevance_score or 0.0 for p in papers])
+    citations = np.array([p.citation_count or 0 for p in papers], dtype=float)
+    years = np.array([p.year or np.nan for p in papers], dtype=float)
+    
+    # Log scale so one heavily cited paper does not squash the rest to zero
+    log_citations = np.log1p(citations)
+    max_log_citations = log_citations.max()
+    
+    # Recency relative to the oldest and newest paper in the set
+    has_year = ~np.isnan(years)
+    recency = np.zeros(n)
+    if has_year.any():
+        min_year, max_year = years[has_year].min(), years[has_year].max()
+        year_range = max_year - min_year if max_year > min_year else 1
+        recency[has_year] = (years[has_year] - min_year) / year_range
+    
+    features[:, 0] = relevance
+    features[:, 1] = log_citations / max_log_citations if max_log_citations > 0 else 0.0
+    features[:, 2] = recency
+    features[:, 3] = [1.0 if p.abstract else 0.5 for p in papers]
+    features[:, 4] = [1.0 if p.venue else 0.0 for p in papers]
+    if centrality is not None and len(centrality) and centrality.max() > 0:
+        features[:, 5] = centrality / centrality.max()
+    return features
+
+
+def weight_vector(weights: RankingWeights) -> np.ndarray:
+    """Weights in FEATURE_NAMES order, normalized to sum to 1"""
+    w = np.array([getattr(weights, name) for name in FEATURE_NAMES], dtype=float)
+    total = w.sum()
+    return w / total if total > 0 else np.full(len(w), 1.0 / len(w))
+
+
+def rank(features: np.ndarray, weights: RankingWeights) -> Tuple[np.ndarray, np.ndarray]:
+    """Score every paper with one matrix-vector product
+    
+    Returns (order, scores): paper indices from best to worst and the
+    score of each paper (in input order).
+    """
+    scores = features @ weight_vector(weights)
+    # Stable sort keeps the Stage 2 order for ties
+    order = np.argsort(-scores, kind="stable")
+    return order, scores
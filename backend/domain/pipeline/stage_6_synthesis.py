@@ -1,8 +1,19 @@
 """Stage 6: Generate structured synthesis report"""
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
+import threading
+import time
 from backend.api.models.paper_model import Paper, LiteratureReviewReport
 from backend.infrastructure.ai.huggingface_client import hf_client
 from backend.core.websocket_manager import manager
+from backend.core.config import settings
+from backend.core.cancellation import cancellation
+from backend.core.session_cache import SessionCache
+from backend.domain.extractive_summary import summarize_extractive
+from backend.domain.report_builder import ReportBuilder, ReportDocument, render_markdown
+
+# Report documents of recent sessions; the orchestrator hands a finished
+# session's document to Stage 7 and keeps it with the pipeline result
+_documents = SessionCache(max_sessions=settings.session_cache_size)
 
 
 async def execute(
@@ -21,17 +32,13 @@ async def execute(
         message="Generating synthesis report..."
     )
     
-    # Build synthesis sections
-    synthesis_parts = []
+    builder = ReportBuilder(f"Literature Review: {', '.join(keywords)}")
     
     # 1. Overview
-    overview = f"""# Literature Review: {', '.join(keywords)}
-
-## Overview
-This literature review analyzed {len(papers)} academic papers related to {', '.join(keywords)}.
-The papers were classified into {len(themes)} thematic clusters and {len(methodologies)} methodological categories.
-"""
-    synthesis_parts.append(overview)
+    builder.section("Overview").paragraph(
+        f"This literature review analyzed {len(papers)} academic papers related to {', '.join(keywords)}. "
+        f"The papers were classified into {len(themes)} thematic clusters and {len(methodologies)} methodological categories."
+    )
     
     await manager.send_stage_update(
         session_id,
@@ -40,18 +47,22 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
         message="Analyzing thematic clusters..."
     )
     
-    # 2. Thematic Analysis
-    theme_section = "\n## Thematic Analysis\n\n"
+    # 2. Thematic Analysis; for large reviews each theme is built only
+    # when a client (or Stage 7) asks for it, and lists more papers
+    lazy = len(papers) >= settings.report_lazy_min_papers
+    theme_section = builder.section("Thematic Analysis", "themes")
     for theme, theme_papers in sorted(themes.items(), key=lambda x: len(x[1]), reverse=True):
-        theme_section += f"### {theme} ({len(theme_papers)} papers)\n\n"
-        top_papers = sorted(theme_papers, key=lambda p: p.final_rank or 999)[:3]
-        for paper in top_papers:
-            theme_section += f"- **{paper.title}** ({paper.year or 'n.d.'})\n"
-            if paper.abstract:
-                abstract_preview = paper.abstract[:200] + "..." if len(paper.abstract) > 200 else paper.abstract
-                theme_section += f"  {abstract_preview}\n\n"
-    
-    synthesis_parts.append(theme_section)
+        ranked = sorted(theme_papers, key=lambda p: p.final_rank or 999)
+        title = f"{theme} ({len(theme_papers)} papers)"
+        if lazy:
+            top_papers = ranked[:settings.report_theme_section_papers]
+            theme_section.lazy_subsection(
+                title,
+                lambda section, top_papers=top_papers: section.papers(top_papers),
+                f"theme-{theme}"
+            )
+        else:
+            theme_section.subsection(title, f"theme-{theme}").papers(ranked[:3])
     
     await manager.send_stage_update(
         session_id,
@@ -61,26 +72,23 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
     )
     
     # 3. Methodological Analysis
-    method_section = "\n## Methodological Distribution\n\n"
-    for method, method_papers in sorted(methodologies.items(), key=lambda x: len(x[1]), reverse=True):
-        method_section += f"- **{method}**: {len(method_papers)} papers ({len(method_papers)/len(papers)*100:.1f}%)\n"
-    
-    synthesis_parts.append(method_section)
+    # Papers can carry several methodology labels, so shares are per paper
+    # and need not add up to 100%
+    method_section = builder.section("Methodological Distribution", "methodologies").table(
+        ["Methodology", "Papers Tagged", "% of Papers"],
+        [
+            [method, str(len(method_papers)), f"{len(method_papers)/len(papers)*100:.1f}%"]
+            for method, method_papers in sorted(methodologies.items(), key=lambda x: len(x[1]), reverse=True)
+        ]
+    )
+    if sum(len(method_papers) for method_papers in methodologies.values()) > len(papers):
+        method_section.paragraph(
+            "Some papers use more than one methodology and are counted under each, "
+            "so the percentages add up to more than 100%."
+        )
     
     # 4. Top Papers
-    top_section = "\n## Highly Relevant Papers\n\n"
-    for paper in papers[:10]:
-        top_section += f"**{paper.final_rank}. {paper.title}**\n\n"
-        top_section += f"- Authors: {', '.join(paper.authors[:3])}{' et al.' if len(paper.authors) > 3 else ''}\n"
-        top_section += f"- Year: {paper.year or 'n.d.'}\n"
-        top_section += f"- Citations: {paper.citation_count}\n"
-        relevance_display = f"{paper.relevance_score:.3f}" if paper.relevance_score is not None else "N/A"
-        top_section += f"- Relevance Score: {relevance_display}\n"
-        if paper.url:
-            top_section += f"- URL: {paper.url}\n"
-        top_section += "\n"
-    
-    synthesis_parts.append(top_section)
+    builder.section("Highly Relevant Papers", "top-papers").papers(papers[:10], detailed=True)
     
     # 5. Key Insights (AI-generated summary)
     await manager.send_stage_update(
@@ -90,49 +98,65 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
         message="Generating AI insights (loading model, may take 1-2 minutes first time)..."
     )
     
+    extractive = settings.synthesis_mode == "extractive"
+    
+    async def send_partial(text: str):
+        await manager.send_stage_update(
+            session_id,
+            stage=6,
+            progress=88,
+            message="Writing key insights...",
+            partial_text=text
+        )
+    
     try:
-        # Summarize top abstracts
-        top_abstracts = " ".join([
-            p.abstract for p in papers[:5] if p.abstract
-        ])
-        if top_abstracts:
-            await manager.send_stage_update(
-                session_id,
-                stage=6,
-                progress=85,
-                message=f"Running summarization model on {len(top_abstracts)} chars of abstracts..."
-            )
-            ai_summary = await hf_client.summarize(top_abstracts[:2000], max_length=200)
-            await manager.send_stage_update(
-                session_id,
-                stage=6,
-                progress=90,
-                message="AI summary generated successfully"
-            )
-            insights_section = f"\n## Key Insights\n\n{ai_summary}\n"
-            synthesis_parts.append(insights_section)
-        else:
+        await manager.send_stage_update(
+            session_id,
+            stage=6,
+            progress=85,
+            message=f"Summarizing {len(themes)} themes{' (extractive)' if extractive else ''}..."
+        )
+        overall_summary, theme_summaries = await _summarize_themes(
+            themes,
+            extractive=extractive,
+            on_partial=send_partial if settings.synthesis_stream else None,
+            time_budget=settings.synthesis_time_budget,
+            cancel_event=cancellation.token(session_id)
+        )
+        await manager.send_stage_update(
+            session_id,
+            stage=6,
+            progress=90,
+            message="AI summary generated successfully"
+        )
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Could not generate AI summary: {error_msg}")
+        overall_summary, theme_summaries = None, {}
+        if not extractive:
             await manager.send_stage_update(
                 session_id,
                 stage=6,
                 progress=85,
-                message="No abstracts available for AI summarization, using manual insights"
+                message=f"AI summarization failed ({error_msg[:100]}), using extractive summary"
             )
-    except Exception as e:
-        error_msg = str(e)
-        print(f"Could not generate AI summary: {error_msg}")
-        await manager.send_stage_update(
-            session_id,
-            stage=6,
-            progress=85,
-            message=f"AI summarization failed ({error_msg[:100]}), using manual insights"
+            try:
+                overall_summary, theme_summaries = await _summarize_themes(themes, extractive=True)
+            except Exception as e:
+                print(f"Could not generate extractive summary: {e}")
+    
+    insights = builder.section("Key Insights", "insights")
+    if overall_summary:
+        insights.paragraph(overall_summary)
+        for theme, summary in theme_summaries.items():
+            insights.subsection(theme, f"insight-{theme}").paragraph(summary)
+    else:
+        # Add a manual insights section if both summarizers fail
+        top_method, top_method_papers = max(methodologies.items(), key=lambda x: len(x[1]))
+        insights.paragraph(
+            f"This review covers {len(papers)} papers across {len(themes)} thematic areas. "
+            f"The most common methodological approach is {top_method} with {len(top_method_papers)} papers."
         )
-        # Add a manual insights section if AI fails
-        insights_section = "\n## Key Insights\n\n"
-        insights_section += f"This review covers {len(papers)} papers across {len(themes)} thematic areas. "
-        insights_section += f"The most common methodological approach is {max(methodologies.items(), key=lambda x: len(x[1]))[0]} "
-        insights_section += f"with {len(max(methodologies.items(), key=lambda x: len(x[1]))[1])} papers.\n"
-        synthesis_parts.append(insights_section)
     
     await manager.send_stage_update(
         session_id,
@@ -141,8 +165,10 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
         message="Finalizing report structure..."
     )
     
-    # Combine all sections
-    full_synthesis = "\n".join(synthesis_parts)
+    # Render the document once; Stage 7 renders HTML from the same structure
+    document = builder.build()
+    _documents.set(session_id, document)
+    full_synthesis = render_markdown(document)
     
     # Create report object
     report = LiteratureReviewReport(
@@ -153,6 +179,7 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
         top_papers=papers[:10],
         synthesis=full_synthesis,
         metadata={
+            "sections": document.outline(),
             "themes": list(themes.keys()),
             "methodologies": list(methodologies.keys()),
             "avg_citations": sum(p.citation_count for p in papers) / len(papers) if papers else 0
@@ -164,7 +191,7 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
         stage=6,
         result={
             "report_generated": True,
-            "sections": len(synthesis_parts),
+            "sections": len(document.sections),
             "total_length": len(full_synthesis)
         },
         data={
@@ -173,3 +200,94 @@ The papers were classified into {len(themes)} thematic clusters and {len(methodo
     )
     
     return report
+
+
+def get_document(session_id: str) -> Optional[ReportDocument]:
+    """Structured report document built by the last Stage 6 run of a session"""
+    return _documents.get(session_id)
+
+
+async def _summarize_themes(
+    themes: Dict[str, List[Paper]],
+    extractive: bool = False,
+    on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+    time_budget: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> Tuple[str, Dict[str, str]]:
+    """Map-reduce summary of the corpus
+    
+    Map: the top papers of every theme are summarized in one batched call.
+    Local models run on the shared executor (MODEL_WORKERS threads, 1 by
+    default), so themes are not generated in parallel there; the speed-up
+    comes from batching. Only the HF API path sends requests concurrently.
+    Reduce: the theme summaries are summarized again into an overview.
+    With `on_partial`, the client gets the text so far: theme summaries as
+    each one finishes, then the same summaries followed by the overview as
+    it is generated, so the streamed text only ever grows. Extractive
+    mode picks representative sentences instead of generating.
+    
+    Generation shares `time_budget` seconds and stops on `cancel_event`;
+    themes not reached by then are left out of the result.
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    
+    def remaining() -> Optional[float]:
+        return max(deadline - time.monotonic(), 0.0) if deadline else None
+    
+    chunk_chars = settings.synthesis_chunk_chars
+    theme_texts = {}
+    for theme, theme_papers in sorted(themes.items(), key=lambda x: len(x[1]), reverse=True):
+        top_papers = sorted(theme_papers, key=lambda p: p.final_rank or 999)[:settings.synthesis_papers_per_theme]
+        text = " ".join(p.abstract for p in top_papers if p.abstract)
+        if text:
+            theme_texts[theme] = text[:chunk_chars]
+    
+    if not theme_texts:
+        raise ValueError("No abstracts available to summarize")
+    
+    async def summarize(texts: List[str], max_length: int, on_summary=None) -> List[str]:
+        if extractive:
+            return await summarize_extractive(
+                texts, settings.extractive_sentences, settings.extractive_diversity
+            )
+        return await hf_client.summarize_batch(texts, max_length, remaining(), cancel_event, on_summary)
+    
+    theme_names = list(theme_texts)
+    finished = {}
+    
+    def themes_text(summaries: Dict[str, str]) -> str:
+        return "\n\n".join(f"{theme}: {text}" for theme, text in summaries.items())
+    
+    async def on_theme_summary(i: int, summary: str):
+        finished[theme_names[i]] = summary
+        await on_partial(themes_text(finished))
+    
+    summaries = await summarize(
+        list(theme_texts.values()),
+        settings.theme_summary_max_length,
+        on_theme_summary if on_partial else None
+    )
+    theme_summaries = {theme: summary for theme, summary in zip(theme_texts, summaries) if summary}
+    if not theme_summaries:
+        raise RuntimeError("No theme could be summarized in time")
+    
+    if len(theme_summaries) == 1:
+        return next(iter(theme_summaries.values())), theme_summaries
+    
+    overview_input = " ".join(theme_summaries.values())[:chunk_chars]
+    if extractive or on_partial is None:
+        overall_summary = (await summarize([overview_input], 200))[0]
+    else:
+        prefix = themes_text(theme_summaries) + "\n\nOverview: "
+        chunks = []
+        async for chunk in hf_client.summarize_stream(overview_input, 200, remaining(), cancel_event):
+            chunks.append(chunk)
+            await on_partial(prefix + "".join(chunks))
+        overall_summary = "".join(chunks)
+    
+    if not overall_summary.strip():
+        # Out of time before the reduce step: keep the theme summaries
+        overall_summary = (await summarize_extractive(
+            [overview_input], settings.extractive_sentences, settings.extractive_diversity
+        ))[0]
+    return overall_summary.strip(), theme_summaries
@@ -5,6 +5,7 @@ import markdown
 from weasyprint import HTML, CSS
 from backend.api.models.paper_model import LiteratureReviewReport
 from backend.core.websocket_manager import manager
+from backend.domain.report_builder import ReportDocument, render_html
 from datetime import datetime
 
 
@@ -94,6 +95,22 @@ a {
     margin-top: 50px;
 }
 
+table {
+    border-collapse: collapse;
+    margin-bottom: 15px;
+}
+
+th, td {
+    border-bottom: 1px solid #ddd;
+    padding: 4px 12px;
+    text-align: left;
+}
+
+th {
+    color: #1a1a1a;
+    font-weight: 600;
+}
+
 code {
     background-color: #f5f5f5;
     padding: 2px 6px;
@@ -104,14 +121,25 @@ code {
 """
 
 
-async def execute(session_id: str, report: LiteratureReviewReport, output_dir: Path) -> str:
-    """Generate PDF from literature review report"""
+async def execute(
+    session_id: str,
+    report: LiteratureReviewReport,
+    output_dir: Path,
+    document: Optional[ReportDocument] = None
+) -> str:
+    """Generate PDF from literature review report
+    
+    The HTML is rendered from Stage 6's structured `document` when given;
+    otherwise the report's Markdown synthesis is converted. Lazy sections
+    are not built here: like the synthesis, the PDF shows a placeholder
+    for them and they are fetched on demand.
+    """
     
     await manager.send_stage_update(
         session_id,
         stage=7,
         progress=20,
-        message="Converting markdown to HTML..."
+        message="Rendering report HTML..."
     )
     
     # Ensure output directory exists
@@ -127,9 +155,10 @@ async def execute(session_id: str, report: LiteratureReviewReport, output_dir: P
     </div>
     """
     
-    # Convert markdown to HTML
-    md_content = report.synthesis
-    html_content = markdown.markdown(md_content, extensions=['extra', 'nl2br', 'sane_lists'])
+    if document is not None:
+        html_content = render_html(document)
+    else:
+        html_content = markdown.markdown(report.synthesis, extensions=['extra', 'nl2br', 'sane_lists'])
     
     await manager.send_stage_update(
         session_id,
@@ -2,6 +2,8 @@
 from typing import List
 from pathlib import Path
 from backend.api.models.paper_model import PipelineRequest, LiteratureReviewReport
+from backend.core.cancellation import cancellation
+from backend.core.websocket_manager import manager
 from backend.domain.pipeline import (
     stage_1_fetch,
     stage_2_relevance,
@@ -17,34 +19,60 @@ async def run_pipeline(session_id: str, request: PipelineRequest) -> dict:
     """
     Execute the complete 7-stage literature review pipeline
     
-    Returns final report and PDF path
+    Returns final report and PDF path; the structured report document stays
+    in Stage 6's session cache, from where it is served section by section. Raises PipelineCancelled between
+    stages once the session is cancelled; Stage 6 instead stops generating
+    and keeps its partial output, so a report is still produced.
     """
-    
-    # Stage 1: Fetch papers from Semantic Scholar
-    papers = await stage_1_fetch.execute(
+    cancellation.register(session_id)
+    try:
+        return await _run_stages(session_id, request)
+    finally:
+        cancellation.release(session_id)
+        manager.release(session_id)
+
+
+async def _run_stages(session_id: str, request: PipelineRequest) -> dict:
+    # Stages 1+2: fetch papers from Semantic Scholar and score each page
+    # for relevance as soon as it arrives
+    papers = await stage_2_relevance.execute(
         session_id,
+        papers=stage_1_fetch.stream(
+            session_id,
+            keywords=request.keywords,
+            max_papers=request.max_papers
+        ),
         keywords=request.keywords,
-        max_papers=request.max_papers
+        expected_total=request.max_papers
     )
     
     if not papers:
         raise Exception("No papers found for the given keywords")
     
-    # Stage 2: Calculate relevance scores
-    papers = await stage_2_relevance.execute(
+    cancellation.check(session_id)
+    
+    # Stage 3: Group by themes
+    themes = await stage_3_themes.execute(
         session_id,
         papers=papers,
         keywords=request.keywords
     )
     
-    # Stage 3: Group by themes
-    themes = await stage_3_themes.execute(session_id, papers=papers)
+    cancellation.check(session_id)
     
     # Stage 4: Group by methodology
     methodologies = await stage_4_methodology.execute(session_id, papers=papers)
     
+    cancellation.check(session_id)
+    
     # Stage 5: Final ranking
-    papers = await stage_5_ranking.execute(session_id, papers=papers)
+    papers = await stage_5_ranking.execute(
+        session_id,
+        papers=papers,
+        weights=getattr(request, "ranking_weights", None)
+    )
+    
+    cancellation.check(session_id)
     
     # Stage 6: Generate synthesis report
     report = await stage_6_synthesis.execute(
@@ -55,9 +83,16 @@ async def run_pipeline(session_id: str, request: PipelineRequest) -> dict:
         keywords=request.keywords
     )
     
+    document = stage_6_synthesis.get_document(session_id)
+    
     # Stage 7: Generate PDF
     output_dir = Path("./output")
-    pdf_path = await stage_7_pdf.execute(session_id, report=report, output_dir=output_dir)
+    pdf_path = await stage_7_pdf.execute(
+        session_id,
+        report=report,
+        output_dir=output_dir,
+        document=document
+    )
     
     return {
         "report": report,
@@ -0,0 +1,361 @@
+"""Structured literature review document with Markdown and HTML renderers"""
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Set, Union
+import html
+import re
+from backend.api.models.paper_model import Paper
+
+
+@dataclass
+class Span:
+    """Run of inline text"""
+    text: str
+    bold: bool = False
+    href: Optional[str] = None
+
+
+@dataclass
+class Paragraph:
+    spans: List[Span]
+
+
+@dataclass
+class BulletList:
+    items: List[List[Span]]
+
+
+@dataclass
+class Table:
+    headers: List[str]
+    rows: List[List[str]]
+
+
+@dataclass
+class PaperRef:
+    """A paper as cited in the report"""
+    paper_id: str
+    title: str
+    year: Optional[int]
+    authors: List[str]
+    citation_count: int
+    relevance_score: Optional[float]
+    url: Optional[str]
+    rank: Optional[int]
+    abstract_preview: Optional[str]
+    
+    @classmethod
+    def from_paper(cls, paper: Paper, preview_chars: int = 200) -> "PaperRef":
+        preview = paper.abstract
+        if preview and len(preview) > preview_chars:
+            preview = preview[:preview_chars] + "..."
+        return cls(
+            paper_id=paper.paper_id,
+            title=paper.title,
+            year=paper.year,
+            authors=list(paper.authors),
+            citation_count=paper.citation_count,
+            relevance_score=paper.relevance_score,
+            url=paper.url,
+            rank=paper.final_rank,
+            abstract_preview=preview
+        )
+
+
+@dataclass
+class PaperList:
+    """Papers shown either compactly (title, year, preview) or with full details"""
+    papers: List[PaperRef]
+    detailed: bool = False
+
+
+Block = Union[Paragraph, BulletList, Table, PaperList]
+
+
+@dataclass
+class Section:
+    """Report section; a lazy section is filled by `loader` on first load"""
+    id: str
+    title: str
+    level: int = 2
+    blocks: List[Block] = field(default_factory=list)
+    subsections: List["Section"] = field(default_factory=list)
+    loader: Optional[Callable[["SectionBuilder"], None]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def loaded(self) -> bool:
+        return self.loader is None
+
+
+@dataclass
+class ReportDocument:
+    title: str
+    sections: List[Section] = field(default_factory=list)
+    _ids: Set[str] = field(default_factory=set, repr=False, compare=False)
+    
+    def find(self, section_id: str) -> Optional[Section]:
+        """Section (at any depth) with the given ID"""
+        stack = list(self.sections)
+        while stack:
+            section = stack.pop()
+            if section.id == section_id:
+                return section
+            stack.extend(section.subsections)
+        return None
+    
+    def load(self, section_id: str) -> Optional[Section]:
+        """Section with the given ID, filled in first if it is lazy"""
+        section = self.find(section_id)
+        if section is not None:
+            self._load(section)
+        return section
+    
+    def load_all(self):
+        """Fill every lazy section"""
+        stack = list(self.sections)
+        while stack:
+            section = stack.pop()
+            self._load(section)
+            stack.extend(section.subsections)
+    
+    def outline(self) -> List[dict]:
+        """Section IDs and titles in document order"""
+        entries = []
+        
+        def visit(sections: List[Section]):
+            for section in sections:
+                entries.append({
+                    "id": section.id,
+                    "title": section.title,
+                    "level": section.level,
+                    "lazy": not section.loaded
+                })
+                visit(section.subsections)
+        
+        visit(self.sections)
+        return entries
+    
+    def unique_id(self, name: str) -> str:
+        """Slug of `name`, suffixed if already taken"""
+        base = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "section"
+        section_id, n = base, 2
+        while section_id in self._ids:
+            section_id, n = f"{base}-{n}", n + 1
+        self._ids.add(section_id)
+        return section_id
+    
+    def _load(self, section: Section):
+        if section.loader is not None:
+            loader, section.loader = section.loader, None
+            loader(SectionBuilder(self, section))
+
+
+class SectionBuilder:
+    """Appends blocks and subsections to one section"""
+    
+    def __init__(self, document: ReportDocument, section: Section):
+        self._document = document
+        self.section = section
+    
+    def paragraph(self, *spans: Union[str, Span]) -> "SectionBuilder":
+        self.section.blocks.append(Paragraph([_span(s) for s in spans]))
+        return self
+    
+    def bullets(self, items: List[List[Union[str, Span]]]) -> "SectionBuilder":
+        self.section.blocks.append(BulletList([[_span(s) for s in item] for item in items]))
+        return self
+    
+    def table(self, headers: List[str], rows: List[List[str]]) -> "SectionBuilder":
+        self.section.blocks.append(Table(list(headers), [list(row) for row in rows]))
+        return self
+    
+    def papers(self, papers: List[Paper], detailed: bool = False) -> "SectionBuilder":
+        self.section.blocks.append(PaperList([PaperRef.from_paper(p) for p in papers], detailed))
+        return self
+    
+    def subsection(self, title: str, section_id: Optional[str] = None) -> "SectionBuilder":
+        section = Section(self._document.unique_id(section_id or title), title, level=self.section.level + 1)
+        self.section.subsections.append(section)
+        return SectionBuilder(self._document, section)
+    
+    def lazy_subsection(
+        self,
+        title: str,
+        fill: Callable[["SectionBuilder"], None],
+        section_id: Optional[str] = None
+    ) -> Section:
+        """Subsection whose content is built by `fill` only when first loaded"""
+        section = Section(
+            self._document.unique_id(section_id or title),
+            title,
+            level=self.section.level + 1,
+            loader=fill
+        )
+        self.section.subsections.append(section)
+        return section
+
+
+class ReportBuilder:
+    """Accumulates a ReportDocument section by section"""
+    
+    def __init__(self, title: str):
+        self.document = ReportDocument(title)
+    
+    def section(self, title: str, section_id: Optional[str] = None) -> SectionBuilder:
+        section = Section(self.document.unique_id(section_id or title), title)
+        self.document.sections.append(section)
+        return SectionBuilder(self.document, section)
+    
+    def build(self) -> ReportDocument:
+        return self.document
+
+
+def _span(value: Union[str, Span]) -> Span:
+    return value if isinstance(value, Span) else Span(value)
+
+
+def _authors(ref: PaperRef) -> str:
+    return ", ".join(ref.authors[:3]) + (" et al." if len(ref.authors) > 3 else "")
+
+
+def _relevance(ref: PaperRef) -> str:
+    return f"{ref.relevance_score:.3f}" if ref.relevance_score is not None else "N/A"
+
+
+# Renderers emit a heading and a placeholder for sections not loaded yet;
+# call ReportDocument.load_all first for the complete document
+
+UNLOADED_NOTE = "Details of this section load on demand and are not included here."
+
+# Markdown
+
+def render_markdown(document: ReportDocument) -> str:
+    parts = [f"# {document.title}\n"]
+    for section in document.sections:
+        _section_markdown(section, parts)
+    return "".join(parts)
+
+
+def render_section_markdown(section: Section) -> str:
+    parts = []
+    _section_markdown(section, parts)
+    return "".join(parts)
+
+
+def _section_markdown(section: Section, parts: List[str]):
+    parts.append(f"\n{'#' * section.level} {section.title}\n\n")
+    if not section.loaded:
+        parts.append(f"*{UNLOADED_NOTE}*\n\n")
+        return
+    for block in section.blocks:
+        _block_markdown(block, parts)
+    for subsection in section.subsections:
+        _section_markdown(subsection, parts)
+
+
+def _spans_markdown(spans: List[Span]) -> str:
+    out = []
+    for span in spans:
+        text = f"[{span.text}]({span.href})" if span.href else span.text
+        out.append(f"**{text}**" if span.bold else text)
+    return "".join(out)
+
+
+def _block_markdown(block: Block, parts: List[str]):
+    if isinstance(block, Paragraph):
+        parts.append(_spans_markdown(block.spans) + "\n\n")
+    elif isinstance(block, BulletList):
+        parts.extend(f"- {_spans_markdown(item)}\n" for item in block.items)
+        parts.append("\n")
+    elif isinstance(block, Table):
+        parts.append("| " + " | ".join(block.headers) + " |\n")
+        parts.append("|" + "---|" * len(block.headers) + "\n")
+        parts.extend("| " + " | ".join(row) + " |\n" for row in block.rows)
+        parts.append("\n")
+    elif isinstance(block, PaperList) and block.detailed:
+        for ref in block.papers:
+            parts.append(f"**{ref.rank}. {ref.title}**\n\n")
+            parts.append(f"- Authors: {_authors(ref)}\n")
+            parts.append(f"- Year: {ref.year or 'n.d.'}\n")
+            parts.append(f"- Citations: {ref.citation_count}\n")
+            parts.append(f"- Relevance Score: {_relevance(ref)}\n")
+            if ref.url:
+                parts.append(f"- URL: {ref.url}\n")
+            parts.append("\n")
+    elif isinstance(block, PaperList):
+        for ref in block.papers:
+            parts.append(f"- **{ref.title}** ({ref.year or 'n.d.'})\n")
+            if ref.abstract_preview:
+                parts.append(f"  {ref.abstract_preview}\n\n")
+
+
+# HTML
+
+def render_html(document: ReportDocument) -> str:
+    """HTML body fragment of the document"""
+    parts = [f"<h1>{html.escape(document.title)}</h1>\n"]
+    for section in document.sections:
+        _section_html(section, parts)
+    return "".join(parts)
+
+
+def render_section_html(section: Section) -> str:
+    parts = []
+    _section_html(section, parts)
+    return "".join(parts)
+
+
+def _section_html(section: Section, parts: List[str]):
+    level = min(section.level, 6)
+    parts.append(f'<h{level} id="{section.id}">{html.escape(section.title)}</h{level}>\n')
+    if not section.loaded:
+        parts.append(f"<p><em>{UNLOADED_NOTE}</em></p>\n")
+        return
+    for block in section.blocks:
+        _block_html(block, parts)
+    for subsection in section.subsections:
+        _section_html(subsection, parts)
+
+
+def _spans_html(spans: List[Span]) -> str:
+    out = []
+    for span in spans:
+        text = html.escape(span.text)
+        if span.href:
+            text = f'<a href="{html.escape(span.href, quote=True)}">{text}</a>'
+        out.append(f"<strong>{text}</strong>" if span.bold else text)
+    return "".join(out)
+
+
+def _block_html(block: Block, parts: List[str]):
+    if isinstance(block, Paragraph):
+        parts.append(f"<p>{_spans_html(block.spans)}</p>\n")
+    elif isinstance(block, BulletList):
+        parts.append("<ul>\n")
+        parts.extend(f"<li>{_spans_html(item)}</li>\n" for item in block.items)
+        parts.append("</ul>\n")
+    elif isinstance(block, Table):
+        parts.append("<table>\n<thead><tr>")
+        parts.extend(f"<th>{html.escape(h)}</th>" for h in block.headers)
+        parts.append("</tr></thead>\n<tbody>\n")
+        for row in block.rows:
+            parts.append("<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>\n")
+        parts.append("</tbody>\n</table>\n")
+    elif isinstance(block, PaperList) and block.detailed:
+        for ref in block.papers:
+            parts.append(f"<p><strong>{ref.rank}. {html.escape(ref.title)}</strong></p>\n<ul>\n")
+            parts.append(f"<li>Authors: {html.escape(_authors(ref))}</li>\n")
+            parts.append(f"<li>Year: {ref.year or 'n.d.'}</li>\n")
+            parts.append(f"<li>Citations: {ref.citation_count}</li>\n")
+            parts.append(f"<li>Relevance Score: {_relevance(ref)}</li>\n")
+            if ref.url:
+                url = html.escape(ref.url, quote=True)
+                parts.append(f'<li>URL: <a href="{url}">{url}</a></li>\n')
+            parts.append("</ul>\n")
+    elif isinstance(block, PaperList):
+        parts.append("<ul>\n")
+        for ref in block.papers:
+            parts.append(f"<li><strong>{html.escape(ref.title)}</strong> ({ref.year or 'n.d.'})")
+            if ref.abstract_preview:
+                parts.append(f"<br>\n{html.escape(ref.abstract_preview)}")
+            parts.append("</li>\n")
+        parts.append("</ul>\n")
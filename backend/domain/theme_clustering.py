@@ -0,0 +1,363 @@
+"""Clustering helpers for Stage 3 theme discovery
+
+Every backend takes the paper embedding matrix and returns a
+ClusteringResult whose labels use -1 for papers that belong to no theme.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.sparse import csr_matrix
+from sklearn.cluster import HDBSCAN, KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import normalize
+
+
+OUTLIER_LABEL = -1
+
+# Words that are common in academic writing but say nothing about a theme
+THEME_STOP_WORDS = sorted(ENGLISH_STOP_WORDS | {
+    "abstract", "analysis", "approach", "approaches", "based", "case", "different",
+    "effect", "effects", "evidence", "existing", "finding", "findings", "furthermore",
+    "introduce", "investigate", "method", "methods", "new", "novel", "paper",
+    "present", "propose", "proposed", "provide", "research", "result", "results",
+    "show", "shows", "significant", "studies", "study", "towards", "use", "used",
+    "using", "various", "work",
+})
+
+
+@dataclass
+class ClusteringResult:
+    """Cluster assignment for a set of papers"""
+    labels: np.ndarray  # One label per paper, OUTLIER_LABEL for unclustered
+    centers: np.ndarray  # One row per cluster, in the original embedding space
+    linkage_tree: Optional[np.ndarray] = None  # Set by hierarchical backends
+
+
+def kmeans_auto(
+    embeddings: np.ndarray,
+    min_clusters: int = 3,
+    max_clusters: int = 8,
+    silhouette_sample: int = 1000,
+    minibatch_threshold: int = 2000,
+    random_state: int = 42
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cluster embeddings with K chosen automatically by silhouette score
+    
+    Candidate Ks are fitted in increasing order, each warm-started from the
+    previous solution plus the worst-served point, so every fit is a single
+    short run instead of several random restarts. Silhouette is evaluated on
+    a fixed random sample, and MiniBatchKMeans takes over for large corpora.
+    
+    Returns (labels, centers).
+    """
+    X = np.asarray(embeddings, dtype=np.float64)
+    n = len(X)
+    
+    # Too few papers to compare partitions - one theme
+    if n < 3:
+        return np.zeros(n, dtype=int), X.mean(axis=0, keepdims=True)
+    
+    max_k = max(2, min(max_clusters, n - 1))
+    min_k = max(2, min(min_clusters, max_k))
+    
+    rng = np.random.RandomState(random_state)
+    sample = rng.choice(n, size=min(n, silhouette_sample), replace=False)
+    use_minibatch = n > minibatch_threshold
+    
+    best: Optional[Tuple[float, np.ndarray, np.ndarray]] = None
+    init = "k-means++"
+    
+    for k in range(min_k, max_k + 1):
+        if use_minibatch:
+            model = MiniBatchKMeans(
+                n_clusters=k,
+                init=init,
+                n_init=1,
+                batch_size=1024,
+                random_state=random_state
+            )
+        else:
+            model = KMeans(n_clusters=k, init=init, n_init=1, random_state=random_state)
+        
+        labels = model.fit_predict(X)
+        centers = model.cluster_centers_
+        
+        score = _sample_silhouette(X, labels, sample)
+        
+        if best is None or score > best[0]:
+            best = (score, labels, centers)
+        
+        # Warm start for K+1: keep these centers and add the point that is
+        # farthest from its own center
+        distances = model.transform(X).min(axis=1)
+        init = np.vstack([centers, X[np.argmax(distances)]])
+    
+    _, labels, centers = best
+    return labels, centers
+
+
+def cluster_kmeans(
+    embeddings: np.ndarray,
+    min_clusters: int = 3,
+    max_clusters: int = 8,
+    silhouette_sample: int = 1000,
+    minibatch_threshold: int = 2000,
+    **_
+) -> ClusteringResult:
+    """K-means backend with automatic K; every paper gets a theme"""
+    labels, centers = kmeans_auto(
+        embeddings,
+        min_clusters=min_clusters,
+        max_clusters=max_clusters,
+        silhouette_sample=silhouette_sample,
+        minibatch_threshold=minibatch_threshold
+    )
+    return ClusteringResult(labels=labels, centers=centers)
+
+
+def cluster_hdbscan(
+    embeddings: np.ndarray,
+    min_cluster_size: int = 5,
+    reduced_dimensions: int = 10,
+    **_
+) -> ClusteringResult:
+    """Density-based backend; papers in sparse regions become outliers
+    
+    HDBSCAN struggles with 768-dimensional distances, so embeddings are
+    first projected with a randomized PCA.
+    """
+    X = np.asarray(embeddings, dtype=np.float64)
+    n = len(X)
+    
+    if n < 3:
+        return ClusteringResult(labels=np.zeros(n, dtype=int), centers=X.mean(axis=0, keepdims=True))
+    
+    reduced = reduce_dimensions(X, reduced_dimensions)
+    labels = HDBSCAN(
+        min_cluster_size=max(2, min(min_cluster_size, n // 2))
+    ).fit_predict(reduced)
+    
+    return ClusteringResult(labels=labels, centers=cluster_centers(X, labels))
+
+
+def cluster_agglomerative(
+    embeddings: np.ndarray,
+    min_clusters: int = 3,
+    max_clusters: int = 8,
+    silhouette_sample: int = 1000,
+    **_
+) -> ClusteringResult:
+    """Hierarchical backend; the linkage tree is returned for later re-cuts
+    
+    The number of themes is picked by silhouette over the same candidate
+    range as K-means, but each candidate is only a cut of one tree.
+    """
+    X = np.asarray(embeddings, dtype=np.float64)
+    n = len(X)
+    
+    if n < 3:
+        return ClusteringResult(labels=np.zeros(n, dtype=int), centers=X.mean(axis=0, keepdims=True))
+    
+    tree = linkage_tree(X)
+    sample = np.random.RandomState(42).choice(n, size=min(n, silhouette_sample), replace=False)
+    
+    max_k = max(2, min(max_clusters, n - 1))
+    min_k = max(2, min(min_clusters, max_k))
+    
+    best_labels = None
+    best_score = None
+    for k in range(min_k, max_k + 1):
+        labels = cut_tree(tree, k)
+        score = _sample_silhouette(X, labels, sample)
+        if best_score is None or score > best_score:
+            best_score, best_labels = score, labels
+    
+    return ClusteringResult(
+        labels=best_labels,
+        centers=cluster_centers(X, best_labels),
+        linkage_tree=tree
+    )
+
+
+def refine_from_centroids(
+    embeddings: np.ndarray,
+    centers: np.ndarray,
+    known_labels: np.ndarray,
+    max_iter: int = 10
+) -> ClusteringResult:
+    """Continue a previous K-means solution on a related set of papers
+    
+    Papers with a known label keep it and only new papers (label -1) are
+    assigned to their nearest saved centroid; a short K-means pass seeded
+    from the resulting cluster means then absorbs the drift.
+    """
+    X = np.asarray(embeddings, dtype=np.float64)
+    seed_centers = np.asarray(centers, dtype=np.float64)
+    k = len(seed_centers)
+    
+    labels = np.asarray(known_labels, dtype=int).copy()
+    unknown = (labels < 0) | (labels >= k)
+    if unknown.any():
+        # argmin ||x - c||^2 == argmin ||c||^2 - 2 x.c
+        distances = (seed_centers ** 2).sum(axis=1) - 2 * X[unknown] @ seed_centers.T
+        labels[unknown] = distances.argmin(axis=1)
+    
+    init = seed_centers.copy()
+    for label in np.unique(labels):
+        init[label] = X[labels == label].mean(axis=0)
+    
+    if len(X) <= k:
+        return ClusteringResult(labels=labels, centers=init)
+    
+    model = KMeans(n_clusters=k, init=init, n_init=1, max_iter=max_iter).fit(X)
+    return ClusteringResult(labels=model.labels_, centers=model.cluster_centers_)
+
+
+CLUSTERING_BACKENDS: Dict[str, Callable[..., ClusteringResult]] = {
+    "kmeans": cluster_kmeans,
+    "hdbscan": cluster_hdbscan,
+    "agglomerative": cluster_agglomerative,
+}
+
+
+def get_backend(name: str) -> Callable[..., ClusteringResult]:
+    """Look up a clustering backend by name"""
+    try:
+        return CLUSTERING_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown clustering backend '{name}' "
+            f"(expected one of: {', '.join(CLUSTERING_BACKENDS)})"
+        )
+
+
+def reduce_dimensions(embeddings: np.ndarray, n_components: int = 10) -> np.ndarray:
+    """Project embeddings onto their top principal components"""
+    X = np.asarray(embeddings, dtype=np.float64)
+    n_components = min(n_components, X.shape[0], X.shape[1])
+    return PCA(n_components=n_components, svd_solver="randomized", random_state=42).fit_transform(X)
+
+
+def project_2d(embeddings: np.ndarray, centers: np.ndarray) -> Dict[str, object]:
+    """Compact 2D map of papers and cluster centers for the client
+    
+    Embeddings are projected on their two leading principal components
+    (randomized SVD) and coordinates are quantized to int16. The client
+    recovers positions as `value * scale + offset` per axis.
+    """
+    X = np.asarray(embeddings, dtype=np.float64)
+    C = np.asarray(centers, dtype=np.float64).reshape(-1, X.shape[1])
+    
+    if len(X) >= 2:
+        pca = PCA(n_components=2, svd_solver="randomized", random_state=42).fit(X)
+        points = pca.transform(X)
+        center_points = pca.transform(C) if len(C) else np.empty((0, 2))
+    else:
+        points = np.zeros((len(X), 2))
+        center_points = np.zeros((len(C), 2))
+    
+    all_points = np.vstack([points, center_points])
+    low = all_points.min(axis=0) if len(all_points) else np.zeros(2)
+    high = all_points.max(axis=0) if len(all_points) else np.ones(2)
+    span = np.where(high > low, high - low, 1.0)
+    
+    # Map [low, high] onto the full int16 range
+    scale = span / 65534.0
+    offset = low + 32767.0 * scale
+    
+    def quantize(values: np.ndarray) -> List[int]:
+        q = np.rint((values - offset) / scale).clip(-32767, 32767).astype(np.int16)
+        return q.ravel().tolist()
+    
+    return {
+        "points": quantize(points),
+        "centers": quantize(center_points),
+        "scale": scale.tolist(),
+        "offset": offset.tolist()
+    }
+
+
+def linkage_tree(embeddings: np.ndarray) -> np.ndarray:
+    """Ward linkage over unit-normalized embeddings (Euclidean ~ cosine)"""
+    X = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return linkage(X / np.where(norms > 0, norms, 1.0), method="ward")
+
+
+def cut_tree(tree: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Cut a linkage tree into at most n_clusters flat clusters (0-based labels)"""
+    return fcluster(tree, t=n_clusters, criterion="maxclust") - 1
+
+
+def cluster_centers(embeddings: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Mean embedding of every non-outlier cluster, indexed by label"""
+    X = np.asarray(embeddings, dtype=np.float64)
+    clustered = labels[labels != OUTLIER_LABEL]
+    if clustered.size == 0:
+        return np.empty((0, X.shape[1]))
+    
+    n_clusters = int(clustered.max()) + 1
+    centers = np.zeros((n_clusters, X.shape[1]))
+    for label in range(n_clusters):
+        members = X[labels == label]
+        if len(members):
+            centers[label] = members.mean(axis=0)
+    return centers
+
+
+def _sample_silhouette(X: np.ndarray, labels: np.ndarray, sample: np.ndarray) -> float:
+    """Cosine silhouette of a clustering, evaluated on a fixed sample"""
+    if len(np.unique(labels[sample])) < 2:
+        return -1.0
+    return float(silhouette_score(X[sample], labels[sample], metric="cosine"))
+
+
+def ctfidf_keyphrases(
+    documents: List[str],
+    labels: np.ndarray,
+    n_clusters: int,
+    top_n: int = 5
+) -> Dict[int, List[str]]:
+    """Top class-based TF-IDF terms (unigrams and bigrams) for every cluster
+    
+    All documents of a cluster are treated as one class document: term
+    counts are summed per cluster with a sparse membership product, then
+    weighted by log(1 + average class size / term frequency across classes).
+    Outlier documents are left out.
+    """
+    labels = np.asarray(labels)
+    keyphrases: Dict[int, List[str]] = {label: [] for label in range(n_clusters)}
+    
+    vectorizer = CountVectorizer(
+        ngram_range=(1, 2),
+        stop_words=THEME_STOP_WORDS,
+        token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z-]{2,}\b"
+    )
+    try:
+        counts = vectorizer.fit_transform(documents)
+    except ValueError:
+        # Only stopwords (or nothing) in the corpus
+        return keyphrases
+    
+    clustered = np.flatnonzero(labels != OUTLIER_LABEL)
+    membership = csr_matrix(
+        (np.ones(len(clustered)), (labels[clustered], clustered)),
+        shape=(n_clusters, len(documents))
+    )
+    class_counts = membership @ counts
+    
+    term_frequency = np.asarray(class_counts.sum(axis=0)).ravel()
+    average_class_size = class_counts.sum() / max(n_clusters, 1)
+    idf = np.log1p(average_class_size / np.maximum(term_frequency, 1))
+    weights = csr_matrix(normalize(class_counts, norm="l1", axis=1).multiply(idf))
+    
+    terms = vectorizer.get_feature_names_out()
+    for label in range(n_clusters):
+        row = weights.getrow(label)
+        top = row.indices[np.argsort(row.data)[::-1][:top_n]]
+        keyphrases[label] = [terms[i] for i in top]
+    
+    return keyphrases
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from typing import Optional
+from transformers import StoppingCriteria, TextStreamer
+from backend.core.cancellation import stop_requested
+
+
+class AsyncQueueStreamer(TextStreamer):
+    """Text streamer that hands decoded chunks to an asyncio queue
+    
+    `generate` runs on a worker thread, so chunks are scheduled onto the
+    event loop with call_soon_threadsafe rather than put directly.
+    """
+    
+    def __init__(self, tokenizer, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, **decode_kwargs):
+        super().__init__(tokenizer, skip_prompt=True, **decode_kwargs)
+        self.loop = loop
+        self.queue = queue
+    
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        if text:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+
+
+class GenerationDeadline(StoppingCriteria):
+    """Stops generation once a deadline passes or any cancel event is set
+    
+    Checked after every decoding step, so `generate` returns the tokens
+    produced so far within one step of the deadline.
+    """
+    
+    def __init__(self, deadline: Optional[float] = None, *cancel_events: Optional[threading.Event]):
+        self.deadline = deadline
+        self.cancel_events = [event for event in cancel_events if event is not None]
+    
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return stop_requested(self.deadline, None) or any(event.is_set() for event in self.cancel_events)
+
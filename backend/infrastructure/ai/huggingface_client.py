@@ -1,7 +1,15 @@
 import httpx
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from backend.core.config import settings
+from backend.core.cancellation import stop_requested
+from backend.infrastructure.cache.summary_cache import summary_cache
 import numpy as np
+import asyncio
+import threading
+import time
 import torch
 
 
@@ -23,6 +31,7 @@ class HuggingFaceClient:
         # GPU Configuration
         self.device = self._setup_device()
         self.use_fp16 = settings.enable_fp16 and self.device != "cpu"
+        self.quantize_summarizer = settings.summarization_quantize and self.device == "cpu"
         
         print(f"🚀 HuggingFace Client initialized:")
         print(f"   Device: {self.device}")
@@ -35,6 +44,17 @@ class HuggingFaceClient:
         # Lazy load local models
         self._local_embedding_model = None
         self._local_summarization_model = None
+        self._local_cross_encoder = None
+        self._local_nli_model = None
+        
+        # Text -> embedding, so later stages reuse vectors computed earlier
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        
+        # Local models run here so inference never blocks the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.model_workers,
+            thread_name_prefix="hf-model"
+        )
     
     def _setup_device(self) -> str:
         """Detect and setup compute device"""
@@ -46,6 +66,20 @@ class HuggingFaceClient:
         """Get device ID for transformers (-1 for CPU, 0 for first GPU)"""
         return 0 if self.device == "cuda" else -1
     
+    @property
+    def summarization_model_name(self) -> str:
+        """Summarization model for the configured tier"""
+        if settings.summarization_tier == "full":
+            return settings.summarization_model
+        if settings.summarization_tier == "distilled":
+            return settings.distilled_summarization_model
+        raise ValueError(f"Unknown summarization tier: {settings.summarization_tier}")
+    
+    async def _run_in_executor(self, fn, *args, **kwargs):
+        """Run a blocking model call on the shared model executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+    
     async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Get sentence embeddings for texts
         
@@ -53,9 +87,28 @@ class HuggingFaceClient:
         The all-MiniLM-L6-v2 model is configured as SentenceSimilarityPipeline
         which requires different input format not suitable for embedding extraction.
         We use local model for embeddings (more reliable).
+        
+        Cached vectors are kept as float32 arrays (about 3 KB each at 768
+        dimensions) and converted to lists only on the way out.
         """
+        # Collect hits before awaiting: a concurrent call may evict them meanwhile
+        found = {}
+        for text in texts:
+            if text not in found and text in self._embedding_cache:
+                self._embedding_cache.move_to_end(text)
+                found[text] = self._embedding_cache[text]
+        
         # Always use local for embeddings due to API compatibility issues
-        return await self._get_embeddings_local(texts)
+        missing = [t for t in dict.fromkeys(texts) if t not in found]
+        if missing:
+            for text, embedding in zip(missing, await self._get_embeddings_local(missing)):
+                # Copy the row so the cache does not pin the whole batch matrix
+                self._embedding_cache[text] = found[text] = np.array(embedding, dtype=np.float32)
+        
+        while len(self._embedding_cache) > settings.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+        
+        return [found[text].tolist() for text in texts]
     
     async def _get_embeddings_api(self, texts: List[str]) -> List[List[float]]:
         """Get embeddings from HuggingFace API"""
@@ -88,8 +141,12 @@ class HuggingFaceClient:
             return embeddings
 
     
-    async def _get_embeddings_local(self, texts: List[str]) -> List[List[float]]:
+    async def _get_embeddings_local(self, texts: List[str]) -> np.ndarray:
         """Get embeddings from local model with GPU acceleration"""
+        return await self._run_in_executor(self._encode_local, texts)
+    
+    def _encode_local(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the local embedding model (blocking)"""
         if self._local_embedding_model is None:
             from sentence_transformers import SentenceTransformer
             print(f"📦 Loading embedding model: {settings.embedding_model}")
@@ -115,22 +172,204 @@ class HuggingFaceClient:
             convert_to_numpy=True,
             normalize_embeddings=True
         )
-        return embeddings.tolist()
+        return embeddings.astype(np.float32, copy=False)
     
-    async def summarize(self, text: str, max_length: int = 150) -> str:
+    async def summarize(
+        self,
+        text: str,
+        max_length: int = 150,
+        time_budget: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> str:
         """Summarize text"""
+        return (await self.summarize_batch([text], max_length, time_budget, cancel_event))[0]
+    
+    async def summarize_batch(
+        self,
+        texts: List[str],
+        max_length: int = 150,
+        time_budget: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_summary: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> List[str]:
+        """Summarize several texts in one pass, preserving input order
+        
+        Summaries of previously seen inputs come from the summary cache;
+        only the misses are generated. Generation stops within one decoding
+        step once `time_budget` seconds have passed or `cancel_event` is
+        set: summaries in progress are cut short and texts not yet started
+        come back as empty strings. Such partial output is not cached.
+        A text whose generation fails also comes back empty, without
+        failing the rest of the batch.
+        
+        `on_summary(index, summary)` is awaited as each non-empty summary
+        becomes available (cache hits first, then local batches or API
+        responses as they finish), before the full list is returned.
+        """
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        
+        if not settings.summary_cache_enabled:
+            return await self._generate_summaries(texts, max_length, deadline, cancel_event, on_summary)
+        
+        model = self.summarization_model_name
+        if self.use_local and self.quantize_summarizer:
+            model += "+int8"
+        min_length = self._summary_min_length(max_length)
+        summaries = await summary_cache.lookup(model, max_length, min_length, texts)
+        positions = defaultdict(list)
+        for i, (text, summary) in enumerate(zip(texts, summaries)):
+            if summary is None:
+                positions[text].append(i)
+            elif on_summary is not None:
+                await on_summary(i, summary)
+        missing = list(positions)
+        
+        async def on_generated(j: int, summary: str):
+            for i in positions[missing[j]]:
+                await on_summary(i, summary)
+        
+        if missing:
+            generated = dict(zip(
+                missing,
+                await self._generate_summaries(
+                    missing, max_length, deadline, cancel_event, on_generated if on_summary else None
+                )
+            ))
+            if not stop_requested(deadline, cancel_event):
+                await summary_cache.store(
+                    model, max_length, min_length, {t: s for t, s in generated.items() if s}
+                )
+            summaries = [s if s is not None else generated[t] for t, s in zip(texts, summaries)]
+        
+        return summaries
+    
+    async def _generate_summaries(
+        self,
+        texts: List[str],
+        max_length: int,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_summary: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> List[str]:
+        """Run the summarization model, via the API when configured"""
+        if not texts:
+            return []
+        
         if self.use_local:
-            return await self._summarize_local(text, max_length)
+            return await self._summarize_batch_local(texts, max_length, deadline, cancel_event, on_summary)
         
+        summaries = await self._summarize_batch_api(texts, max_length, deadline, cancel_event, on_summary)
+        failed = [i for i, summary in enumerate(summaries) if summary is None]
+        if failed:
+            print(f"HF API failed for {len(failed)} texts, falling back to local")
+            
+            async def on_local(j: int, summary: str):
+                await on_summary(failed[j], summary)
+            
+            local = await self._summarize_batch_local(
+                [texts[i] for i in failed], max_length, deadline, cancel_event,
+                on_local if on_summary else None
+            )
+            for i, summary in zip(failed, local):
+                summaries[i] = summary
+        return summaries
+    
+    @staticmethod
+    def _summary_min_length(max_length: int) -> int:
+        return min(30, max_length - 10)
+    
+    async def summarize_stream(
+        self,
+        text: str,
+        max_length: int = 150,
+        time_budget: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> AsyncIterator[str]:
+        """Summarize text with the local model, yielding chunks as they are generated
+        
+        Streaming requires greedy decoding, so the summary may differ slightly
+        from `summarize`. A cached or API-generated summary is yielded in
+        one piece. Budget and cancellation behave as in `summarize_batch`.
+        """
+        if not self.use_local:
+            yield await self.summarize(text, max_length, time_budget, cancel_event)
+            return
+        
+        model = self.summarization_model_name + ("+int8" if self.quantize_summarizer else "") + "+stream"
+        min_length = self._summary_min_length(max_length)
+        if settings.summary_cache_enabled:
+            cached = (await summary_cache.lookup(model, max_length, min_length, [text]))[0]
+            if cached is not None:
+                yield cached
+                return
+        
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        abandoned = threading.Event()  # Set if the consumer stops iterating early
+        generation = asyncio.ensure_future(self._run_in_executor(
+            self._summarize_stream_sync, text, max_length, loop, queue, deadline, cancel_event, abandoned
+        ))
+        
+        chunks = []
         try:
-            return await self._summarize_api(text, max_length)
-        except Exception as e:
-            print(f"HF API failed, falling back to local: {e}")
-            return await self._summarize_local(text, max_length)
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            if not generation.done():
+                # Closed or cancelled mid-stream: stop the executor thread too
+                abandoned.set()
+                generation.add_done_callback(lambda f: f.cancelled() or f.exception())
+        
+        await generation  # Re-raise generation errors
+        if settings.summary_cache_enabled and not stop_requested(deadline, cancel_event):
+            await summary_cache.store(model, max_length, min_length, {text: "".join(chunks).strip()})
+    
+    def _summarize_stream_sync(
+        self,
+        text: str,
+        max_length: int,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        abandoned: Optional[threading.Event] = None
+    ):
+        """Greedy generation pushing decoded text into `queue` (blocking)"""
+        try:
+            from transformers import StoppingCriteriaList
+            from backend.infrastructure.ai.generation import AsyncQueueStreamer, GenerationDeadline
+            
+            self._load_summarization_model()
+            summarizer = self._local_summarization_model
+            tokenizer = summarizer.tokenizer
+            inputs = tokenizer(
+                text,
+                truncation=True,
+                max_length=tokenizer.model_max_length,
+                return_tensors="pt"
+            ).to(summarizer.model.device)
+            
+            with torch.no_grad():
+                summarizer.model.generate(
+                    **inputs,
+                    streamer=AsyncQueueStreamer(tokenizer, loop, queue, skip_special_tokens=True),
+                    stopping_criteria=StoppingCriteriaList([GenerationDeadline(deadline, cancel_event, abandoned)]),
+                    max_length=max_length,
+                    min_length=self._summary_min_length(max_length),
+                    num_beams=1,
+                    do_sample=False
+                )
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
     
     async def _summarize_api(self, text: str, max_length: int) -> str:
         """Summarize using HuggingFace API"""
-        model = "facebook/bart-large-cnn"
+        model = self.summarization_model_name
         
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
@@ -140,7 +379,7 @@ class HuggingFaceClient:
                     "inputs": text,
                     "parameters": {
                         "max_length": max_length,
-                        "min_length": 30
+                        "min_length": self._summary_min_length(max_length)
                     },
                     "options": {"wait_for_model": True}
                 }
@@ -149,47 +388,275 @@ class HuggingFaceClient:
             result = response.json()
             return result[0]["summary_text"] if isinstance(result, list) else result["summary_text"]
     
-    async def _summarize_local(self, text: str, max_length: int) -> str:
-        """Summarize using GPU-accelerated local model"""
-        if self._local_summarization_model is None:
-            print(f"📦 Loading summarization model: {settings.summarization_model}")
-            print(f"   Target device: {self.device}")
-            print("   This may take 1-2 minutes on first run to download ~1.6GB model")
-            
-            from transformers import pipeline
-            
-            # Load with GPU if available
-            self._local_summarization_model = pipeline(
-                "summarization", 
-                model=settings.summarization_model,
-                device=self._get_device_id(),
-                torch_dtype=torch.float16 if self.use_fp16 else torch.float32
-            )
-            
-            # Warm up
-            print("   Warming up model...")
-            _ = self._local_summarization_model(
-                "This is a warmup text.", 
-                max_length=50, 
-                min_length=10,
-                do_sample=False
+    async def _summarize_batch_api(
+        self,
+        texts: List[str],
+        max_length: int,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_summary: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> List[Optional[str]]:
+        """Concurrent API requests, at most summarization_api_concurrency in flight
+        
+        Requests not started before the deadline or cancellation are skipped
+        (empty string); failed requests come back as None.
+        """
+        semaphore = asyncio.Semaphore(settings.summarization_api_concurrency)
+        
+        async def summarize_one(i: int, text: str) -> Optional[str]:
+            async with semaphore:
+                if stop_requested(deadline, cancel_event):
+                    return ""
+                try:
+                    summary = await self._summarize_api(text, max_length)
+                except Exception as e:
+                    print(f"HF API summarization failed: {e}")
+                    return None
+            if summary and on_summary is not None:
+                await on_summary(i, summary)
+            return summary
+        
+        return list(await asyncio.gather(*(summarize_one(i, text) for i, text in enumerate(texts))))
+    
+    async def _summarize_batch_local(
+        self,
+        texts: List[str],
+        max_length: int,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_summary: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> List[str]:
+        """Batched local summarization on the model executor
+        
+        With `on_summary`, summaries are handed back from the worker thread
+        as each forward batch finishes.
+        """
+        if on_summary is None:
+            return await self._run_in_executor(
+                self._summarize_batch_local_sync, texts, max_length, deadline, cancel_event
             )
-            print("   ✅ Model ready!")
-            
-            if self.device == "cuda":
-                memory_allocated = torch.cuda.memory_allocated(0) / 1024**2
-                memory_reserved = torch.cuda.memory_reserved(0) / 1024**2
-                print(f"   GPU Memory: {memory_allocated:.1f} MB allocated, {memory_reserved:.1f} MB reserved")
         
-        # Perform summarization
-        result = self._local_summarization_model(
-            text, 
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def emit(i: int, summary: str):
+            loop.call_soon_threadsafe(queue.put_nowait, (i, summary))
+        
+        generation = asyncio.ensure_future(self._run_in_executor(
+            self._summarize_batch_local_sync, texts, max_length, deadline, cancel_event, emit
+        ))
+        generation.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            await on_summary(*item)
+        return await generation
+    
+    def _summarize_batch_local_sync(
+        self,
+        texts: List[str],
+        max_length: int,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        emit: Optional[Callable[[int, str], None]] = None
+    ) -> List[str]:
+        """Summarize texts with the local model (blocking)
+        
+        Texts are sorted by length so each batch pads to similar lengths,
+        then the summaries are put back in input order. Batches are run one
+        at a time so none starts after the deadline or cancellation. If a
+        batch fails, its texts are retried one by one and those that still
+        fail are left empty.
+        """
+        from transformers import StoppingCriteriaList
+        from backend.infrastructure.ai.generation import GenerationDeadline
+        
+        self._load_summarization_model()
+        stopping_criteria = StoppingCriteriaList([GenerationDeadline(deadline, cancel_event)])
+        batch_size = settings.summarization_batch_size
+        
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        summaries = [""] * len(texts)
+        for start in range(0, len(order), batch_size):
+            if stop_requested(deadline, cancel_event):
+                break
+            batch = order[start:start + batch_size]
+            try:
+                results = self._run_summarizer([texts[i] for i in batch], max_length, stopping_criteria)
+            except Exception as e:
+                print(f"Batch summarization failed, retrying texts one by one: {e}")
+                results = []
+                for i in batch:
+                    try:
+                        results.extend(self._run_summarizer([texts[i]], max_length, stopping_criteria))
+                    except Exception as e:
+                        print(f"Summarization failed for one text: {e}")
+                        results.append({"summary_text": ""})
+            for i, result in zip(batch, results):
+                summaries[i] = result["summary_text"]
+                if emit is not None and summaries[i]:
+                    emit(i, summaries[i])
+        return summaries
+    
+    def _run_summarizer(self, texts: List[str], max_length: int, stopping_criteria) -> List[dict]:
+        return self._local_summarization_model(
+            texts,
+            batch_size=settings.summarization_batch_size,
             max_length=max_length, 
-            min_length=min(30, max_length - 10), 
+            min_length=self._summary_min_length(max_length), 
             do_sample=False,
+            truncation=True,
+            stopping_criteria=stopping_criteria
+        )
+    
+    def _load_summarization_model(self):
+        """Load the local summarization pipeline on first use"""
+        if self._local_summarization_model is not None:
+            return
+        
+        model_name = self.summarization_model_name
+        print(f"📦 Loading summarization model: {model_name} ({settings.summarization_tier} tier)")
+        print(f"   Target device: {self.device}")
+        print("   This may take 1-2 minutes on first run to download the model")
+        
+        from transformers import pipeline
+        
+        # Load with GPU if available
+        summarizer = pipeline(
+            "summarization", 
+            model=model_name,
+            device=self._get_device_id(),
+            torch_dtype=torch.float16 if self.use_fp16 else torch.float32
+        )
+        
+        if self.quantize_summarizer:
+            # int8 weights for the Linear layers, activations quantized on the fly
+            print("   Applying dynamic int8 quantization...")
+            summarizer.model = torch.quantization.quantize_dynamic(
+                summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        
+        self._local_summarization_model = summarizer
+        
+        # Warm up
+        print("   Warming up model...")
+        _ = self._local_summarization_model(
+            "This is a warmup text.", 
+            max_length=50, 
+            min_length=10,
+            do_sample=False
+        )
+        print("   ✅ Model ready!")
+        
+        if self.device == "cuda":
+            memory_allocated = torch.cuda.memory_allocated(0) / 1024**2
+            memory_reserved = torch.cuda.memory_reserved(0) / 1024**2
+            print(f"   GPU Memory: {memory_allocated:.1f} MB allocated, {memory_reserved:.1f} MB reserved")
+    
+    async def rerank(
+        self,
+        query: str,
+        texts: List[str],
+        batch_size: int = 16,
+        time_budget: Optional[float] = None
+    ) -> List[float]:
+        """Score (query, text) pairs with a cross-encoder on CPU
+        
+        Batches are scored in order until the time budget runs out, so the
+        result may be shorter than `texts`; callers keep their own score for
+        the texts that were not reached.
+        """
+        return await self._run_in_executor(
+            self._rerank_local, query, texts, batch_size, time_budget
+        )
+    
+    def _rerank_local(
+        self,
+        query: str,
+        texts: List[str],
+        batch_size: int,
+        time_budget: Optional[float]
+    ) -> List[float]:
+        """Run the cross-encoder over the texts in batches (blocking)"""
+        if self._local_cross_encoder is None:
+            from sentence_transformers import CrossEncoder
+            print(f"📦 Loading cross-encoder: {settings.rerank_model}")
+            # Small model, kept on CPU so it does not compete for GPU memory
+            self._local_cross_encoder = CrossEncoder(settings.rerank_model, device="cpu")
+            print("   ✅ Model ready!")
+        
+        # Budget starts after loading so the first run is not cut to nothing
+        deadline = time.monotonic() + time_budget if time_budget else None
+        scores: List[float] = []
+        
+        for start in range(0, len(texts), batch_size):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            batch = texts[start:start + batch_size]
+            logits = self._local_cross_encoder.predict(
+                [(query, text) for text in batch],
+                batch_size=batch_size,
+                show_progress_bar=False
+            )
+            scores.extend(float(score) for score in logits)
+        
+        return scores
+    
+    async def zero_shot_classify(
+        self,
+        texts: List[str],
+        labels: List[str],
+        hypothesis_template: str = "This example is {}.",
+        batch_size: int = 8
+    ) -> List[List[float]]:
+        """Zero-shot classification with a local NLI model
+        
+        Returns one row per text with a probability for each label, in the
+        order of `labels`. All (text, hypothesis) pairs are batched.
+        """
+        if not texts:
+            return []
+        return await self._run_in_executor(
+            self._zero_shot_local, texts, labels, hypothesis_template, batch_size
+        )
+    
+    def _zero_shot_local(
+        self,
+        texts: List[str],
+        labels: List[str],
+        hypothesis_template: str,
+        batch_size: int
+    ) -> List[List[float]]:
+        """Run the zero-shot NLI pipeline (blocking)"""
+        if self._local_nli_model is None:
+            from transformers import pipeline
+            print(f"📦 Loading NLI model: {settings.nli_model}")
+            print(f"   Target device: {self.device}")
+            self._local_nli_model = pipeline(
+                "zero-shot-classification",
+                model=settings.nli_model,
+                device=self._get_device_id()
+            )
+            print("   ✅ Model ready!")
+        
+        results = self._local_nli_model(
+            texts,
+            candidate_labels=labels,
+            hypothesis_template=hypothesis_template,
+            multi_label=False,
+            batch_size=batch_size,
             truncation=True
         )
-        return result[0]["summary_text"]
+        if isinstance(results, dict):
+            results = [results]
+        
+        # The pipeline sorts labels by score; restore the caller's order
+        return [
+            [dict(zip(r["labels"], r["scores"]))[label] for label in labels]
+            for r in results
+        ]
 
 
     def get_gpu_stats(self) -> dict:
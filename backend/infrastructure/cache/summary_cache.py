@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from backend.core.config import settings
+
+
+class SummaryCache:
+    """Disk-backed cache of generated summaries
+    
+    One JSON file per (model, max_length, min_length, text) key. Hits touch
+    the file's mtime, so eviction drops the least recently used entries once
+    the cache grows past `max_entries`. Async callers use `lookup` and
+    `store`, which do the file I/O in a worker thread.
+    """
+    
+    def __init__(self, directory: Path, max_entries: int = 5000):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self._entries: Optional[int] = None
+        self._write_lock = threading.Lock()
+    
+    @staticmethod
+    def key(model: str, max_length: int, min_length: int, text: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{model}|{max_length}|{min_length}|{text_hash}".encode("utf-8")).hexdigest()
+    
+    def get(self, model: str, max_length: int, min_length: int, text: str) -> Optional[str]:
+        """Cached summary, or None on a miss"""
+        path = self._path(self.key(model, max_length, min_length, text))
+        try:
+            with open(path, encoding="utf-8") as f:
+                summary = json.load(f)["summary"]
+            os.utime(path)
+            return summary
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable summary cache entry {path.name}: {e}")
+            return None
+    
+    async def lookup(self, model: str, max_length: int, min_length: int, texts: List[str]) -> List[Optional[str]]:
+        """`get` for each text, off the event loop"""
+        return await asyncio.to_thread(
+            lambda: [self.get(model, max_length, min_length, text) for text in texts]
+        )
+    
+    async def store(self, model: str, max_length: int, min_length: int, summaries: Dict[str, str]):
+        """`put` for each (text, summary), off the event loop"""
+        def put_all():
+            for text, summary in summaries.items():
+                self.put(model, max_length, min_length, text, summary)
+        await asyncio.to_thread(put_all)
+    
+    def put(self, model: str, max_length: int, min_length: int, text: str, summary: str):
+        """Store a summary, evicting old entries if the cache is full"""
+        with self._write_lock:
+            self._put(model, max_length, min_length, text, summary)
+    
+    def _put(self, model: str, max_length: int, min_length: int, text: str, summary: str):
+        path = self._path(self.key(model, max_length, min_length, text))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._count()
+            is_new = not path.exists()
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "model": model,
+                    "max_length": max_length,
+                    "min_length": min_length,
+                    "summary": summary
+                }, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Failed to write summary cache entry: {e}")
+            return
+        
+        if is_new:
+            self._entries += 1
+            if self._entries > self.max_entries:
+                self._evict()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def _count(self) -> int:
+        """Number of entries on disk, counted once and then tracked"""
+        if self._entries is None:
+            self._entries = sum(1 for _ in self.directory.glob("*.json"))
+        return self._entries
+    
+    def _evict(self):
+        """Drop the least recently used entries down to 90% of max_entries"""
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        keep = int(self.max_entries * 0.9)
+        for path in files[:max(0, len(files) - keep)]:
+            path.unlink(missing_ok=True)
+        self._entries = min(len(files), keep)
+
+
+# Global cache instance
+summary_cache = SummaryCache(Path(settings.summary_cache_dir), settings.summary_cache_max_entries)
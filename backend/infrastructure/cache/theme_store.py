@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import threading
+import numpy as np
+from backend.core.config import settings
+
+
+@dataclass
+class ThemeSnapshot:
+    """Cluster centroids and paper assignments saved from one Stage 3 run"""
+    key: str
+    model: str
+    keywords: List[str]
+    query_embedding: np.ndarray
+    centers: np.ndarray
+    paper_labels: Dict[str, int]
+
+
+class ThemeCentroidStore:
+    """Disk-backed store of theme centroids, one snapshot per query family
+    
+    Queries whose embeddings are closer than `min_similarity` belong to the
+    same family and share (and overwrite) a snapshot, so iterative query
+    refinement keeps seeding from the latest clustering. Methods do file
+    I/O, so async callers run them in a worker thread.
+    """
+    
+    def __init__(self, directory: Path, max_entries: int = 64):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self._snapshots: Optional[Dict[str, ThemeSnapshot]] = None
+        self._lock = threading.RLock()
+    
+    def find_nearest(self, query_embedding: np.ndarray, min_similarity: float) -> Optional[ThemeSnapshot]:
+        """Snapshot of the closest query family, or None if none is close enough"""
+        query = _unit(query_embedding)
+        best, best_similarity = None, min_similarity
+        
+        with self._lock:
+            snapshots = list(self._load().values())
+        
+        for snapshot in snapshots:
+            if snapshot.model != settings.embedding_model or snapshot.query_embedding.shape != query.shape:
+                continue
+            similarity = float(snapshot.query_embedding @ query)
+            if similarity >= best_similarity:
+                best, best_similarity = snapshot, similarity
+        
+        return best
+    
+    def save(
+        self,
+        keywords: List[str],
+        query_embedding: np.ndarray,
+        centers: np.ndarray,
+        paper_labels: Dict[str, int],
+        min_similarity: float
+    ) -> ThemeSnapshot:
+        """Save a clustering, replacing the snapshot of its query family if any"""
+        query = _unit(query_embedding)
+        existing = self.find_nearest(query, min_similarity)
+        key = existing.key if existing else hashlib.sha1(
+            " ".join(sorted(k.lower() for k in keywords)).encode("utf-8")
+        ).hexdigest()[:16]
+        
+        snapshot = ThemeSnapshot(
+            key=key,
+            model=settings.embedding_model,
+            keywords=list(keywords),
+            query_embedding=query,
+            centers=np.asarray(centers, dtype=np.float32),
+            paper_labels=dict(paper_labels)
+        )
+        
+        with self._lock:
+            self._write(snapshot)
+            self._load()[key] = snapshot
+            self._evict()
+        return snapshot
+    
+    def _write(self, snapshot: ThemeSnapshot):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                self.directory / f"{snapshot.key}.npz",
+                model=np.array(snapshot.model),
+                keywords=np.array(snapshot.keywords),
+                query_embedding=snapshot.query_embedding,
+                centers=snapshot.centers,
+                paper_ids=np.array(list(snapshot.paper_labels.keys())),
+                labels=np.array(list(snapshot.paper_labels.values()), dtype=np.int32)
+            )
+        except Exception as e:
+            print(f"Failed to save theme snapshot: {e}")
+    
+    def _load(self) -> Dict[str, ThemeSnapshot]:
+        """Read all snapshots from disk once"""
+        if self._snapshots is None:
+            self._snapshots = {}
+            for path in sorted(self.directory.glob("*.npz")):
+                try:
+                    with np.load(path) as data:
+                        self._snapshots[path.stem] = ThemeSnapshot(
+                            key=path.stem,
+                            model=str(data["model"]),
+                            keywords=[str(k) for k in data["keywords"]],
+                            query_embedding=data["query_embedding"],
+                            centers=data["centers"],
+                            paper_labels={
+                                str(pid): int(label)
+                                for pid, label in zip(data["paper_ids"], data["labels"])
+                            }
+                        )
+                except Exception as e:
+                    print(f"Skipping unreadable theme snapshot {path.name}: {e}")
+        return self._snapshots
+    
+    def _evict(self):
+        """Drop the oldest snapshot files beyond max_entries"""
+        files = sorted(self.directory.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+            self._load().pop(path.stem, None)
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+# Global store instance
+theme_store = ThemeCentroidStore(Path(settings.theme_cache_dir))
@@ -1,5 +1,5 @@
 import httpx
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from backend.api.models.paper_model import Paper
 from backend.core.config import settings
 import asyncio
@@ -18,45 +18,58 @@ class SemanticScholarClient:
     
     async def search_papers(self, keywords: List[str], limit: int = 50) -> List[Paper]:
         """Search for papers using keywords"""
+        papers = []
+        async for batch in self.iter_search_papers(keywords, limit=limit, batch_size=limit):
+            papers.extend(batch)
+        return papers
+    
+    async def iter_search_papers(
+        self,
+        keywords: List[str],
+        limit: int = 50,
+        batch_size: int = 25
+    ) -> AsyncIterator[List[Paper]]:
+        """Search for papers page by page, yielding each page as soon as it arrives"""
         query = " ".join(keywords)
+        # The search endpoint caps a single page at 100 results
+        batch_size = max(1, min(batch_size, 100))
         
         async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/paper/search",
-                    params={
-                        "query": query,
-                        "limit": limit,
-                        "fields": "paperId,title,abstract,authors,year,citationCount,url,venue"
-                    },
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
+            offset = 0
+            while offset < limit:
+                try:
+                    response = await client.get(
+                        f"{self.BASE_URL}/paper/search",
+                        params={
+                            "query": query,
+                            "offset": offset,
+                            "limit": min(batch_size, limit - offset),
+                            "fields": "paperId,title,abstract,authors,year,citationCount,url,venue"
+                        },
+                        headers=self.headers
+                    )
+                    response.raise_for_status()
+                    data = response.json()
+                except httpx.HTTPError as e:
+                    print(f"Error fetching papers: {e}")
+                    raise Exception(f"Failed to fetch papers from Semantic Scholar: {str(e)}")
                 
+                items = data.get("data", [])
                 papers = []
-                for item in data.get("data", []):
+                for item in items:
                     try:
-                        paper = Paper(
-                            paper_id=item.get("paperId", ""),
-                            title=item.get("title", ""),
-                            abstract=item.get("abstract"),
-                            authors=[a.get("name", "") for a in item.get("authors", [])],
-                            year=item.get("year"),
-                            citation_count=item.get("citationCount", 0),
-                            url=item.get("url"),
-                            venue=item.get("venue")
-                        )
-                        papers.append(paper)
+                        papers.append(self._parse_paper(item))
                     except Exception as e:
                         print(f"Error parsing paper: {e}")
                         continue
                 
-                return papers
+                if papers:
+                    yield papers
                 
-            except httpx.HTTPError as e:
-                print(f"Error fetching papers: {e}")
-                raise Exception(f"Failed to fetch papers from Semantic Scholar: {str(e)}")
+                offset += len(items)
+                # Stop when the result set is exhausted
+                if not items or data.get("next") is None:
+                    break
     
     async def get_paper_details(self, paper_id: str) -> Optional[Paper]:
         """Get detailed information for a specific paper"""
@@ -70,18 +83,65 @@ class SemanticScholarClient:
                 response.raise_for_status()
                 item = response.json()
                 
-                return Paper(
-                    paper_id=item.get("paperId", ""),
-                    title=item.get("title", ""),
-                    abstract=item.get("abstract"),
-                    authors=[a.get("name", "") for a in item.get("authors", [])],
-                    year=item.get("year"),
-                    citation_count=item.get("citationCount", 0),
-                    url=item.get("url"),
-                    venue=item.get("venue")
-                )
+                return self._parse_paper(item)
             except httpx.HTTPError:
                 return None
+    
+    async def get_citation_links(self, paper_ids: List[str], batch_size: int = 500) -> Dict[str, List[str]]:
+        """Citation edges for a set of papers, fetched with the batch endpoint
+        
+        Returns a mapping from citing paper ID to the IDs it cites, built
+        from both the references and the citations of every requested paper.
+        Only edges between requested papers are kept, so the (often long)
+        reference and citation lists are not held beyond parsing.
+        """
+        wanted = set(paper_ids)
+        links: Dict[str, List[str]] = {}
+        
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            for start in range(0, len(paper_ids), batch_size):
+                chunk = paper_ids[start:start + batch_size]
+                try:
+                    response = await client.post(
+                        f"{self.BASE_URL}/paper/batch",
+                        params={"fields": "paperId,references.paperId,citations.paperId"},
+                        json={"ids": chunk},
+                        headers=self.headers
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    print(f"Error fetching citation links: {e}")
+                    raise Exception(f"Failed to fetch citation links from Semantic Scholar: {str(e)}")
+                
+                for item in response.json():
+                    # Unknown IDs come back as null
+                    if not item:
+                        continue
+                    paper_id = item.get("paperId")
+                    if paper_id not in wanted:
+                        continue
+                    references = [r.get("paperId") for r in item.get("references") or [] if r.get("paperId") in wanted]
+                    if references:
+                        links.setdefault(paper_id, []).extend(references)
+                    for citation in item.get("citations") or []:
+                        if citation.get("paperId") in wanted:
+                            links.setdefault(citation["paperId"], []).append(paper_id)
+        
+        return links
+    
+    @staticmethod
+    def _parse_paper(item: dict) -> Paper:
+        """Build a Paper from a Semantic Scholar API record"""
+        return Paper(
+            paper_id=item.get("paperId", ""),
+            title=item.get("title", ""),
+            abstract=item.get("abstract"),
+            authors=[a.get("name", "") for a in item.get("authors", [])],
+            year=item.get("year"),
+            citation_count=item.get("citationCount", 0),
+            url=item.get("url"),
+            venue=item.get("venue")
+        )
 
 
 # Global instance
@@ -0,0 +1,97 @@
+"""
+Test Cancellation Registry
+Session cancellation tokens and generation deadlines
+"""
+import asyncio
+import time
+import pytest
+from backend.core.cancellation import CancellationRegistry, PipelineCancelled, stop_requested
+
+
+def test_cancel_only_running_sessions():
+    """Only registered sessions can be cancelled; check raises afterwards"""
+    registry = CancellationRegistry()
+    assert registry.cancel("unknown") is False
+    assert not registry.token("unknown").is_set()
+    
+    token = registry.register("running")
+    registry.check("running")
+    assert registry.cancel("running") is True
+    assert token.is_set()
+    with pytest.raises(PipelineCancelled):
+        registry.check("running")
+    
+    registry.release("running")
+    registry.check("running")
+
+
+@pytest.mark.asyncio
+async def test_cancel_later_unless_kept_alive():
+    """An abandoned session is cancelled after the grace period, a reconnect prevents it"""
+    registry = CancellationRegistry()
+    abandoned = registry.register("abandoned")
+    returned = registry.register("returned")
+    
+    registry.cancel_later("abandoned", 0.05)
+    registry.cancel_later("returned", 0.05)
+    registry.keep_alive("returned")
+    await asyncio.sleep(0.1)
+    
+    assert abandoned.is_set()
+    assert not returned.is_set()
+
+
+@pytest.mark.asyncio
+async def test_touch_restarts_countdown():
+    """Client activity while the countdown runs postpones the cancellation"""
+    registry = CancellationRegistry()
+    polled = registry.register("polled")
+    
+    registry.cancel_later("polled", 0.1)
+    for _ in range(3):
+        await asyncio.sleep(0.05)
+        registry.touch("polled")
+    assert not polled.is_set()
+    
+    await asyncio.sleep(0.15)
+    assert polled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_last_disconnect_cancels_running_session(monkeypatch):
+    """When the last WebSocket leaves, the pipeline is cancelled after the grace period"""
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.core import websocket_manager
+    from backend.core.config import settings
+    
+    registry = CancellationRegistry()
+    monkeypatch.setattr(websocket_manager, "cancellation", registry)
+    monkeypatch.setattr(settings, "session_abandon_grace_seconds", 0.05)
+    manager = websocket_manager.ConnectionManager()
+    manager.send_message = AsyncMock()
+    
+    left = registry.register("left")
+    watched = registry.register("watched")
+    for session_id in ["left", "watched"]:
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        await manager.connect(ws, session_id)
+        manager.disconnect(ws, session_id)
+    
+    # The "watched" client fell back to status polling
+    await asyncio.sleep(0.03)
+    registry.touch("watched")
+    await asyncio.sleep(0.04)
+    
+    assert left.is_set()
+    assert not watched.is_set()
+
+
+def test_stop_requested():
+    """Generation stops after the deadline or once the event is set"""
+    token = CancellationRegistry().register("s")
+    assert not stop_requested(None, None)
+    assert not stop_requested(time.monotonic() + 60, token)
+    assert stop_requested(time.monotonic() - 1, None)
+    token.set()
+    assert stop_requested(None, token)
@@ -0,0 +1,79 @@
+"""
+Test Citation Graph Centrality
+In-set citation graph and PageRank used as a Stage 5 ranking factor
+"""
+import numpy as np
+from backend.domain.citation_graph import build_adjacency, pagerank
+
+
+def test_adjacency_keeps_only_in_set_edges():
+    """Citations to or from papers outside the set are ignored"""
+    adjacency = build_adjacency(
+        ["a", "b", "c"],
+        {"a": ["b", "outside"], "b": ["c", "c"], "outside": ["a"]}
+    )
+    assert adjacency.toarray().tolist() == [
+        [0, 1, 0],
+        [0, 0, 1],
+        [0, 0, 0],
+    ]
+
+
+def test_pagerank_favours_cited_papers():
+    """The paper everyone cites gets the highest centrality"""
+    adjacency = build_adjacency(
+        ["hub", "a", "b", "c"],
+        {"a": ["hub"], "b": ["hub"], "c": ["hub", "a"]}
+    )
+    ranks = pagerank(adjacency)
+    assert np.isclose(ranks.sum(), 1.0)
+    assert ranks.argmax() == 0
+
+
+def test_pagerank_without_edges_is_uniform():
+    """No citations between papers gives every paper the same score"""
+    ranks = pagerank(build_adjacency(["a", "b", "c", "d"], {}))
+    assert np.allclose(ranks, 0.25)
+
+
+def test_citation_links_keep_only_requested_papers(monkeypatch):
+    """Edges to papers outside the requested set are dropped while parsing"""
+    import asyncio
+    from backend.infrastructure.external import semantic_scholar
+    
+    response_items = [
+        {
+            "paperId": "a",
+            "references": [{"paperId": "b"}, {"paperId": "outside"}, {"paperId": None}],
+            "citations": [{"paperId": "c"}, {"paperId": "stranger"}],
+        },
+        None,  # unknown ID
+        {"paperId": "c", "references": [{"paperId": "a"}], "citations": []},
+    ]
+    
+    class StubResponse:
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            return response_items
+    
+    class StubHTTP:
+        def __init__(self, *args, **kwargs):
+            pass
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc):
+            return False
+        
+        async def post(self, url, params=None, json=None, headers=None):
+            return StubResponse()
+    
+    monkeypatch.setattr(semantic_scholar.httpx, "AsyncClient", StubHTTP)
+    
+    links = asyncio.run(semantic_scholar.SemanticScholarClient().get_citation_links(["a", "b", "c"]))
+    
+    # c -> a is reported by both papers; build_adjacency collapses duplicates
+    assert links == {"a": ["b"], "c": ["a", "a"]}
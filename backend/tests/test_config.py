@@ -31,3 +31,11 @@ def test_pipeline_settings():
     assert hasattr(settings, 'relevance_threshold')
     assert isinstance(settings.max_papers_per_query, int)
     assert isinstance(settings.relevance_threshold, float)
+
+
+def test_rerank_settings():
+    """Test cross-encoder re-ranking settings"""
+    assert isinstance(settings.rerank_enabled, bool)
+    assert settings.rerank_top_n > 0
+    assert settings.rerank_batch_size > 0
+    assert 0.0 <= settings.rerank_weight <= 1.0
@@ -0,0 +1,73 @@
+"""
+Test Near-Duplicate Detection
+Preprint and published versions of a paper must be merged before ranking
+"""
+from backend.api.models.paper_model import Paper
+from backend.domain.dedupe import merge_duplicates, normalize_title
+
+
+def test_normalize_title():
+    """Case, accents and punctuation do not matter"""
+    assert normalize_title("Attention Is All You Need!") == "attention is all you need"
+    assert normalize_title("Résumé   parsing.") == "resume parsing"
+
+
+def test_merge_keeps_most_complete_version():
+    """Duplicates merge into the version with an abstract, keeping max citations"""
+    papers = [
+        Paper(paper_id="arxiv", title="Attention Is All You Need", citation_count=900, year=2017),
+        Paper(paper_id="neurips", title="Attention is all you need.", abstract="Transformers.",
+              venue="NeurIPS", citation_count=500),
+        Paper(paper_id="other", title="Attention is not explanation", citation_count=3),
+    ]
+    merged, aliases = merge_duplicates(papers)
+    
+    assert [p.paper_id for p in merged] == ["neurips", "other"]
+    assert aliases == {"neurips": ["arxiv"]}
+    assert merged[0].citation_count == 900
+    assert merged[0].year == 2017
+
+
+def test_no_duplicates_is_a_no_op():
+    """Distinct titles pass through unchanged"""
+    papers = [
+        Paper(paper_id="a", title="Graph neural networks for chemistry"),
+        Paper(paper_id="b", title="Federated learning on mobile devices"),
+    ]
+    merged, aliases = merge_duplicates(papers)
+    assert merged == papers
+    assert aliases == {}
+
+
+def test_numbered_titles_are_not_merged():
+    """Titles that differ only in a number, version or part stay separate"""
+    from backend.domain.dedupe import find_duplicate_groups
+    
+    pairs = [
+        ("Deep Reinforcement Learning for Robotic Manipulation: Part I",
+         "Deep Reinforcement Learning for Robotic Manipulation: Part II"),
+        ("YOLOv3: An Incremental Improvement", "YOLOv4: An Incremental Improvement"),
+    ]
+    for first, second in pairs:
+        papers = [Paper(paper_id="a", title=first), Paper(paper_id="b", title=second)]
+        assert find_duplicate_groups(papers) == [], (first, second)
+    
+    numbered = [Paper(paper_id=str(i), title=f"Paper about topic number {i}") for i in range(5)]
+    assert find_duplicate_groups(numbered) == []
+
+
+def test_similar_titles_need_author_confirmation():
+    """Without abstracts, similar titles by different authors are distinct papers"""
+    from backend.domain.dedupe import find_duplicate_groups
+    
+    survey_of = Paper(paper_id="a", title="A Survey of Large Language Models", authors=["Wayne Xin Zhao"])
+    survey_on = Paper(paper_id="b", title="A Survey on Large Language Models", authors=["Yupeng Chang"])
+    assert find_duplicate_groups([survey_of, survey_on]) == []
+    
+    # Same wording, no authors to compare: not close enough either
+    anonymous = [Paper(paper_id="a", title=survey_of.title), Paper(paper_id="b", title=survey_on.title)]
+    assert find_duplicate_groups(anonymous) == []
+    
+    # A shared author confirms a reworded title
+    survey_on.authors = ["Yupeng Chang", "W. X. Zhao"]
+    assert find_duplicate_groups([survey_of, survey_on]) == [[0, 1]]
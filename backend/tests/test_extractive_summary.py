@@ -0,0 +1,38 @@
+"""
+Test Extractive Summary
+TextRank sentence centrality and MMR selection used by Stage 6
+"""
+import numpy as np
+from backend.domain.extractive_summary import split_sentences, textrank, mmr_select
+
+
+def _unit(rows):
+    rows = np.asarray(rows, dtype=float)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_split_sentences_drops_fragments():
+    """Sentence boundaries are found and very short fragments dropped"""
+    text = "We propose a new model for text. It works. Results improve on three benchmarks by a wide margin."
+    assert split_sentences(text) == [
+        "We propose a new model for text.",
+        "Results improve on three benchmarks by a wide margin.",
+    ]
+
+
+def test_textrank_prefers_central_sentence():
+    """The sentence most similar to all others gets the highest score"""
+    embeddings = _unit([[1, 1, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0.2]])
+    scores = textrank(embeddings)
+    assert np.isclose(scores.sum(), 1.0)
+    assert scores.argmax() in (0, 3)
+    assert scores[0] > scores[1] and scores[0] > scores[2]
+
+
+def test_mmr_skips_near_duplicates():
+    """A near-copy of the first pick loses to a dissimilar sentence"""
+    embeddings = _unit([[1, 0, 0], [0.99, 0.01, 0], [0, 1, 0]])
+    scores = np.array([1.0, 0.95, 0.6])
+    assert mmr_select(embeddings, scores, k=2, diversity=0.5) == [0, 2]
+    assert mmr_select(embeddings, scores, k=2, diversity=0.0) == [0, 1]
+    assert mmr_select(embeddings, scores, k=10) == [0, 2, 1]
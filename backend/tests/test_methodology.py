@@ -0,0 +1,134 @@
+"""
+Test Methodology Keyword Matching
+Stage 4 keyword fallback must scan each text once and respect word boundaries
+"""
+from backend.domain.pipeline.stage_4_methodology import keyword_hits
+
+
+def test_keyword_hits_counts_distinct_terms():
+    """Each methodology counts how many of its keywords appear"""
+    hits = keyword_hits("A randomized controlled trial with a follow-up survey")
+    assert hits["Experimental"] == 3
+    assert hits["Survey"] == 1
+
+
+def test_keyword_hits_respects_word_boundaries():
+    """Keywords inside longer words do not match"""
+    hits = keyword_hits("Modeling fragments of remodelled surveys")
+    assert "Theoretical" not in hits
+    assert hits["Survey"] == 1  # plural form still matches
+
+
+def test_keyword_hits_prefers_longest_phrase():
+    """Multi-word keywords win over their prefixes"""
+    hits = keyword_hits("A systematic review and meta-analysis of deep learning")
+    assert hits["Meta-Analysis"] == 2
+    assert hits["Computational"] == 1
+
+
+def test_keyword_hits_case_insensitive():
+    """Matching ignores case"""
+    assert keyword_hits("MONTE CARLO Simulation") == {"Simulation": 2}
+
+
+def test_keyword_hits_empty():
+    """Text without keywords has no hits"""
+    assert keyword_hits("On the colour of the sky") == {}
+
+
+def test_threshold_scores_allows_multiple_labels():
+    """Scores above the threshold all become labels; the best is always kept"""
+    import numpy as np
+    from backend.domain.pipeline.stage_4_methodology import _threshold_scores
+    
+    scores = np.array([
+        [0.5, 0.4, 0.1],   # mixed methods
+        [0.2, 0.25, 0.1],  # weak, but best label survives
+        [0.0, 0.0, 0.0],   # unclassified
+    ])
+    matrix = _threshold_scores(scores, threshold=0.3)
+    
+    assert matrix[0].indices.tolist() == [0, 1]
+    assert matrix[1].indices.tolist() == [1]
+    assert matrix[2].nnz == 0
+
+
+def test_nli_cache_keys_papers_without_ids_by_text(monkeypatch):
+    """Papers with an empty paper_id do not share NLI results"""
+    import asyncio
+    import numpy as np
+    from backend.api.models.paper_model import Paper
+    from backend.domain.pipeline import stage_4_methodology
+    
+    class StubNLI:
+        async def zero_shot_classify(self, texts, labels, **kwargs):
+            return [[1.0 if label in text.lower() else 0.0 for label in labels] for text in texts]
+    
+    monkeypatch.setattr(stage_4_methodology, "hf_client", StubNLI())
+    monkeypatch.setattr(stage_4_methodology, "_nli_cache", type(stage_4_methodology._nli_cache)())
+    
+    papers = [
+        Paper(paper_id="", title="A survey of graph methods"),
+        Paper(paper_id="", title="A simulation of traffic flow"),
+    ]
+    names = [name.lower() for name in stage_4_methodology.METHODOLOGY_NAMES]
+    scores = np.zeros((2, len(names)))
+    
+    assert asyncio.run(stage_4_methodology._refine_with_nli(papers, scores)) == 2
+    assert scores[0, names.index("survey")] == 1.0
+    assert scores[1, names.index("simulation")] == 1.0
+    assert scores[1, names.index("survey")] == 0.0
+
+
+def test_embedding_scores_pick_nearest_prototype(monkeypatch):
+    """Papers take the closest methodology; dissimilar ones become "Other"; prototypes are reused per model"""
+    import asyncio
+    import numpy as np
+    from backend.api.models.paper_model import Paper
+    from backend.core.config import settings
+    from backend.domain import embeddings
+    from backend.domain.pipeline import stage_4_methodology
+    
+    names = stage_4_methodology.METHODOLOGY_NAMES
+    descriptions = {stage_4_methodology.METHODOLOGY_DESCRIPTIONS[name]: i for i, name in enumerate(names)}
+    
+    class StubEmbeddings:
+        prototype_calls = 0
+        
+        async def get_embeddings(self, texts):
+            if texts[0] in descriptions:
+                StubEmbeddings.prototype_calls += 1
+            vectors = np.zeros((len(texts), len(names) + 1))
+            for row, text in enumerate(texts):
+                if text in descriptions:
+                    vectors[row, descriptions[text]] = 1.0
+                elif text.startswith("Paper"):
+                    vectors[row, int(text.split()[1])] = 1.0
+                else:
+                    vectors[row, -1] = 1.0  # orthogonal to every prototype
+            return vectors.tolist()
+    
+    stub = StubEmbeddings()
+    monkeypatch.setattr(stage_4_methodology, "hf_client", stub)
+    monkeypatch.setattr(embeddings, "hf_client", stub)
+    monkeypatch.setattr(stage_4_methodology, "_prototype_cache", {})
+    
+    papers = [
+        Paper(paper_id="a", title="Paper 2"),
+        Paper(paper_id="b", title="Paper 0"),
+        Paper(paper_id="c", title="Unrelated note"),
+    ]
+    scores = asyncio.run(stage_4_methodology._score_by_embedding(papers))
+    
+    assert scores.shape == (3, len(names))
+    assert scores[:2].argmax(axis=1).tolist() == [2, 0]
+    assert not scores[2].any()  # below methodology_min_similarity
+    matrix = stage_4_methodology._threshold_scores(scores, threshold=settings.methodology_label_threshold)
+    assert stage_4_methodology._group_by_methodology(papers, matrix)["Other"] == [(2, papers[2])]
+    
+    asyncio.run(stage_4_methodology._score_by_embedding(papers))
+    assert StubEmbeddings.prototype_calls == 1
+    
+    monkeypatch.setattr(settings, "embedding_model", "another-model")
+    asyncio.run(stage_4_methodology._score_by_embedding(papers))
+    assert StubEmbeddings.prototype_calls == 2
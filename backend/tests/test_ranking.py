@@ -0,0 +1,66 @@
+"""
+Test Stage 5 Ranking
+Vectorized multi-factor scoring with configurable weights
+"""
+import numpy as np
+from backend.api.models.paper_model import Paper
+from backend.api.models.ranking_model import RankingWeights
+from backend.domain.pipeline.stage_5_ranking import FEATURE_NAMES, build_feature_matrix, rank, weight_vector
+from tests.fixtures.sample_data import SAMPLE_PAPERS
+
+
+def _papers():
+    return [Paper(**p) for p in SAMPLE_PAPERS]
+
+
+def test_feature_matrix_shape_and_range():
+    """One row per paper, every feature normalized to [0, 1]"""
+    features = build_feature_matrix(_papers())
+    assert features.shape == (len(SAMPLE_PAPERS), len(FEATURE_NAMES))
+    assert features.min() >= 0.0
+    assert features.max() <= 1.0
+
+
+def test_weights_are_normalized():
+    """Weights always sum to one, even when all are zero"""
+    assert np.isclose(weight_vector(RankingWeights(relevance=2, citations=2)).sum(), 1.0)
+    assert np.isclose(weight_vector(RankingWeights(relevance=0, citations=0, recency=0, abstract=0)).sum(), 1.0)
+
+
+def test_weights_change_order():
+    """Ranking purely by citations puts the most cited paper first"""
+    papers = _papers()
+    order, _ = rank(
+        build_feature_matrix(papers),
+        RankingWeights(relevance=0, citations=1, recency=0, abstract=0)
+    )
+    most_cited = max(range(len(papers)), key=lambda i: papers[i].citation_count)
+    assert order[0] == most_cited
+
+
+def test_empty_paper_list():
+    """No papers gives an empty feature matrix"""
+    assert build_feature_matrix([]).shape == (0, len(FEATURE_NAMES))
+
+
+def test_rerank_session_uses_cached_features(monkeypatch):
+    """Re-ranking a session only needs its cached feature matrix"""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.domain.pipeline import stage_5_ranking
+    
+    # Keep progress messages off the shared manager (and its event log)
+    stub_manager = MagicMock()
+    stub_manager.send_stage_update = AsyncMock()
+    stub_manager.send_stage_complete = AsyncMock()
+    monkeypatch.setattr(stage_5_ranking, "manager", stub_manager)
+    
+    asyncio.run(stage_5_ranking.execute("rerank-session", _papers()))
+    
+    ranked = stage_5_ranking.rerank_session(
+        "rerank-session",
+        RankingWeights(relevance=0, citations=0, recency=1, abstract=0)
+    )
+    assert [p["final_rank"] for p in ranked] == list(range(1, len(SAMPLE_PAPERS) + 1))
+    assert ranked[0]["year"] == max(p["year"] for p in SAMPLE_PAPERS)
+    assert stage_5_ranking.rerank_session("unknown-session", RankingWeights()) is None
@@ -0,0 +1,173 @@
+"""
+Test Relevance Scoring
+Stage 2 scores paper batches as they arrive and must stay ordered by
+relevance_score after re-scoring the head
+"""
+import asyncio
+from backend.api.models.paper_model import Paper
+from backend.core.config import settings
+from backend.domain.pipeline import stage_2_relevance
+
+
+class StubCrossEncoder:
+    """Returns fixed logits for the head, in input order"""
+    
+    def __init__(self, logits):
+        self.logits = logits
+        self.calls = []
+    
+    async def rerank(self, query, texts, batch_size=None, time_budget=None):
+        self.calls.append(texts)
+        return self.logits[:len(texts)]
+
+
+def _papers(scores):
+    return [
+        Paper(paper_id=f"p{i}", title=f"Paper {i}", relevance_score=score)
+        for i, score in enumerate(scores)
+    ]
+
+
+def test_rerank_head_reorders_by_blended_score(monkeypatch):
+    """Cross-encoder scores reorder the head"""
+    monkeypatch.setattr(settings, "rerank_top_n", 3)
+    monkeypatch.setattr(settings, "rerank_weight", 1.0)
+    monkeypatch.setattr(stage_2_relevance, "hf_client", StubCrossEncoder([-2.0, 0.0, 2.0]))
+    
+    papers = asyncio.run(stage_2_relevance._rerank_head("query", _papers([0.9, 0.8, 0.7, 0.1])))
+    
+    assert [p.paper_id for p in papers] == ["p2", "p1", "p0", "p3"]
+
+
+def test_rerank_head_keeps_whole_list_sorted(monkeypatch):
+    """A head paper demoted below the tail's best score moves into the tail"""
+    monkeypatch.setattr(settings, "rerank_top_n", 2)
+    monkeypatch.setattr(settings, "rerank_weight", 0.5)
+    monkeypatch.setattr(stage_2_relevance, "hf_client", StubCrossEncoder([5.0, -5.0]))
+    
+    papers = asyncio.run(stage_2_relevance._rerank_head("query", _papers([0.9, 0.85, 0.8, 0.3])))
+    scores = [p.relevance_score for p in papers]
+    
+    assert scores == sorted(scores, reverse=True)
+    assert [p.paper_id for p in papers] == ["p0", "p2", "p1", "p3"]
+
+
+def test_rerank_head_failure_keeps_order(monkeypatch):
+    """A failing cross-encoder leaves the bi-encoder ranking untouched"""
+    class Failing:
+        async def rerank(self, *args, **kwargs):
+            raise RuntimeError("model unavailable")
+    
+    monkeypatch.setattr(stage_2_relevance, "hf_client", Failing())
+    papers = _papers([0.9, 0.5])
+    
+    assert asyncio.run(stage_2_relevance._rerank_head("query", papers)) == papers
+
+
+class StubEmbedder:
+    """Embeds "Paper <i>" along axis i and the query along axis 0"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def get_embeddings(self, texts):
+        self.calls.append(texts)
+        vectors = []
+        for text in texts:
+            vector = [0.0] * 4
+            vector[int(text.split()[1]) if text.startswith("Paper") else 0] = 1.0
+            vectors.append(vector)
+        return vectors
+
+
+def _stub_manager(monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+    stub = MagicMock()
+    stub.send_stage_update = AsyncMock()
+    stub.send_stage_complete = AsyncMock()
+    monkeypatch.setattr(stage_2_relevance, "manager", stub)
+    return stub
+
+
+def test_batches_are_scored_as_they_arrive(monkeypatch):
+    """Each batch is embedded on its own and the running top-K is pushed after it"""
+    monkeypatch.setattr(settings, "partial_ranking_size", 2)
+    monkeypatch.setattr(settings, "dedupe_enabled", False)
+    monkeypatch.setattr(settings, "rerank_enabled", False)
+    embedder = StubEmbedder()
+    monkeypatch.setattr(stage_2_relevance, "hf_client", embedder)
+    stub_manager = _stub_manager(monkeypatch)
+    
+    async def batches():
+        yield [Paper(paper_id="a", title="Paper 1"), Paper(paper_id="b", title="Paper 0")]
+        yield [Paper(paper_id="c", title="Paper 0", citation_count=1000), Paper(paper_id="d", title="Paper 2")]
+    
+    papers = asyncio.run(stage_2_relevance.execute("s", batches(), ["query"], expected_total=4))
+    
+    assert embedder.calls[1:] == [["Paper 1", "Paper 0"], ["Paper 0", "Paper 2"]]
+    assert [p.paper_id for p in papers][:2] == ["c", "b"]
+    assert papers[0].relevance_score == 1.0
+    
+    rankings = [
+        call.kwargs["data"]["partial_ranking"]
+        for call in stub_manager.send_stage_update.call_args_list
+        if call.kwargs.get("data")
+    ]
+    assert [[entry["paper_id"] for entry in ranking] for ranking in rankings] == [["b", "a"], ["c", "b"]]
+    assert stub_manager.send_stage_complete.call_args.kwargs["result"]["papers_scored"] == 4
+
+
+def test_empty_input_still_completes_stage(monkeypatch):
+    """No papers is reported as a completed stage with an empty result"""
+    monkeypatch.setattr(stage_2_relevance, "hf_client", StubEmbedder())
+    stub_manager = _stub_manager(monkeypatch)
+    
+    assert asyncio.run(stage_2_relevance.execute("s", [], ["query"])) == []
+    result = stub_manager.send_stage_complete.call_args.kwargs["result"]
+    assert result["papers_scored"] == 0 and result["top_papers"] == []
+
+
+def test_search_is_paged_until_the_results_end(monkeypatch):
+    """Pages are requested at increasing offsets and yielded until `next` is missing"""
+    from backend.infrastructure.external import semantic_scholar
+    
+    pages = [
+        {"data": [{"paperId": "p0", "title": "A"}, {"paperId": "p1", "title": "B"}], "next": 2},
+        {"data": [{"paperId": "p2", "title": "C"}]},
+    ]
+    requests = []
+    
+    class StubResponse:
+        def __init__(self, data):
+            self.data = data
+        
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            return self.data
+    
+    class StubHTTP:
+        def __init__(self, *args, **kwargs):
+            pass
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc):
+            return False
+        
+        async def get(self, url, params=None, headers=None):
+            requests.append((params["offset"], params["limit"]))
+            return StubResponse(pages[len(requests) - 1])
+    
+    monkeypatch.setattr(semantic_scholar.httpx, "AsyncClient", StubHTTP)
+    
+    async def collect():
+        client = semantic_scholar.SemanticScholarClient()
+        return [batch async for batch in client.iter_search_papers(["q"], limit=10, batch_size=2)]
+    
+    batches = asyncio.run(collect())
+    
+    assert [[p.paper_id for p in batch] for batch in batches] == [["p0", "p1"], ["p2"]]
+    assert requests == [(0, 2), (2, 2)]
@@ -0,0 +1,78 @@
+"""
+Test Report Builder
+Structured Stage 6 report document and its Markdown/HTML renderers
+"""
+from backend.api.models.paper_model import Paper
+from backend.domain.report_builder import ReportBuilder, Span, render_html, render_markdown
+from tests.fixtures.sample_data import SAMPLE_PAPERS
+
+
+def _document():
+    papers = [Paper(**p) for p in SAMPLE_PAPERS]
+    builder = ReportBuilder("Literature Review: <graphs>")
+    builder.section("Overview").paragraph("Covers ", Span("5", bold=True), " papers.")
+    themes = builder.section("Thematic Analysis", "themes")
+    themes.subsection("Graphs & Chemistry (2 papers)", "theme-Graphs & Chemistry").papers(papers[:2])
+    themes.subsection("Graphs & Chemistry (2 papers)", "theme-Graphs & Chemistry").papers(papers[2:4])
+    builder.section("Methodological Distribution", "methodologies").table(
+        ["Methodology", "Papers"], [["Survey", "3"], ["Empirical", "2"]]
+    )
+    builder.section("Highly Relevant Papers", "top-papers").papers(papers[:1], detailed=True)
+    return builder.build(), papers
+
+
+def test_section_ids_are_unique_slugs():
+    """Section IDs are slugged and de-duplicated across the document"""
+    document, _ = _document()
+    themes = document.find("themes")
+    assert [s.id for s in themes.subsections] == ["theme-graphs-chemistry", "theme-graphs-chemistry-2"]
+    assert document.find("theme-graphs-chemistry-2").level == 3
+    assert document.find("missing") is None
+
+
+def test_markdown_rendering():
+    """Markdown keeps the headings, paper entries and table of the document"""
+    document, papers = _document()
+    md = render_markdown(document)
+    assert md.startswith("# Literature Review: <graphs>\n")
+    assert "## Overview\n\nCovers **5** papers.\n" in md
+    assert "### Graphs & Chemistry (2 papers)\n" in md
+    assert f"- **{papers[0].title}** ({papers[0].year})\n" in md
+    assert "| Methodology | Papers |\n|---|---|\n| Survey | 3 |\n" in md
+    assert f"**{papers[0].final_rank}. {papers[0].title}**\n\n- Authors: " in md
+
+
+def test_html_rendering_escapes_text():
+    """HTML is emitted directly from the structure with text escaped"""
+    document, papers = _document()
+    out = render_html(document)
+    assert "<h1>Literature Review: &lt;graphs&gt;</h1>" in out
+    assert '<h3 id="theme-graphs-chemistry">Graphs &amp; Chemistry (2 papers)</h3>' in out
+    assert "<p>Covers <strong>5</strong> papers.</p>" in out
+    assert "<tr><td>Survey</td><td>3</td></tr>" in out
+    assert f'<a href="{papers[0].url}">' in out
+
+
+def test_lazy_section_is_built_once_on_load():
+    """Lazy sections render as a placeholder until loaded, then are kept"""
+    papers = [Paper(**p) for p in SAMPLE_PAPERS]
+    calls = []
+    
+    def fill(section):
+        calls.append(section.section.id)
+        section.papers(papers[:2])
+    
+    builder = ReportBuilder("Review")
+    builder.section("Thematic Analysis", "themes").lazy_subsection("Graphs", fill, "theme-graphs")
+    document = builder.build()
+    
+    assert document.outline()[1] == {"id": "theme-graphs", "title": "Graphs", "level": 3, "lazy": True}
+    markdown = render_markdown(document)
+    assert "### Graphs\n\n*Details of this section load on demand" in markdown
+    
+    section = document.load("theme-graphs")
+    document.load("theme-graphs")
+    assert calls == ["theme-graphs"]
+    assert len(section.blocks) == 1
+    assert "### Graphs\n" in render_markdown(document)
+    assert document.outline()[1]["lazy"] is False
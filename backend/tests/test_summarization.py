@@ -0,0 +1,130 @@
+"""
+Test Batched Summarization
+summarize_batch must keep input order, isolate failing texts and report
+each summary under its input index; cached summaries are keyed by the
+model of the configured tier and its quantization
+"""
+import asyncio
+import pytest
+from backend.core.config import settings
+from backend.infrastructure.ai.huggingface_client import HuggingFaceClient
+
+
+class StubSummarizer:
+    """Stands in for the transformers pipeline; fails any batch containing "bad" """
+    
+    def __init__(self):
+        self.batches = []
+    
+    def __call__(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        if any("bad" in text for text in texts):
+            raise RuntimeError("generation failed")
+        return [{"summary_text": text.upper()} for text in texts]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "summary_cache_enabled", False)
+    monkeypatch.setattr(settings, "summarization_batch_size", 2)
+    client = HuggingFaceClient()
+    client.use_local = True
+    client._local_summarization_model = StubSummarizer()
+    return client
+
+
+def test_local_batches_are_length_sorted_and_reordered(client):
+    """Texts are batched longest first, and summaries come back in input order"""
+    texts = ["a", "ccc", "bb", "dddd"]
+    
+    summaries = asyncio.run(client.summarize_batch(texts, 50))
+    
+    assert client._local_summarization_model.batches == [["dddd", "ccc"], ["bb", "a"]]
+    assert summaries == ["A", "CCC", "BB", "DDDD"]
+
+
+def test_failed_batch_is_retried_text_by_text(client):
+    """Only the failing text comes back empty; its batch-mates are still summarized"""
+    summaries = asyncio.run(client.summarize_batch(["bad text", "good", "ok"], 50))
+    
+    assert summaries == ["", "GOOD", "OK"]
+    assert ["bad text"] in client._local_summarization_model.batches
+    assert ["good"] in client._local_summarization_model.batches
+
+
+def test_on_summary_reports_input_indices(client):
+    """Callbacks name the input position, not the position in the sorted order"""
+    reported = {}
+    
+    async def on_summary(i, summary):
+        reported[i] = summary
+    
+    summaries = asyncio.run(client.summarize_batch(["a", "bad one", "ccc"], 50, on_summary=on_summary))
+    
+    assert reported == {0: "A", 2: "CCC"}
+    assert summaries == ["A", "", "CCC"]
+
+
+def test_api_failures_fall_back_to_local(client):
+    """Texts the API fails on are summarized locally and reported under their own index"""
+    client.use_local = False
+    
+    async def summarize_api(text, max_length):
+        if text == "b":
+            raise RuntimeError("API unavailable")
+        return "api:" + text
+    
+    client._summarize_api = summarize_api
+    reported = {}
+    
+    async def on_summary(i, summary):
+        reported[i] = summary
+    
+    summaries = asyncio.run(client.summarize_batch(["a", "b", "c"], 50, on_summary=on_summary))
+    
+    assert summaries == ["api:a", "B", "api:c"]
+    assert reported == {0: "api:a", 1: "B", 2: "api:c"}
+    assert client._local_summarization_model.batches == [["b"]]
+
+
+def test_tier_selects_summarization_model(client, monkeypatch):
+    """The distilled tier swaps in the smaller model; unknown tiers are rejected"""
+    monkeypatch.setattr(settings, "summarization_tier", "full")
+    assert client.summarization_model_name == settings.summarization_model
+    
+    monkeypatch.setattr(settings, "summarization_tier", "distilled")
+    assert client.summarization_model_name == settings.distilled_summarization_model
+    
+    monkeypatch.setattr(settings, "summarization_tier", "tiny")
+    with pytest.raises(ValueError):
+        client.summarization_model_name
+
+
+def test_cache_keys_separate_models_and_quantization(client, monkeypatch, tmp_path):
+    """Summaries are only reused for the same model and int8 setting"""
+    from backend.infrastructure.ai import huggingface_client
+    from backend.infrastructure.cache.summary_cache import SummaryCache
+    
+    cache = SummaryCache(tmp_path)
+    monkeypatch.setattr(huggingface_client, "summary_cache", cache)
+    monkeypatch.setattr(settings, "summary_cache_enabled", True)
+    batches = client._local_summarization_model.batches
+    min_length = client._summary_min_length(50)
+    
+    def summarize(tier, quantized):
+        monkeypatch.setattr(settings, "summarization_tier", tier)
+        client.quantize_summarizer = quantized
+        return asyncio.run(client.summarize_batch(["text"], 50))
+    
+    summarize("full", False)
+    summarize("distilled", False)
+    summarize("distilled", True)
+    assert len(batches) == 3
+    
+    assert summarize("full", False) == ["TEXT"]
+    assert len(batches) == 3
+    
+    assert cache.get(settings.summarization_model, 50, min_length, "text") == "TEXT"
+    assert cache.get(settings.distilled_summarization_model, 50, min_length, "text") == "TEXT"
+    assert cache.get(settings.distilled_summarization_model + "+int8", 50, min_length, "text") == "TEXT"
+    assert cache.get(settings.summarization_model + "+int8", 50, min_length, "text") is None
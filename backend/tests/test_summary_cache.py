@@ -0,0 +1,52 @@
+"""
+Test Summary Cache
+Disk-backed cache of generated summaries used by the summarization client
+"""
+import os
+import time
+from backend.infrastructure.cache.summary_cache import SummaryCache
+
+
+def test_round_trip_and_key_parameters(tmp_path):
+    """A summary is only returned for the exact model and lengths it was made with"""
+    cache = SummaryCache(tmp_path)
+    cache.put("bart", 120, 30, "some abstract", "short summary")
+    
+    assert cache.get("bart", 120, 30, "some abstract") == "short summary"
+    assert cache.get("bart", 150, 30, "some abstract") is None
+    assert cache.get("distilbart", 120, 30, "some abstract") is None
+    assert cache.get("bart", 120, 30, "another abstract") is None
+
+
+def test_survives_new_instance(tmp_path):
+    """Entries persist on disk across cache instances"""
+    SummaryCache(tmp_path).put("bart", 120, 30, "text", "summary")
+    assert SummaryCache(tmp_path).get("bart", 120, 30, "text") == "summary"
+
+
+def test_evicts_least_recently_used(tmp_path):
+    """Once full, the oldest untouched entries are dropped first"""
+    cache = SummaryCache(tmp_path, max_entries=10)
+    for i in range(10):
+        cache.put("bart", 120, 30, f"text {i}", f"summary {i}")
+        path = tmp_path / f"{cache.key('bart', 120, 30, f'text {i}')}.json"
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    
+    assert cache.get("bart", 120, 30, "text 0") == "summary 0"
+    cache.put("bart", 120, 30, "text 10", "summary 10")
+    
+    assert len(list(tmp_path.glob("*.json"))) == 9
+    assert cache.get("bart", 120, 30, "text 0") == "summary 0"
+    assert cache.get("bart", 120, 30, "text 10") == "summary 10"
+    assert cache.get("bart", 120, 30, "text 1") is None
+
+
+def test_async_lookup_and_store(tmp_path):
+    """The async helpers read and write the same entries as get/put"""
+    import asyncio
+    cache = SummaryCache(tmp_path)
+    
+    asyncio.run(cache.store("bart", 120, 30, {"a": "summary a", "b": "summary b"}))
+    
+    assert asyncio.run(cache.lookup("bart", 120, 30, ["b", "c", "a"])) == ["summary b", None, "summary a"]
+    assert cache.get("bart", 120, 30, "a") == "summary a"
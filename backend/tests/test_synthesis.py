@@ -0,0 +1,127 @@
+"""
+Test Stage 6 Synthesis
+Map-reduce theme summaries, streamed to the client as they finish
+"""
+import asyncio
+from backend.api.models.paper_model import Paper
+from backend.domain.pipeline import stage_6_synthesis
+
+
+class StubSummarizer:
+    """Summarizes by truncation; reports each summary through on_summary"""
+    
+    async def summarize_batch(self, texts, max_length=150, time_budget=None, cancel_event=None, on_summary=None):
+        summaries = [text[:20] for text in texts]
+        for i, summary in enumerate(summaries):
+            if on_summary is not None:
+                await on_summary(i, summary)
+        return summaries
+    
+    async def summarize_stream(self, text, max_length=150, time_budget=None, cancel_event=None):
+        for word in ["Overview", " of", " themes."]:
+            yield word
+
+
+def _themes():
+    return {
+        "Graphs": [Paper(paper_id="g", title="G", abstract="Graph networks for molecules.", final_rank=1)],
+        "Vision": [Paper(paper_id="v", title="V", abstract="Vision transformers at scale.", final_rank=2)],
+    }
+
+
+def test_theme_summaries_are_streamed_before_overview(monkeypatch):
+    """Each finished theme summary reaches the client before the reduce step, and stays while the overview streams"""
+    monkeypatch.setattr(stage_6_synthesis, "hf_client", StubSummarizer())
+    partials = []
+    
+    async def on_partial(text):
+        partials.append(text)
+    
+    overview, theme_summaries = asyncio.run(
+        stage_6_synthesis._summarize_themes(_themes(), on_partial=on_partial)
+    )
+    
+    assert partials[0] == "Graphs: Graph networks for m"
+    assert partials[1] == "Graphs: Graph networks for m\n\nVision: Vision transformers "
+    assert partials[-1] == partials[1] + "\n\nOverview: Overview of themes."
+    assert all(len(a) < len(b) for a, b in zip(partials, partials[1:]))
+    assert overview == "Overview of themes."
+    assert set(theme_summaries) == {"Graphs", "Vision"}
+
+
+def _run_large_review(monkeypatch, session_id):
+    """Stage 6 on a review big enough for on-demand theme sections"""
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.core.config import settings
+    
+    stub_manager = MagicMock()
+    stub_manager.send_stage_update = AsyncMock()
+    stub_manager.send_stage_complete = AsyncMock()
+    monkeypatch.setattr(stage_6_synthesis, "manager", stub_manager)
+    monkeypatch.setattr(stage_6_synthesis, "hf_client", StubSummarizer())
+    monkeypatch.setattr(settings, "report_lazy_min_papers", 2)
+    monkeypatch.setattr(settings, "synthesis_stream", False)
+    
+    themes = _themes()
+    papers = [p for theme_papers in themes.values() for p in theme_papers]
+    return asyncio.run(stage_6_synthesis.execute(session_id, papers, themes, {"Survey": papers}, ["ml"]))
+
+
+def test_large_review_theme_sections_are_lazy(monkeypatch):
+    """Theme sections are listed as lazy and shown as placeholders in the synthesis"""
+    report = _run_large_review(monkeypatch, "lazy-session")
+    
+    lazy = [s for s in report.metadata["sections"] if s["lazy"]]
+    assert [s["id"] for s in lazy] == ["theme-graphs", "theme-vision"]
+    assert "### Graphs (1 papers)\n\n*Details of this section load on demand" in report.synthesis
+    
+    section = stage_6_synthesis.get_document("lazy-session").load("theme-graphs")
+    assert section.loaded and len(section.blocks) == 1
+
+
+def test_report_section_endpoint(monkeypatch):
+    """Sections are served from the document kept in Stage 6's session cache"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api.routers import pipeline_router
+    
+    _run_large_review(monkeypatch, "endpoint-session")
+    
+    app = FastAPI()
+    app.include_router(pipeline_router.router)
+    client = TestClient(app)
+    url = "/api/pipeline/report/endpoint-session/sections"
+    
+    response = client.get(f"{url}/theme-vision")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Vision (1 papers)"
+    assert "Vision transformers" in response.json()["content"]
+    
+    html = client.get(f"{url}/theme-vision", params={"format": "html"}).json()["content"]
+    assert html.startswith('<h3 id="theme-vision">')
+    
+    assert client.get(f"{url}/theme-vision", params={"format": "pdf"}).status_code == 422
+    assert client.get(f"{url}/no-such-section").status_code == 404
+    assert client.get("/api/pipeline/report/unknown-session/sections/theme-vision").status_code == 404
+
+
+def test_pdf_does_not_build_lazy_sections(monkeypatch, tmp_path):
+    """Stage 7 renders lazy sections as placeholders instead of loading them"""
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.domain.pipeline import stage_7_pdf
+    from backend.domain.report_builder import UNLOADED_NOTE
+    
+    report = _run_large_review(monkeypatch, "pdf-session")
+    document = stage_6_synthesis.get_document("pdf-session")
+    
+    stub_manager = MagicMock()
+    stub_manager.send_stage_update = AsyncMock()
+    stub_manager.send_stage_complete = AsyncMock()
+    monkeypatch.setattr(stage_7_pdf, "manager", stub_manager)
+    monkeypatch.setattr(stage_7_pdf, "HTML", MagicMock(side_effect=RuntimeError("no PDF backend")))
+    
+    path = asyncio.run(stage_7_pdf.execute("pdf-session", report, tmp_path, document=document))
+    
+    html = open(path, encoding="utf-8").read()
+    assert html.count(UNLOADED_NOTE) == 2
+    assert [s["id"] for s in document.outline() if s["lazy"]] == ["theme-graphs", "theme-vision"]
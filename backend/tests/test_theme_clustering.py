@@ -0,0 +1,160 @@
+"""
+Test Theme Clustering Helpers
+Stage 3 must pick a sensible number of themes without fixed K
+"""
+import numpy as np
+from backend.domain.theme_clustering import kmeans_auto
+
+
+def _blobs(n_blobs: int, per_blob: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    rng = np.random.RandomState(seed)
+    centers = rng.randn(n_blobs, dim) * 10
+    return np.vstack([c + rng.randn(per_blob, dim) for c in centers])
+
+
+def test_kmeans_auto_finds_blob_count():
+    """Well separated blobs should be recovered exactly"""
+    labels, centers = kmeans_auto(_blobs(4, 50), min_clusters=2, max_clusters=8)
+    assert len(centers) == 4
+    assert len(np.unique(labels)) == 4
+
+
+def test_kmeans_auto_respects_bounds():
+    """Chosen K stays inside the configured range"""
+    labels, centers = kmeans_auto(_blobs(6, 30), min_clusters=2, max_clusters=3)
+    assert 2 <= len(centers) <= 3
+
+
+def test_kmeans_auto_tiny_input():
+    """Fewer than three papers collapse to a single theme"""
+    labels, centers = kmeans_auto(np.random.rand(2, 8))
+    assert labels.tolist() == [0, 0]
+    assert centers.shape == (1, 8)
+
+
+def test_kmeans_auto_minibatch_path():
+    """Large corpora go through MiniBatchKMeans and still cluster well"""
+    labels, centers = kmeans_auto(_blobs(3, 100), minibatch_threshold=50)
+    assert len(centers) == 3
+
+
+def test_hdbscan_marks_outliers():
+    """Isolated points land in the outlier bucket instead of a theme"""
+    from backend.domain.theme_clustering import OUTLIER_LABEL, cluster_hdbscan
+    
+    rng = np.random.RandomState(1)
+    X = np.vstack([_blobs(2, 40), rng.randn(1, 16) * 100])
+    result = cluster_hdbscan(X, min_cluster_size=5, reduced_dimensions=5)
+    assert result.labels[-1] == OUTLIER_LABEL
+    assert len(result.centers) == 2
+
+
+def test_agglomerative_tree_can_be_recut():
+    """The cached linkage tree gives any number of themes without refitting"""
+    from backend.domain.theme_clustering import cluster_agglomerative, cut_tree
+    
+    result = cluster_agglomerative(_blobs(4, 25), min_clusters=2, max_clusters=6)
+    assert len(result.centers) == 4
+    assert result.linkage_tree is not None
+    assert len(np.unique(cut_tree(result.linkage_tree, 2))) == 2
+
+
+def test_unknown_backend_rejected():
+    """Misconfigured backend names fail loudly"""
+    import pytest
+    from backend.domain.theme_clustering import get_backend
+    
+    with pytest.raises(ValueError):
+        get_backend("spectral")
+
+
+def test_ctfidf_keyphrases_are_cluster_specific():
+    """c-TF-IDF surfaces each cluster's distinguishing phrases, not shared words"""
+    from backend.domain.theme_clustering import ctfidf_keyphrases
+    
+    documents = [
+        "Reinforcement learning for robot control",
+        "Deep reinforcement learning with sparse rewards",
+        "Graph neural networks for molecule property prediction",
+        "Message passing graph neural networks",
+        "A novel study of results",
+    ]
+    labels = np.array([0, 0, 1, 1, -1])
+    keyphrases = ctfidf_keyphrases(documents, labels, n_clusters=2)
+    
+    assert keyphrases[0][0] == "reinforcement learning"
+    assert "graph neural" in keyphrases[1][:2] or "neural networks" in keyphrases[1][:2]
+    assert not any("novel" in term for terms in keyphrases.values() for term in terms)
+
+
+def test_refine_from_centroids_keeps_known_assignments():
+    """Seeded runs only place new papers and keep the previous partition"""
+    from backend.domain.theme_clustering import kmeans_auto, refine_from_centroids
+    
+    X = _blobs(3, 30)
+    labels, centers = kmeans_auto(X, min_clusters=2, max_clusters=5)
+    
+    # Pretend the last 10 papers of every blob are new
+    known = labels.copy()
+    for blob in range(3):
+        known[blob * 30 + 20:(blob + 1) * 30] = -1
+    
+    result = refine_from_centroids(X, centers, known, max_iter=5)
+    assert np.array_equal(result.labels, labels)
+
+
+def test_recut_themes_leaves_session_papers_untouched():
+    """Re-cutting returns new theme assignments on copies of the papers"""
+    from backend.api.models.paper_model import Paper
+    from backend.domain.theme_clustering import linkage_tree
+    from backend.domain.pipeline import stage_3_themes
+    
+    papers = [Paper(paper_id=str(i), title=f"Paper {i}", theme="Original") for i in range(40)]
+    stage_3_themes._linkage_cache.set("recut-session", {"papers": papers, "tree": linkage_tree(_blobs(4, 10))})
+    
+    themes = stage_3_themes.recut_themes("recut-session", 2)
+    
+    assert len(themes) == 2
+    assert sum(len(group) for group in themes.values()) == 40
+    assert all(p.theme == "Original" for p in papers)
+
+
+def test_project_2d_round_trip_is_within_half_a_step():
+    """Dequantized coordinates match the PCA projection to half a quantization step"""
+    from sklearn.decomposition import PCA
+    from backend.domain.theme_clustering import project_2d
+    
+    X = _blobs(3, 20)
+    centers = np.vstack([X[i * 20:(i + 1) * 20].mean(axis=0) for i in range(3)])
+    
+    projection = project_2d(X, centers)
+    scale, offset = np.array(projection["scale"]), np.array(projection["offset"])
+    
+    pca = PCA(n_components=2, svd_solver="randomized", random_state=42).fit(X)
+    for key, expected in (("points", pca.transform(X)), ("centers", pca.transform(centers))):
+        values = np.array(projection[key])
+        assert values.min() >= -32767 and values.max() <= 32767
+        # Flat [x0, y0, x1, y1, ...], one pair per row
+        recovered = values.reshape(-1, 2) * scale + offset
+        assert np.all(np.abs(recovered - expected) <= scale / 2 + 1e-9)
+
+
+def test_theme_map_names_center_pairs_by_label():
+    """_theme_map slices the flat center list into one (x, y) pair per theme"""
+    from backend.api.models.paper_model import Paper
+    from backend.domain.pipeline.stage_3_themes import _theme_map
+    from backend.domain.theme_clustering import project_2d
+    
+    X = _blobs(3, 5)
+    labels = np.repeat([2, 0, 1], 5)
+    centers = np.vstack([X[labels == label].mean(axis=0) for label in range(3)])
+    names = {0: "Zero", 1: "One", 2: "Two"}
+    papers = [Paper(paper_id=str(i), title=f"Paper {i}", theme=names[label]) for i, label in enumerate(labels)]
+    
+    theme_map = _theme_map(papers, X, labels, centers)
+    flat = project_2d(X, centers)["centers"]
+    
+    assert theme_map["centers"] == {names[label]: flat[2 * label:2 * label + 2] for label in range(3)}
+    assert all(len(pair) == 2 for pair in theme_map["centers"].values())
+    assert len(theme_map["points"]) == 2 * len(papers)
+    assert theme_map["paper_ids"] == [p.paper_id for p in papers]
@@ -33,3 +33,121 @@ async def test_websocket_manager_connect():
         await manager.connect(session_id, mock_ws)
     
     mock_ws.accept.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_stage_updates_are_throttled():
+    """Rapid stage updates collapse to the latest one per stage"""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from backend.core.websocket_manager import ConnectionManager
+    
+    throttled = ConnectionManager()
+    throttled.max_updates_per_second = 10
+    throttled.send_message = AsyncMock()
+    
+    for i in range(50):
+        await throttled.send_stage_update("throttle-session", stage=4, progress=i, message=f"{i}")
+    
+    # First update goes out immediately, the rest are held back
+    assert throttled.send_message.await_count == 1
+    
+    await asyncio.sleep(0.2)
+    
+    assert throttled.send_message.await_count == 2
+    latest = throttled.send_message.await_args_list[-1].args[1]
+    assert latest["progress"] == 49
+
+
+@pytest.mark.asyncio
+async def test_stage_complete_supersedes_pending_update():
+    """A held update is dropped once its stage completes"""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from backend.core.websocket_manager import ConnectionManager
+    
+    throttled = ConnectionManager()
+    throttled.max_updates_per_second = 10
+    throttled.send_message = AsyncMock()
+    
+    await throttled.send_stage_update("complete-session", stage=2, progress=10, message="a")
+    await throttled.send_stage_update("complete-session", stage=2, progress=90, message="b")
+    await throttled.send_stage_complete("complete-session", stage=2, result={})
+    await asyncio.sleep(0.2)
+    
+    sent = [call.args[1]["type"] for call in throttled.send_message.await_args_list]
+    assert sent == ["stage_update", "stage_complete"]
+
+
+@pytest.mark.asyncio
+async def test_partial_text_keeps_latest_under_throttle():
+    """Streamed partial text is throttled like any update, keeping the newest"""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from backend.core.websocket_manager import ConnectionManager
+    
+    throttled = ConnectionManager()
+    throttled.max_updates_per_second = 10
+    throttled.send_message = AsyncMock()
+    
+    text = ""
+    for word in ["Deep", "learning", "improves", "recall."]:
+        text += word + " "
+        await throttled.send_stage_update("stream-session", stage=6, progress=88, message="m", partial_text=text)
+    await asyncio.sleep(0.2)
+    
+    sent = [call.args[1] for call in throttled.send_message.await_args_list]
+    assert [m["partial_text"] for m in sent] == ["Deep ", "Deep learning improves recall. "]
+    
+    await throttled.send_stage_update("stream-session", stage=6, progress=90, message="done")
+    await asyncio.sleep(0.2)
+    assert "partial_text" not in throttled.send_message.await_args_list[-1].args[1]
+
+
+@pytest.mark.asyncio
+async def test_update_held_during_flush_is_sent():
+    """An update that arrives while held updates are being sent still goes out"""
+    import asyncio
+    from backend.core.websocket_manager import ConnectionManager
+    
+    throttled = ConnectionManager()
+    throttled.max_updates_per_second = 20
+    sent = []
+    
+    async def slow_send(session_id, message):
+        sent.append(message["progress"])
+        if message["progress"] == 2:
+            await asyncio.sleep(0.1)
+    
+    throttled.send_message = slow_send
+    
+    await throttled.send_stage_update("flush-session", stage=3, progress=1, message="a")
+    await throttled.send_stage_update("flush-session", stage=3, progress=2, message="b")
+    await asyncio.sleep(0.07)  # the flush task is now sending progress=2
+    await throttled.send_stage_update("flush-session", stage=3, progress=3, message="c")
+    await asyncio.sleep(0.2)
+    
+    assert sent == [1, 2, 3]
+    assert "flush-session" not in throttled._flush_tasks
+
+
+@pytest.mark.asyncio
+async def test_release_forgets_session_state():
+    """Releasing a session drops its throttle timestamp and held updates"""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from backend.core.websocket_manager import ConnectionManager
+    
+    throttled = ConnectionManager()
+    throttled.max_updates_per_second = 10
+    throttled.send_message = AsyncMock()
+    
+    await throttled.send_stage_update("done-session", stage=7, progress=10, message="a")
+    await throttled.send_stage_update("done-session", stage=7, progress=20, message="b")
+    throttled.release("done-session")
+    await asyncio.sleep(0.2)
+    
+    assert throttled.send_message.await_count == 1
+    assert "done-session" not in throttled._last_update_at
+    assert "done-session" not in throttled._pending_updates
+    assert "done-session" not in throttled._flush_tasks
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Quality/latency benchmark for the Stage 6 summarization tiers
+Summarizes the fixture abstracts with each tier and compares the output
+against the full-precision full tier (ROUGE-1 / ROUGE-L F1)
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.core.config import settings
+from backend.infrastructure.ai.huggingface_client import HuggingFaceClient
+
+FIXTURES = Path(__file__).parent / "backend" / "tests" / "fixtures" / "papers.json"
+
+# (label, tier, quantize)
+CONFIGURATIONS = [
+    ("full", "full", False),
+    ("full+int8", "full", True),
+    ("distilled", "distilled", False),
+    ("distilled+int8", "distilled", True),
+]
+
+
+def tokens(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def rouge_1(candidate: str, reference: str) -> float:
+    """Unigram overlap F1"""
+    cand, ref = tokens(candidate), tokens(reference)
+    if not cand or not ref:
+        return 0.0
+    ref_counts = {}
+    for t in ref:
+        ref_counts[t] = ref_counts.get(t, 0) + 1
+    overlap = 0
+    for t in cand:
+        if ref_counts.get(t, 0) > 0:
+            ref_counts[t] -= 1
+            overlap += 1
+    if overlap == 0:
+        return 0.0
+    precision, recall = overlap / len(cand), overlap / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """Longest common subsequence F1"""
+    cand, ref = tokens(candidate), tokens(reference)
+    if not cand or not ref:
+        return 0.0
+    previous = [0] * (len(ref) + 1)
+    for c in cand:
+        current = [0]
+        for j, r in enumerate(ref):
+            current.append(previous[j] + 1 if c == r else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+async def run_configuration(tier: str, quantize: bool, abstracts: list, max_length: int, repeat: int) -> dict:
+    """Load one tier and time batched summarization of the abstracts"""
+    settings.summarization_tier = tier
+    settings.summarization_quantize = quantize
+    client = HuggingFaceClient()
+
+    start = time.time()
+    await client._run_in_executor(client._load_summarization_model)
+    load_time = time.time() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        summaries = await client.summarize_batch(abstracts, max_length=max_length)
+        timings.append(time.time() - start)
+
+    return {
+        "model": client.summarization_model_name,
+        "quantized": client.quantize_summarizer,
+        "load_time": load_time,
+        "latency": min(timings),
+        "summaries": summaries,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-length", type=int, default=settings.theme_summary_max_length)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per tier (best is reported)")
+    parser.add_argument("--only", nargs="*", help="Subset of configurations, e.g. full distilled+int8")
+    args = parser.parse_args()
+
+    # Always generate, never read back earlier summaries
+    settings.summary_cache_enabled = False
+    settings.use_local_models = True
+
+    abstracts = [p["abstract"] for p in json.loads(FIXTURES.read_text()) if p.get("abstract")]
+    print("="*60)
+    print("SUMMARIZATION TIER BENCHMARK")
+    print("="*60)
+    print(f"Abstracts: {len(abstracts)}, max_length: {args.max_length}, runs per tier: {args.repeat}")
+
+    results = {}
+    for label, tier, quantize in CONFIGURATIONS:
+        if args.only and label not in args.only:
+            continue
+        print(f"\n▶ {label}")
+        try:
+            results[label] = await run_configuration(tier, quantize, abstracts, args.max_length, args.repeat)
+        except Exception as e:
+            print(f"✗ {label} failed: {type(e).__name__}: {e}")
+
+    if not results:
+        return
+
+    reference = results.get("full", next(iter(results.values())))["summaries"]
+    print("\n" + "="*60)
+    print(f"{'tier':<16}{'load (s)':>10}{'batch (s)':>11}{'per doc (s)':>13}{'ROUGE-1':>9}{'ROUGE-L':>9}")
+    print("-"*68)
+    for label, result in results.items():
+        r1 = sum(rouge_1(c, r) for c, r in zip(result["summaries"], reference)) / len(reference)
+        rl = sum(rouge_l(c, r) for c, r in zip(result["summaries"], reference)) / len(reference)
+        print(
+            f"{label:<16}{result['load_time']:>10.1f}{result['latency']:>11.2f}"
+            f"{result['latency'] / len(abstracts):>13.2f}{r1:>9.3f}{rl:>9.3f}"
+        )
+    print("\nROUGE is measured against the full tier (or the first tier run)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
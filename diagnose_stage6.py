@@ -71,7 +71,7 @@ async def test_local_model():
         start = time.time()
         
         try:
-            summary = await hf_client._summarize_local(test_text, max_length=50)
+            summary = (await hf_client._summarize_batch_local([test_text], max_length=50))[0]
             elapsed = time.time() - start
             print(f"✓ Local model working! ({elapsed:.1f}s)")
             print(f"  Summary: {summary[:100]}...")
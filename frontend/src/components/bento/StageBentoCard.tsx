@@ -153,6 +153,16 @@ export const StageBentoCard: React.FC<StageBentoCardProps> = ({ stage, isDark })
           >
             {stage.message}
           </p>
+          {stage.status === 'running' && stage.partialText && (
+            <p
+              className={`mt-2 text-xs italic ${
+                isDark ? 'text-gray-400' : 'text-gray-500'
+              }`}
+            >
+              {/* Newest text is at the end */}
+              {stage.partialText.length > 240 ? `…${stage.partialText.slice(-240)}` : stage.partialText}
+            </p>
+          )}
         </div>
         
         {/* Progress bar */}
@@ -0,0 +1,83 @@
+import React, { useState } from 'react';
+import ReactMarkdown from 'react-markdown';
+import remarkGfm from 'remark-gfm';
+import { motion, AnimatePresence } from 'framer-motion';
+import { ChevronDown, ChevronRight, Loader2 } from 'lucide-react';
+import { ReportSectionOutline } from '@/types/pipeline.types';
+import { pipelineAPI } from '@/services/apiService';
+import { useUIStore } from '@/stores/uiStore';
+
+interface LazyReportSectionProps {
+  sessionId: string;
+  section: ReportSectionOutline;
+}
+
+export const LazyReportSection: React.FC<LazyReportSectionProps> = ({ sessionId, section }) => {
+  const { isDarkMode } = useUIStore();
+  const [isOpen, setIsOpen] = useState(false);
+  const [content, setContent] = useState<string | null>(null);
+  const [isLoading, setIsLoading] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+  
+  const handleToggle = async () => {
+    setIsOpen(!isOpen);
+    // Fetch once, on first open
+    if (content !== null || isLoading) return;
+    
+    setIsLoading(true);
+    setError(null);
+    try {
+      const result = await pipelineAPI.getReportSection(sessionId, section.id);
+      setContent(result.content);
+    } catch (err) {
+      setError('Could not load this section');
+    } finally {
+      setIsLoading(false);
+    }
+  };
+  
+  return (
+    <div className={`
+      rounded-2xl border
+      ${isDarkMode ? 'bg-white/5 border-white/10' : 'bg-white/40 border-primary/10'}
+    `}>
+      <button
+        onClick={handleToggle}
+        className={`
+          w-full flex items-center gap-2 p-4 text-left font-semibold
+          ${isDarkMode ? 'text-white' : 'text-gray-900'}
+        `}
+      >
+        {isOpen ? <ChevronDown className="w-4 h-4" /> : <ChevronRight className="w-4 h-4" />}
+        {section.title}
+        {isLoading && <Loader2 className="w-4 h-4 animate-spin ml-auto" />}
+      </button>
+      
+      <AnimatePresence>
+        {isOpen && (content !== null || error) && (
+          <motion.div
+            initial={{ opacity: 0, height: 0 }}
+            animate={{ opacity: 1, height: 'auto' }}
+            exit={{ opacity: 0, height: 0 }}
+            className={`
+              px-4 pb-4 prose max-w-none
+              ${isDarkMode 
+                ? 'prose-invert prose-headings:text-white prose-p:text-gray-300 prose-strong:text-white' 
+                : 'prose-headings:text-gray-900 prose-p:text-gray-700'
+              }
+            `}
+          >
+            {error ? (
+              <p className="text-red-400">{error}</p>
+            ) : (
+              <ReactMarkdown remarkPlugins={[remarkGfm]}>
+                {/* The section heading is already shown on the toggle */}
+                {content!.replace(/^\s*#+ .*\n/, '')}
+              </ReactMarkdown>
+            )}
+          </motion.div>
+        )}
+      </AnimatePresence>
+    </div>
+  );
+};
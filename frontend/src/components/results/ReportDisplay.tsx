@@ -5,9 +5,11 @@ import { motion } from 'framer-motion';
 import { Copy, Check } from 'lucide-react';
 import { usePipelineStore } from '@/stores/pipelineStore';
 import { useUIStore } from '@/stores/uiStore';
+import { ReportSectionOutline } from '@/types/pipeline.types';
+import { LazyReportSection } from './LazyReportSection';
 
 export const ReportDisplay: React.FC = () => {
-  const { report } = usePipelineStore();
+  const { report, sessionId } = usePipelineStore();
   const { isDarkMode } = useUIStore();
   const [copied, setCopied] = React.useState(false);
   
@@ -19,6 +21,9 @@ export const ReportDisplay: React.FC = () => {
     }
   };
   
+  const lazySections: ReportSectionOutline[] = (report?.metadata?.sections ?? [])
+    .filter((section: ReportSectionOutline) => section.lazy);
+  
   if (!report) {
     return (
       <div className="text-center py-12">
@@ -125,6 +130,23 @@ export const ReportDisplay: React.FC = () => {
         </div>
       </motion.div>
       
+      {/* Per-theme sections of large reviews, fetched when opened */}
+      {sessionId && lazySections.length > 0 && (
+        <div className={`
+          backdrop-blur-xl rounded-3xl p-6 border
+          ${isDarkMode ? 'bg-white/5 border-white/10' : 'bg-white/60 border-primary/20'}
+        `}>
+          <h3 className={`text-xl font-bold mb-4 ${isDarkMode ? 'text-white' : 'text-gray-900'}`}>
+            Theme Details
+          </h3>
+          <div className="space-y-3">
+            {lazySections.map((section) => (
+              <LazyReportSection key={section.id} sessionId={sessionId} section={section} />
+            ))}
+          </div>
+        </div>
+      )}
+      
       {/* Theme Distribution */}
       {report.papers_by_theme && Object.keys(report.papers_by_theme).length > 0 && (
         <div className={`
@@ -15,6 +15,7 @@ export const useWebSocket = (sessionId: string | null) => {
     setError,
     setPapers,
     setThemes,
+    setThemeMap,
     setMethodologies,
     setRankedPapers,
     isRunning
@@ -37,6 +38,8 @@ export const useWebSocket = (sessionId: string | null) => {
             progress: update.progress || 0,
             message: update.message || 'Processing...',
             startTime: Date.now(),
+            // Generated text so far (Stage 6 insights), cumulative
+            ...(update.partial_text !== undefined && { partialText: update.partial_text }),
           });
         }
         break;
@@ -62,6 +65,7 @@ export const useWebSocket = (sessionId: string | null) => {
             // Stage 3: Themes clustered
             setThemes(update.data.themes);
             console.log('Stored themes:', Object.keys(update.data.themes).length);
+            setThemeMap(update.data.theme_map || null);
           }
           
           if (update.stage === 4 && update.data?.methodologies) {
@@ -102,7 +106,7 @@ export const useWebSocket = (sessionId: string | null) => {
         }
         break;
     }
-  }, [updateStage, setReport, setPdfPath, setError, setPapers, setThemes, setMethodologies, setRankedPapers]);
+  }, [updateStage, setReport, setPdfPath, setError, setPapers, setThemes, setThemeMap, setMethodologies, setRankedPapers]);
   
   // Polling fallback to check pipeline status
   const startPolling = useCallback((sid: string) => {
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { PipelineRequest, PipelineResponse } from '@/types/pipeline.types';
+import { PipelineRequest, PipelineResponse, RankingWeights, ReportSection } from '@/types/pipeline.types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -25,4 +25,21 @@ export const pipelineAPI = {
     const response = await apiClient.get(`/api/pipeline/result/${sessionId}`);
     return response.data;
   },
+  
+  async rerankPipeline(sessionId: string, weights: RankingWeights): Promise<any> {
+    const response = await apiClient.post(`/api/pipeline/rerank/${sessionId}`, weights);
+    return response.data;
+  },
+  
+  async getReportSection(sessionId: string, sectionId: string): Promise<ReportSection> {
+    const response = await apiClient.get<ReportSection>(
+      `/api/pipeline/report/${sessionId}/sections/${encodeURIComponent(sectionId)}`
+    );
+    return response.data;
+  },
+  
+  async cancelPipeline(sessionId: string): Promise<any> {
+    const response = await apiClient.post(`/api/pipeline/cancel/${sessionId}`);
+    return response.data;
+  },
 };
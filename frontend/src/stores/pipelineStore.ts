@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import { PipelineStage, LiteratureReviewReport, Paper } from '@/types/pipeline.types';
+import { PipelineStage, LiteratureReviewReport, Paper, ThemeMap } from '@/types/pipeline.types';
 
 type ViewMode = 'pipeline' | 'results';
 type ResultTab = 'papers' | 'themes' | 'methodologies' | 'rankings' | 'report' | 'pdf';
@@ -15,6 +15,7 @@ interface PipelineState {
   // Result data
   papers: Paper[];
   themes: Record<string, Paper[]>;
+  themeMap: ThemeMap | null;
   methodologies: Record<string, Paper[]>;
   rankedPapers: Paper[];
   
@@ -34,6 +35,7 @@ interface PipelineState {
   setError: (error: string) => void;
   setPapers: (papers: Paper[]) => void;
   setThemes: (themes: Record<string, Paper[]>) => void;
+  setThemeMap: (themeMap: ThemeMap | null) => void;
   setMethodologies: (methodologies: Record<string, Paper[]>) => void;
   setRankedPapers: (papers: Paper[]) => void;
   setCurrentView: (view: ViewMode) => void;
@@ -65,6 +67,7 @@ export const usePipelineStore = create<PipelineState>((set) => ({
   // Result data
   papers: [],
   themes: {},
+  themeMap: null,
   methodologies: {},
   rankedPapers: [],
   
@@ -108,6 +111,8 @@ export const usePipelineStore = create<PipelineState>((set) => ({
   
   setThemes: (themes) => set({ themes }),
   
+  setThemeMap: (themeMap) => set({ themeMap }),
+  
   setMethodologies: (methodologies) => set({ methodologies }),
   
   setRankedPapers: (rankedPapers) => set({ rankedPapers }),
@@ -131,6 +136,7 @@ export const usePipelineStore = create<PipelineState>((set) => ({
     error: null,
     papers: [],
     themes: {},
+    themeMap: null,
     methodologies: {},
     rankedPapers: [],
     currentView: 'pipeline',
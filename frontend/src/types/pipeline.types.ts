@@ -10,13 +10,37 @@ export interface Paper {
   relevance_score?: number;
   theme?: string;
   methodology?: string;
+  methodology_scores?: Record<string, number>;
   final_rank?: number;
 }
 
+/**
+ * 2D theme map from stage 3. Coordinates are int16, interleaved x/y;
+ * real positions are `value * scale[axis] + offset[axis]`.
+ */
+export interface ThemeMap {
+  points: number[];
+  paper_ids: string[];
+  centers: Record<string, [number, number]>;
+  scale: [number, number];
+  offset: [number, number];
+}
+
+/** Stage 5 ranking factor weights; normalized server-side to sum to 1 */
+export interface RankingWeights {
+  relevance?: number;
+  citations?: number;
+  recency?: number;
+  abstract?: number;
+  venue?: number;
+  centrality?: number;
+}
+
 export interface PipelineRequest {
   keywords: string[];
   max_papers: number;
   filters?: Record<string, any>;
+  ranking_weights?: RankingWeights;
 }
 
 export interface PipelineResponse {
@@ -34,6 +58,7 @@ export interface StageUpdate {
   data?: any;
   result?: any;
   error?: string;
+  partial_text?: string;
   timestamp: string;
 }
 
@@ -43,11 +68,27 @@ export interface PipelineStage {
   status: 'pending' | 'running' | 'completed' | 'error';
   progress: number;
   message: string;
+  partialText?: string;
   result?: any;
   startTime?: number;
   endTime?: number;
 }
 
+export interface ReportSectionOutline {
+  id: string;
+  title: string;
+  level: number;
+  lazy: boolean;  // Not in `synthesis`; fetch with getReportSection
+}
+
+export interface ReportSection {
+  session_id: string;
+  section_id: string;
+  title: string;
+  format: 'markdown' | 'html';
+  content: string;
+}
+
 export interface LiteratureReviewReport {
   query: string;
   total_papers: number;